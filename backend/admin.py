@@ -0,0 +1,713 @@
+# =======================================================
+# BLUEPRINT 'admin': LOGIN, CANDIDATURAS, ESPECIALISTAS E BLOG
+# =======================================================
+
+import base64
+import hmac
+import os
+import time
+from datetime import datetime
+
+from flask import (Blueprint, abort, current_app, flash, get_flashed_messages, redirect, render_template,
+                   request, stream_with_context, url_for)
+from flask_login import current_user, login_required, login_user, logout_user
+from sqlalchemy import and_, func, or_, tuple_
+from sqlalchemy.orm import contains_eager, joinedload, load_only, undefer
+from werkzeug.utils import secure_filename
+
+import duplicados
+import estatisticas
+import imagens
+from arquivos import gerar_miniaturas
+from blog import preencher_metadados
+from exportacao import gerar_csv, gerar_xlsx
+from extensoes import bcrypt, cache_paginas, db, limitador, login_manager, metricas, motor_busca, ranking
+from models import (ESPECIALISTA_AREAS, Candidatura, Especialista, ExclusaoLote, ParDuplicado, Pessoa, Post,
+                    TextoCurriculo, User)
+from perfil import invalidar_perfil, snapshot_perfil
+from retencao import (CriterioInvalido, criar_exclusao, executar_em_segundo_plano, montar_exclusao,
+                      remover_arquivo, remover_texto, retomaveis, simular)
+from uploads import allowed_image_file
+
+bp = Blueprint('admin', __name__)
+
+# --- PAGINAÇÃO DO ADMIN ---
+CANDIDATURAS_POR_PAGINA_OPCOES = (20, 50, 100)
+CANDIDATURAS_POR_PAGINA_PADRAO = 20
+DUPLICADOS_POR_PAGINA = 100
+
+# --- EXPORTAÇÃO ---
+EXPORTACAO_LOTE = 500             # Linhas buscadas por vez no cursor do banco
+EXPORTACAO_LIMITE_PERFIL = 5000   # Perfis mais relevantes exportados na busca por competências
+EXPORTACAO_FORMATOS = {
+    'csv': (gerar_csv, 'text/csv'),
+    'xlsx': (gerar_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+EXPORTACAO_CABECALHO = (
+    'ID', 'Nome', 'E-mail', 'Telefone', 'Bairro', 'Cidade', 'UF', 'LinkedIn', 'Competências técnicas',
+    'Vaga / Objetivo', 'Data da candidatura', 'Resumo profissional', 'Currículo (PDF)',
+    'Formações', 'Experiências', 'Idiomas', 'Cursos',
+)
+
+
+# --- AUTENTICAÇÃO ---
+login_manager.login_view = 'admin.login' # Se um user não logado tentar acessar uma pág. protegida, será redirecionado para a rota 'login'
+# login_manager.login_message = 'Por favor, faça o login para acessar esta página.'
+# login_manager.login_message_category = 'info'
+
+@login_manager.user_loader
+def load_user(user_id):
+    return User.query.get(int(user_id))
+
+@login_manager.unauthorized_handler
+def unauthorized():
+    """Redireciona usuários não autorizados para a página de login."""
+    flash("Por favor, faça o login para acessar esta página.", "warning")
+    return redirect(url_for('admin.login'))
+
+
+# --- FUNÇÕES AUXILIARES ---
+def encode_cursor(candidatura):
+    """Gera o cursor opaco (data_candidatura + id) usado na paginação por keyset."""
+    bruto = f"{candidatura.data_candidatura.isoformat()}|{candidatura.id}"
+    return base64.urlsafe_b64encode(bruto.encode('utf-8')).decode('ascii')
+
+def decode_cursor(token):
+    """Converte o cursor de volta em (data_candidatura, id). Retorna None se for inválido."""
+    if not token:
+        return None
+    try:
+        bruto = base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8')
+        data_str, id_str = bruto.split('|', 1)
+        return datetime.fromisoformat(data_str), int(id_str)
+    except (ValueError, UnicodeError):
+        return None
+
+def consulta_pagina(query, por_pagina, depois=None, antes=None):
+    """
+    Filtro e ordenação do keyset em (data_candidatura, id), sem executar: uma página
+    mais um item, para saber se há outra. `antes` volta em ordem crescente.
+    """
+    chave = tuple_(Candidatura.data_candidatura, Candidatura.id)
+    if antes:
+        return (query.filter(chave > antes)
+                .order_by(Candidatura.data_candidatura.asc(), Candidatura.id.asc())
+                .limit(por_pagina + 1))
+    if depois:
+        query = query.filter(chave < depois)
+    return query.order_by(Candidatura.data_candidatura.desc(), Candidatura.id.desc()).limit(por_pagina + 1)
+
+def paginar_por_keyset(query, por_pagina, depois=None, antes=None):
+    """
+    Pagina candidaturas por keyset em (data_candidatura, id), da mais recente para a mais antiga.
+    Em vez de OFFSET, filtra a partir do último item visto, então o custo de cada página
+    é o mesmo na primeira ou na milésima página.
+    Retorna (itens, cursor_anterior, cursor_proximo).
+    """
+    itens = consulta_pagina(query, por_pagina, depois=depois, antes=antes).all()
+    if antes:
+        # Voltando: a consulta veio em ordem crescente a partir do cursor; inverte o resultado
+        tem_anterior = len(itens) > por_pagina
+        itens = list(reversed(itens[:por_pagina]))
+        tem_proxima = True
+    else:
+        tem_proxima = len(itens) > por_pagina
+        itens = itens[:por_pagina]
+        tem_anterior = depois is not None
+
+    cursor_anterior = encode_cursor(itens[0]) if itens and tem_anterior else None
+    cursor_proximo = encode_cursor(itens[-1]) if itens and tem_proxima else None
+    return itens, cursor_anterior, cursor_proximo
+
+def filtrar_candidaturas(query, filtro_por, termo_busca):
+    """
+    Aplica os filtros de texto do admin. A query já deve estar com JOIN em Pessoa.
+    Os padrões '%termo%' usam os índices trigram (pg_trgm) no PostgreSQL.
+    """
+    if not termo_busca:
+        return query
+    if filtro_por == 'candidatura':
+        return query.filter(Candidatura.vaga_objetivo.ilike(f'%{termo_busca}%'))
+    if filtro_por == 'pessoa':
+        return query.filter(
+            or_(
+                Pessoa.nome_completo.ilike(f'%{termo_busca}%'),
+                Pessoa.email.ilike(f'%{termo_busca}%')
+            )
+        )
+    return query
+
+def consulta_candidatos(filtro_por='pessoa', termo_busca=''):
+    """Consulta da listagem do admin: Candidatura com a Pessoa no mesmo SELECT (evita N+1 no template) e os filtros."""
+    query = Candidatura.query.join(Candidatura.pessoa).options(contains_eager(Candidatura.pessoa))
+    return filtrar_candidaturas(query, filtro_por, termo_busca)
+
+def candidaturas_recentes_por_pessoa(pessoa_ids):
+    """Candidatura mais recente de cada Pessoa, na mesma ordem dos ids recebidos (ranking da busca)."""
+    if not pessoa_ids:
+        return []
+    candidaturas = (Candidatura.query.join(Candidatura.pessoa).options(contains_eager(Candidatura.pessoa))
+                    .filter(Candidatura.pessoa_id.in_(pessoa_ids))
+                    .order_by(Candidatura.data_candidatura.desc(), Candidatura.id.desc())
+                    .all())
+    recentes = {}
+    for candidatura in candidaturas:
+        recentes.setdefault(candidatura.pessoa_id, candidatura)
+    return [recentes[pessoa_id] for pessoa_id in pessoa_ids if pessoa_id in recentes]
+
+def consulta_exportacao(filtro_por, termo_busca):
+    """
+    Candidatura mais recente de cada Pessoa (entre as que passam no filtro), com a
+    Pessoa no mesmo SELECT e as coleções carregadas em lote (selectinload) a cada
+    bloco do yield_per. A "mais recente" sai de um ROW_NUMBER() no próprio banco.
+    """
+    ordem = func.row_number().over(
+        partition_by=Candidatura.pessoa_id,
+        order_by=(Candidatura.data_candidatura.desc(), Candidatura.id.desc()),
+    ).label('ordem')
+    recentes = db.session.query(Candidatura.id, ordem).join(Candidatura.pessoa)
+    if termo_busca and filtro_por == 'perfil':
+        recentes = recentes.filter(Candidatura.pessoa_id.in_(
+            motor_busca.buscar(termo_busca, limite=EXPORTACAO_LIMITE_PERFIL)))
+    else:
+        recentes = filtrar_candidaturas(recentes, filtro_por, termo_busca)
+    recentes = recentes.subquery()
+
+    pessoa = contains_eager(Candidatura.pessoa)
+    return (Candidatura.query
+            .join(recentes, and_(recentes.c.id == Candidatura.id, recentes.c.ordem == 1))
+            .join(Candidatura.pessoa)
+            .options(pessoa, pessoa.selectinload(Pessoa.formacoes), pessoa.selectinload(Pessoa.experiencias),
+                     pessoa.selectinload(Pessoa.idiomas), pessoa.selectinload(Pessoa.cursos))
+            .order_by(Candidatura.data_candidatura.desc(), Candidatura.id.desc())
+            .yield_per(EXPORTACAO_LOTE))
+
+def linha_exportacao(candidatura):
+    """Achata a Pessoa, a candidatura e as coleções numa linha da planilha."""
+    pessoa = candidatura.pessoa
+    pdf = (url_for('uploads.download_file', filename=candidatura.curriculo_pdf_path, _external=True)
+           if candidatura.curriculo_pdf_path else '')
+    return (
+        pessoa.id, pessoa.nome_completo, pessoa.email, pessoa.telefone1, pessoa.bairro, pessoa.cidade,
+        pessoa.uf, pessoa.linkedin_url, pessoa.competencias_tecnicas,
+        candidatura.vaga_objetivo, candidatura.data_candidatura, candidatura.resumo_profissional, pdf,
+        '; '.join(f"{f.curso} - {f.instituicao} ({f.ano_conclusao or f.conclusao_prevista or 's/ data'})"
+                  for f in pessoa.formacoes),
+        '; '.join(f"{e.cargo} - {e.empresa} ({e.data_inicio or '?'} a {e.data_fim or 'atual'})"
+                  for e in pessoa.experiencias),
+        '; '.join(f"{i.nome} ({i.nivel})" for i in pessoa.idiomas),
+        '; '.join(f"{c.nome}" + (f" - {c.instituicao}" if c.instituicao else '') for c in pessoa.cursos),
+    )
+
+
+@bp.route('/admin')
+@login_required
+def admin_dashboard():
+    # Gráficos a partir das contagens agregadas: o custo não cresce com as tabelas
+    dados = estatisticas.painel(current_app.config['ESTATISTICAS_DIAS'], current_app.config['ESTATISTICAS_ITENS'])
+    return render_template('admin_dashboard.html', estatisticas=dados)
+
+@bp.route('/admin/metrics')
+def admin_metrics():
+    """Métricas no formato do Prometheus. Aceita o admin logado ou 'Authorization: Bearer <METRICS_TOKEN>'."""
+    token = current_app.config['METRICS_TOKEN']
+    enviado = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    if not current_user.is_authenticated and not (token and hmac.compare_digest(enviado, token)):
+        return login_manager.unauthorized()
+    return current_app.response_class(metricas.exportar(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@bp.route('/login', methods=['GET', 'POST'])
+@limitador.limitar('login')
+def login():
+    # =================================================================
+    #   LINHA DE LIMPEZA: Consome e descarta quaisquer mensagens antigas
+    # =================================================================
+    get_flashed_messages() 
+    # =================================================================
+
+    if current_user.is_authenticated:
+        return redirect(url_for('admin.admin_dashboard'))
+    
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        user = User.query.filter_by(username=username).first()
+        
+        if user and bcrypt.check_password_hash(user.password_hash, password):
+            login_user(user)
+            flash('Login realizado com sucesso!', 'success')
+            next_page = request.args.get('next')
+            return redirect(next_page) if next_page else redirect(url_for('admin.admin_dashboard'))
+        else:
+            flash('Login falhou. Verifique o usuário e a senha.', 'danger')
+            return redirect(url_for('admin.login'))
+            
+    return render_template('login.html')
+
+@bp.route('/logout')
+@login_required # Garante que apenas usuários logados possam acessar esta rota
+def logout():
+    logout_user() # Função do Flask-Login para deslogar o usuário
+    flash('Você foi desconectado com segurança.', 'success')
+    return redirect(url_for('admin.login')) # Redireciona para a página de login
+
+
+# --- ADMIN CANDIDATOS ---
+@bp.route('/admin/candidatos')
+@login_required
+def admin_candidatos():
+    # A lógica de busca que implementamos antes já funciona com esta nova estrutura!
+    filtro_por = request.args.get('filtro_por', 'pessoa')
+    termo_busca = request.args.get('termo_busca', '')
+    por_pagina = request.args.get('por_pagina', CANDIDATURAS_POR_PAGINA_PADRAO, type=int)
+    if por_pagina not in CANDIDATURAS_POR_PAGINA_OPCOES:
+        por_pagina = CANDIDATURAS_POR_PAGINA_PADRAO
+
+    if termo_busca and filtro_por == 'perfil':
+        # Busca textual ranqueada: mostra a candidatura mais recente dos perfis mais relevantes
+        pessoa_ids = motor_busca.buscar(termo_busca, limite=por_pagina)
+        return render_template(
+            'admin_candidatos.html',
+            candidaturas=candidaturas_recentes_por_pessoa(pessoa_ids),
+            por_pagina=por_pagina,
+            por_pagina_opcoes=CANDIDATURAS_POR_PAGINA_OPCOES,
+            cursor_anterior=None,
+            cursor_proximo=None,
+        )
+
+    candidaturas, cursor_anterior, cursor_proximo = paginar_por_keyset(
+        consulta_candidatos(filtro_por, termo_busca),
+        por_pagina,
+        depois=decode_cursor(request.args.get('depois')),
+        antes=decode_cursor(request.args.get('antes')),
+    )
+    return render_template(
+        'admin_candidatos.html',
+        candidaturas=candidaturas,
+        por_pagina=por_pagina,
+        por_pagina_opcoes=CANDIDATURAS_POR_PAGINA_OPCOES,
+        cursor_anterior=cursor_anterior,
+        cursor_proximo=cursor_proximo,
+    )
+
+
+@bp.route('/admin/candidatos/ranking', methods=['GET', 'POST'])
+@login_required
+def ranking_candidatos():
+    """
+    Ranking de todas as Pessoas por aderência (BM25) à descrição de uma vaga. A
+    descrição vai por POST: costuma ser longa demais para a query string.
+    """
+    descricao = request.form.get('descricao', '')
+    limite = request.form.get('limite', CANDIDATURAS_POR_PAGINA_PADRAO, type=int)
+    if limite not in CANDIDATURAS_POR_PAGINA_OPCOES:
+        limite = CANDIDATURAS_POR_PAGINA_PADRAO
+
+    resultados, duracao_ms = [], None
+    if request.method == 'POST' and not descricao.strip():
+        flash('Cole a descrição da vaga para gerar o ranking.', 'warning')
+    elif request.method == 'POST':
+        inicio = time.perf_counter()
+        scores = dict(ranking.ranquear(descricao, limite))
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        # Mesma apresentação da busca por perfil: a candidatura mais recente de cada Pessoa, na ordem do ranking
+        resultados = [(candidatura, scores[candidatura.pessoa_id])
+                      for candidatura in candidaturas_recentes_por_pessoa(list(scores))]
+        if not scores:
+            flash('Nenhum perfil tem termos em comum com a descrição da vaga.', 'warning')
+
+    return render_template('admin_ranking.html', descricao=descricao, limite=limite,
+                           limite_opcoes=CANDIDATURAS_POR_PAGINA_OPCOES,
+                           resultados=resultados, duracao_ms=duracao_ms)
+
+
+@bp.route('/admin/candidatos/exportar')
+@login_required
+def exportar_candidatos():
+    """
+    Exporta em CSV ou XLSX, com os mesmos filtros da listagem. A resposta é um
+    gerador: as linhas saem do cursor do banco em lotes e vão direto para o
+    cliente, sem montar o arquivo inteiro na memória.
+    """
+    formato = request.args.get('formato', 'csv')
+    if formato not in EXPORTACAO_FORMATOS:
+        flash('Formato de exportação inválido.', 'warning')
+        return redirect(url_for('admin.admin_candidatos'))
+    gerador, mimetype = EXPORTACAO_FORMATOS[formato]
+
+    query = consulta_exportacao(request.args.get('filtro_por', 'pessoa'), request.args.get('termo_busca', ''))
+    linhas = (linha_exportacao(candidatura) for candidatura in query)
+    nome_arquivo = f"candidaturas_{datetime.now().strftime('%Y%m%d_%H%M')}.{formato}"
+    return current_app.response_class(
+        stream_with_context(gerador(EXPORTACAO_CABECALHO, linhas)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{nome_arquivo}"',
+                 'Cache-Control': 'no-store', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@bp.route('/admin/candidatos/exclusao-em-lote', methods=['GET', 'POST'])
+@login_required
+def exclusao_em_lote():
+    """Retenção/LGPD: simula ou agenda a exclusão em lote das candidaturas por data e/ou filtro."""
+    simulacao = None
+    if request.method == 'POST':
+        try:
+            data_limite = request.form.get('anteriores_a')
+            criterios = dict(
+                anteriores_a=datetime.strptime(data_limite, '%Y-%m-%d') if data_limite else None,
+                filtro_por=request.form.get('filtro_por'),
+                termo_busca=request.form.get('termo_busca'),
+                remover_pessoas=bool(request.form.get('remover_pessoas')),
+                solicitado_por=current_user.username,
+            )
+            if request.form.get('acao') == 'simular':
+                simulacao = simular(montar_exclusao(**criterios))
+            else:
+                exclusao = criar_exclusao(**criterios)
+                executar_em_segundo_plano(exclusao.id)
+                flash(f'Exclusão #{exclusao.id} iniciada. Acompanhe o andamento abaixo.', 'success')
+                return redirect(url_for('admin.exclusao_em_lote'))
+        except ValueError as e:
+            # CriterioInvalido ou data fora do formato AAAA-MM-DD
+            flash(str(e) if isinstance(e, CriterioInvalido) else 'Data limite inválida.', 'warning')
+
+    exclusoes = ExclusaoLote.query.order_by(ExclusaoLote.id.desc()).limit(20).all()
+    return render_template('admin_exclusao_lote.html', exclusoes=exclusoes, simulacao=simulacao,
+                           retomaveis={exclusao.id for exclusao in retomaveis()})
+
+@bp.route('/admin/candidatos/exclusao-em-lote/<int:exclusao_id>/retomar', methods=['POST'])
+@login_required
+def retomar_exclusao(exclusao_id):
+    ExclusaoLote.query.get_or_404(exclusao_id)
+    executar_em_segundo_plano(exclusao_id)
+    flash(f'Exclusão #{exclusao_id} retomada.', 'success')
+    return redirect(url_for('admin.exclusao_em_lote'))
+
+
+@bp.route('/admin/candidatos/duplicados')
+@login_required
+def pessoas_duplicadas():
+    """Pares de Pessoas que parecem a mesma pessoa com e-mails diferentes (gerados pelo `flask detectar-duplicados`)."""
+    pares = (ParDuplicado.query.filter_by(status=duplicados.PENDENTE)
+             .options(joinedload(ParDuplicado.pessoa, innerjoin=True), joinedload(ParDuplicado.duplicata, innerjoin=True))
+             .order_by(ParDuplicado.score.desc(), ParDuplicado.id)
+             .limit(DUPLICADOS_POR_PAGINA).all())
+    return render_template('admin_duplicados.html', pares=pares)
+
+@bp.route('/admin/candidatos/duplicados/<int:par_id>/mesclar', methods=['POST'])
+@login_required
+@metricas.orcamento(40)  # Um UPDATE/DELETE por coleção, mais o reindex: número fixo (~25)
+def mesclar_duplicados(par_id):
+    par = ParDuplicado.query.get_or_404(par_id)
+    manter_id = request.form.get('manter', type=int)
+    if manter_id not in (par.pessoa_id, par.duplicata_id):
+        abort(400)
+    remover_id = par.duplicata_id if manter_id == par.pessoa_id else par.pessoa_id
+    try:
+        pessoa = duplicados.mesclar_pessoas(manter_id, remover_id)
+        flash(f'Perfis mesclados em "{pessoa.nome_completo}" ({pessoa.email}).', 'success')
+    except ValueError as e:
+        db.session.rollback()
+        flash(str(e), 'warning')
+    return redirect(url_for('admin.pessoas_duplicadas'))
+
+@bp.route('/admin/candidatos/duplicados/<int:par_id>/ignorar', methods=['POST'])
+@login_required
+def ignorar_duplicados(par_id):
+    par = ParDuplicado.query.get_or_404(par_id)
+    par.status = duplicados.IGNORADO  # Continua ignorado nas próximas detecções
+    db.session.commit()
+    flash('Par marcado como pessoas diferentes.', 'success')
+    return redirect(url_for('admin.pessoas_duplicadas'))
+
+
+@bp.route('/pessoa/<int:pessoa_id>') # Rota agora por ID da Pessoa
+@login_required
+def detalhe_candidato(pessoa_id):
+    # Perfil completo em consultas fixas (ou do cache), com as candidaturas já ordenadas pelo banco
+    pessoa = snapshot_perfil(pessoa_id)
+    if pessoa is None:
+        abort(404)
+
+    # A candidatura mais recente é a primeira da lista
+    candidatura_recente = pessoa['candidaturas'][0] if pessoa['candidaturas'] else None
+
+    # Texto extraído do PDF mais recente (fora do snapshot: a extração termina depois do cadastro)
+    texto_curriculo = None
+    if candidatura_recente and candidatura_recente['curriculo_pdf_path']:
+        texto_curriculo = (TextoCurriculo.query.options(undefer(TextoCurriculo.texto))
+                           .filter_by(arquivo=candidatura_recente['curriculo_pdf_path']).first())
+    return render_template('detalhe_candidato.html', pessoa=pessoa, candidatura_recente=candidatura_recente,
+                           texto_curriculo=texto_curriculo)
+
+
+@bp.route('/candidatura/excluir/<int:candidatura_id>', methods=['POST'])
+@login_required
+def excluir_candidatura(candidatura_id):
+    # Agora excluímos uma candidatura específica, não o perfil inteiro
+    candidatura_para_excluir = Candidatura.query.get_or_404(candidatura_id)
+    try:
+        caminho_pdf = candidatura_para_excluir.curriculo_pdf_path
+        pessoa_id = candidatura_para_excluir.pessoa_id
+        estatisticas.registrar(estatisticas.contagens_candidaturas(Candidatura.id == candidatura_id), {})
+        db.session.delete(candidatura_para_excluir)
+        db.session.commit()
+        invalidar_perfil(pessoa_id)
+
+        # Apaga o PDF se nenhuma outra candidatura usa o mesmo arquivo (deduplicado por hash)
+        if caminho_pdf and not Candidatura.query.filter_by(curriculo_pdf_path=caminho_pdf).first():
+            remover_texto([caminho_pdf])
+            db.session.commit()
+            remover_arquivo(current_app.config['UPLOAD_FOLDER'], caminho_pdf)
+        flash('Candidatura excluída com sucesso!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Ocorreu um erro ao excluir a candidatura: {e}', 'danger')
+    return redirect(url_for('admin.admin_candidatos'))
+
+
+# --- ADMIN ESPECIALISTAS (CRUD COMPLETO) ---
+
+@bp.route('/admin/especialistas')
+@login_required
+def admin_especialistas_list():
+    """Exibe a lista de todos os especialistas cadastrados."""
+    try:
+        especialistas = Especialista.query.order_by(Especialista.ordem, Especialista.nome).all()
+        return render_template('admin_especialistas_list.html', especialistas=especialistas)
+    except Exception as e:
+        print(f"Erro ao carregar especialistas: {e}")
+        flash('Erro ao carregar a lista de especialistas. Verifique o banco de dados.', 'danger')
+        return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/admin/especialistas/novo', methods=['GET', 'POST'])
+@login_required
+def admin_especialistas_novo():
+    if request.method == 'POST':
+        try:
+            # Pega todos os dados dos campos do formulário
+            nome = request.form.get('nome')
+            titulo = request.form.get('titulo')
+            bio_intro = request.form.get('bio_intro')
+            bio_lista_titulo = request.form.get('bio_lista_titulo')
+            bio_lista_itens = request.form.get('bio_lista_itens')
+            bio_conclusao = request.form.get('bio_conclusao')
+            contato_whatsapp = request.form.get('contato_whatsapp')
+            contato_email = request.form.get('contato_email')
+            contato_extra = request.form.get('contato_extra')
+            ordem = request.form.get('ordem', 0, type=int)
+            ativo = 'ativo' in request.form
+
+            # Validação básica
+            if not nome or not titulo:
+                flash('Nome e Título são campos obrigatórios.', 'warning')
+                return render_template('admin_especialistas_form.html', title="Adicionar Novo Especialista", especialista=request.form)
+
+            # Lógica para salvar a foto
+            foto_filename = None
+            if 'foto' in request.files:
+                file = request.files['foto']
+                if file and file.filename and allowed_image_file(file.filename):
+                    filename = secure_filename(file.filename)
+                    foto_filename = f"especialista_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{filename}"
+                    file.save(os.path.join(current_app.config['UPLOAD_FOLDER'], foto_filename))
+                    gerar_miniaturas(foto_filename)
+
+            # Cria o novo objeto Especialista com todos os campos
+            novo_especialista = Especialista(
+                area=request.form.get('area'),
+                nome=nome,
+                titulo=titulo,
+                bio_intro=bio_intro,
+                bio_lista_titulo=bio_lista_titulo,
+                bio_lista_itens=bio_lista_itens,
+                bio_conclusao=bio_conclusao,
+                contato_whatsapp=contato_whatsapp,
+                contato_email=contato_email,
+                contato_linkedin=request.form.get('contato_linkedin'),   
+                contato_instagram=request.form.get('contato_instagram'), 
+                contato_extra=contato_extra,
+                ordem=ordem,
+                ativo=ativo,
+                foto_path=foto_filename
+            )
+            
+            db.session.add(novo_especialista)
+            db.session.commit()
+            cache_paginas.invalidar('especialistas')
+            flash('Novo especialista adicionado com sucesso!', 'success')
+            return redirect(url_for('admin.admin_especialistas_list'))
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"ERRO AO CRIAR ESPECIALISTA: {e}")
+            flash('Ocorreu um erro ao criar o especialista. Verifique o terminal para detalhes.', 'danger')
+            return redirect(url_for('admin.admin_especialistas_novo'))
+    
+    return render_template('admin_especialistas_form.html', title="Adicionar Novo Especialista", areas=ESPECIALISTA_AREAS)
+
+
+@bp.route('/admin/especialistas/editar/<int:especialista_id>', methods=['GET', 'POST'])
+@login_required
+def admin_especialistas_editar(especialista_id):
+    especialista = Especialista.query.get_or_404(especialista_id)
+    if request.method == 'POST':
+        try:
+            # Atualiza todos os campos do objeto 'especialista' com os dados do formulário
+            especialista.area = request.form.get('area')
+            especialista.nome = request.form.get('nome')
+            especialista.titulo = request.form.get('titulo')
+            especialista.bio_intro = request.form.get('bio_intro')
+            especialista.bio_lista_titulo = request.form.get('bio_lista_titulo')
+            especialista.bio_lista_itens = request.form.get('bio_lista_itens')
+            especialista.bio_conclusao = request.form.get('bio_conclusao')
+            especialista.contato_whatsapp = request.form.get('contato_whatsapp')
+            especialista.contato_email = request.form.get('contato_email')
+            especialista.contato_linkedin = request.form.get('contato_linkedin')
+            especialista.contato_instagram = request.form.get('contato_instagram')
+            especialista.contato_extra = request.form.get('contato_extra')
+            especialista.ordem = request.form.get('ordem', 0, type=int)
+            especialista.ativo = 'ativo' in request.form
+
+            # Lógica para atualizar a foto
+            if 'foto' in request.files:
+                file = request.files['foto']
+                if file and file.filename and allowed_image_file(file.filename):
+                    # Apaga a foto antiga do disco se ela existir
+                    if especialista.foto_path and os.path.exists(os.path.join(current_app.config['UPLOAD_FOLDER'], especialista.foto_path)):
+                        os.remove(os.path.join(current_app.config['UPLOAD_FOLDER'], especialista.foto_path))
+                        imagens.remover_derivados(current_app.config['UPLOAD_FOLDER'], especialista.foto_path)
+                    
+                    # Salva a nova foto e atualiza o caminho no banco
+                    filename = secure_filename(file.filename)
+                    foto_filename = f"especialista_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{filename}"
+                    file.save(os.path.join(current_app.config['UPLOAD_FOLDER'], foto_filename))
+                    gerar_miniaturas(foto_filename)
+                    especialista.foto_path = foto_filename
+            
+            db.session.commit()
+            cache_paginas.invalidar('especialistas')
+            flash('Especialista atualizado com sucesso!', 'success')
+            return redirect(url_for('admin.admin_especialistas_list'))
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"ERRO AO EDITAR ESPECIALISTA: {e}")
+            flash('Ocorreu um erro ao atualizar o especialista. Verifique o terminal para detalhes.', 'danger')
+            return redirect(url_for('admin.admin_especialistas_editar', especialista_id=especialista.id))
+
+    return render_template('admin_especialistas_form.html', title="Editar Especialista", especialista=especialista, areas=ESPECIALISTA_AREAS)
+
+@bp.route('/admin/especialistas/excluir/<int:especialista_id>', methods=['POST'])
+@login_required
+def admin_especialistas_excluir(especialista_id):
+    """Processa a exclusão de um especialista."""
+    especialista = Especialista.query.get_or_404(especialista_id)
+    try:
+        if especialista.foto_path and os.path.exists(os.path.join(current_app.config['UPLOAD_FOLDER'], especialista.foto_path)):
+            os.remove(os.path.join(current_app.config['UPLOAD_FOLDER'], especialista.foto_path))
+            imagens.remover_derivados(current_app.config['UPLOAD_FOLDER'], especialista.foto_path)
+        
+        db.session.delete(especialista)
+        db.session.commit()
+        cache_paginas.invalidar('especialistas')
+        flash('Especialista excluído com sucesso.', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Ocorreu um erro ao excluir o especialista: {e}', 'danger')
+    
+    return redirect(url_for('admin.admin_especialistas_list'))
+
+# --- ADMIN BLOG ---
+@bp.route('/admin/blog')
+@login_required
+def admin_blog_list():
+    posts = (Post.query.options(load_only(Post.id, Post.titulo, Post.autor, Post.data_publicacao))
+             .order_by(Post.data_publicacao.desc()).all())
+    return render_template('admin_blog_list.html', posts=posts)
+
+@bp.route('/admin/blog/novo', methods=['GET', 'POST'])
+def admin_blog_novo():
+    if request.method == 'POST':
+        titulo = request.form.get('titulo')
+        conteudo = request.form.get('conteudo')
+        autor = request.form.get('autor')
+        if not titulo or not conteudo:
+            flash('Título e Conteúdo são campos obrigatórios.', 'warning')
+            return render_template('admin_blog_form.html', titulo=titulo, conteudo=conteudo, autor=autor)
+        imagem_filename = None
+        if 'imagem_destaque' in request.files:
+            file = request.files['imagem_destaque']
+            if file and file.filename and allowed_image_file(file.filename):
+                filename = secure_filename(file.filename)
+                imagem_filename = f"post_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{filename}"
+                caminho_para_salvar = os.path.join(current_app.config['UPLOAD_FOLDER'], imagem_filename)
+                file.save(caminho_para_salvar)
+                gerar_miniaturas(imagem_filename)
+        novo_post = Post(titulo=titulo, conteudo=conteudo, autor=autor, imagem_destaque_path=imagem_filename)
+        preencher_metadados(novo_post)
+        try:
+            db.session.add(novo_post)
+            db.session.commit()
+            cache_paginas.invalidar('posts')
+            flash('Novo post criado com sucesso!', 'success')
+            return redirect(url_for('admin.admin_blog_list'))
+        except Exception as e:
+            db.session.rollback()
+            flash('Ocorreu um erro interno. Verifique o terminal do servidor para detalhes.', 'danger')
+            return redirect(url_for('admin.admin_blog_novo'))
+    return render_template('admin_blog_form.html')
+
+@bp.route('/admin/blog/editar/<int:post_id>', methods=['GET', 'POST'])
+@login_required
+def admin_blog_editar(post_id):
+    post_para_editar = Post.query.get_or_404(post_id)
+    if request.method == 'POST':
+        post_para_editar.titulo = request.form.get('titulo')
+        post_para_editar.conteudo = request.form.get('conteudo')
+        post_para_editar.autor = request.form.get('autor')
+        if 'imagem_destaque' in request.files:
+            file = request.files['imagem_destaque']
+            if file and file.filename and allowed_image_file(file.filename):
+                if post_para_editar.imagem_destaque_path and os.path.exists(os.path.join(current_app.config['UPLOAD_FOLDER'], post_para_editar.imagem_destaque_path)):
+                    os.remove(os.path.join(current_app.config['UPLOAD_FOLDER'], post_para_editar.imagem_destaque_path))
+                    imagens.remover_derivados(current_app.config['UPLOAD_FOLDER'], post_para_editar.imagem_destaque_path)
+                filename = secure_filename(file.filename)
+                imagem_filename = f"post_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{filename}"
+                caminho_para_salvar = os.path.join(current_app.config['UPLOAD_FOLDER'], imagem_filename)
+                file.save(caminho_para_salvar)
+                gerar_miniaturas(imagem_filename)
+                post_para_editar.imagem_destaque_path = imagem_filename
+        preencher_metadados(post_para_editar)
+        try:
+            db.session.commit()
+            cache_paginas.invalidar('posts')
+            flash('Post atualizado com sucesso!', 'success')
+            return redirect(url_for('admin.admin_blog_list'))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Erro ao atualizar o post: {e}', 'danger')
+    return render_template('admin_blog_form.html', post=post_para_editar)
+
+@bp.route('/admin/blog/excluir/<int:post_id>', methods=['POST'])
+@login_required
+def admin_blog_excluir(post_id):
+    post_para_excluir = Post.query.get_or_404(post_id)
+    try:
+        if post_para_excluir.imagem_destaque_path:
+            caminho_do_arquivo = os.path.join(current_app.config['UPLOAD_FOLDER'], post_para_excluir.imagem_destaque_path)
+            if os.path.exists(caminho_do_arquivo):
+                os.remove(caminho_do_arquivo)
+            imagens.remover_derivados(current_app.config['UPLOAD_FOLDER'], post_para_excluir.imagem_destaque_path)
+        db.session.delete(post_para_excluir)
+        db.session.commit()
+        cache_paginas.invalidar('posts')
+        flash('Post excluído com sucesso!', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Ocorreu um erro ao excluir o post: {e}', 'danger')
+    return redirect(url_for('admin.admin_blog_list'))
+# ==================================================================
+# FIM DA ROTA
+# ==================================================================
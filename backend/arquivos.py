@@ -0,0 +1,39 @@
+# =======================================================
+# BLUEPRINT 'uploads': ENTREGA DOS ARQUIVOS ENVIADOS
+# =======================================================
+
+from flask import Blueprint, current_app, url_for
+
+import imagens
+from uploads import servir_arquivo
+
+bp = Blueprint('uploads', __name__)
+
+
+# --- IMAGENS RESPONSIVAS ---
+def gerar_miniaturas(nome_arquivo):
+    """Gera os derivados WebP/AVIF de uma imagem recém-salva. Uma falha aqui não impede o cadastro."""
+    try:
+        imagens.gerar_derivados(current_app.config['UPLOAD_FOLDER'], nome_arquivo)
+    except Exception as e:
+        print(f"ERRO AO GERAR MINIATURAS DE {nome_arquivo}: {e}")
+
+@bp.app_template_global()
+def fontes_responsivas(nome_arquivo):
+    """Usado nos templates: <source> com srcset dos derivados de uma imagem enviada."""
+    return imagens.fontes_responsivas(
+        current_app.config['UPLOAD_FOLDER'], nome_arquivo,
+        lambda nome: url_for('uploads.view_upload', filename=nome)
+    )
+
+
+# --- ROTAS PARA SERVIR ARQUIVOS ---
+@bp.route('/uploads/<path:filename>')
+def download_file(filename):
+    return servir_arquivo(current_app.config['UPLOAD_FOLDER'], filename, como_anexo=True, privado=True)
+
+@bp.route('/uploads/view/<path:filename>')
+def view_upload(filename):
+    # PDFs são currículos: não podem ficar em cache compartilhado (CDN/proxy)
+    return servir_arquivo(current_app.config['UPLOAD_FOLDER'], filename,
+                          privado=filename.lower().endswith('.pdf'))
@@ -0,0 +1,255 @@
+# =======================================================
+# BUILD DOS ARQUIVOS ESTÁTICOS
+# =======================================================
+# `flask gerar-estaticos` minifica o CSS/JS, grava cópias com o hash do
+# conteúdo no nome em static/dist/ (ex.: css/style.3fa1c2d4e5b6.css), gera
+# versões .gz/.br dos arquivos de texto e um manifest.json com o mapeamento
+# original -> cópia. Nos templates, `static_url('css/style.css')` devolve a
+# cópia com hash (que pode ficar em cache por um ano) ou, sem manifest (ex.: em
+# desenvolvimento), o caminho normal de /static/.
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import time
+
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+PASTA_DIST = 'dist'
+ARQUIVO_MANIFEST = 'manifest.json'
+EXTENSOES_TEXTO = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.xml'}
+TAMANHO_MINIMO_COMPRESSAO = 512  # Bytes; abaixo disso o .gz costuma ficar maior
+
+# Comentários e strings do CSS/JS: as strings são preservadas como estão
+_css_tokens = re.compile(r"/\*.*?\*/|\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'", re.DOTALL)
+_css_espacos = re.compile(r'\s+')
+_css_pontuacao = re.compile(r'\s*([{};,>])\s*')
+_css_url = re.compile(r"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+_url_absoluta = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|/|#)', re.IGNORECASE)  # http:, data:, //, /, #
+
+
+# --- Minificação ---
+
+def minificar_css(texto):
+    """Remove comentários e espaços supérfluos. Usa o rcssmin se estiver instalado."""
+    if rcssmin is not None:
+        return rcssmin.cssmin(texto)
+
+    def compactar(trecho):
+        trecho = _css_espacos.sub(' ', trecho)
+        trecho = _css_pontuacao.sub(r'\1', trecho)
+        return trecho.replace(': ', ':').replace(';}', '}')
+
+    partes, inicio = [], 0
+    for token in _css_tokens.finditer(texto):
+        partes.append(compactar(texto[inicio:token.start()]))
+        if not token.group().startswith('/*'):
+            partes.append(token.group())
+        inicio = token.end()
+    partes.append(compactar(texto[inicio:]))
+    return ''.join(partes).strip()
+
+
+def minificar_js(texto):
+    """
+    Usa o rjsmin se estiver instalado. Sem ele, devolve o JS como está: cortar
+    comentários ou indentação sem um tokenizador pode alterar strings e template
+    literals. O .gz/.br gerado em seguida já tira a maior parte do tamanho.
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(texto)
+    return texto
+
+
+# --- Build ---
+
+def _nome_com_hash(caminho_relativo, conteudo):
+    base, extensao = os.path.splitext(caminho_relativo)
+    return f"{base}.{hashlib.sha256(conteudo).hexdigest()[:12]}{extensao}"
+
+
+def _gravar(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        f.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+def _pre_comprimir(caminho, conteudo):
+    criados = []
+    if len(conteudo) < TAMANHO_MINIMO_COMPRESSAO:
+        return criados
+    _gravar(caminho + '.gz', gzip.compress(conteudo, compresslevel=9, mtime=0))
+    criados.append(caminho + '.gz')
+    if brotli is not None:
+        _gravar(caminho + '.br', brotli.compress(conteudo, quality=11))
+        criados.append(caminho + '.br')
+    return criados
+
+
+def gerar_estaticos(pasta_static, url_static='/static'):
+    """
+    Gera static/dist/ e o manifest. Imagens e fontes são processadas antes do CSS
+    para que os `url(...)` do CSS (absolutos em /static/ ou relativos ao arquivo)
+    já apontem para as cópias com hash.
+    Retorna o manifest ({'css/style.css': 'dist/css/style.<hash>.css', ...}).
+    """
+    pasta_dist = os.path.join(pasta_static, PASTA_DIST)
+    originais = []
+    for raiz, pastas, arquivos in os.walk(pasta_static):
+        if os.path.abspath(raiz) == os.path.abspath(pasta_static):
+            pastas[:] = [p for p in pastas if p != PASTA_DIST]
+        for arquivo in arquivos:
+            relativo = os.path.relpath(os.path.join(raiz, arquivo), pasta_static).replace(os.sep, '/')
+            originais.append(relativo)
+    # CSS e JS por último: podem referenciar os demais arquivos
+    originais.sort(key=lambda r: (os.path.splitext(r)[1] in ('.css', '.js'), r))
+
+    manifest = {}
+
+    prefixo = url_static.rstrip('/') + '/'
+
+    def reescrever_url(match, origem):
+        aspas, alvo = match.groups()
+        caminho, sufixo = re.match(r'([^?#]*)(.*)', alvo).groups()  # Sufixos como '?#iefix' das fontes
+        if caminho.startswith(prefixo):
+            chave = caminho[len(prefixo):]
+        elif caminho and not _url_absoluta.match(caminho):
+            # Relativo à pasta do CSS original: a cópia fica em dist/, então vira um caminho absoluto
+            chave = posixpath.normpath(posixpath.join(posixpath.dirname(origem), caminho))
+            if chave == '..' or chave.startswith('../'):
+                return match.group()
+        else:
+            return match.group()
+        return f"url({aspas}{prefixo}{manifest.get(chave, chave)}{sufixo}{aspas})"
+
+    for relativo in originais:
+        with open(os.path.join(pasta_static, relativo), 'rb') as f:
+            conteudo = f.read()
+        extensao = os.path.splitext(relativo)[1].lower()
+        if extensao == '.css':
+            texto = _css_url.sub(lambda match: reescrever_url(match, relativo), conteudo.decode('utf-8'))
+            conteudo = minificar_css(texto).encode('utf-8')
+        elif extensao == '.js':
+            conteudo = minificar_js(conteudo.decode('utf-8')).encode('utf-8')
+
+        destino = f"{PASTA_DIST}/{_nome_com_hash(relativo, conteudo)}"
+        caminho_destino = os.path.join(pasta_static, destino)
+        if not os.path.exists(caminho_destino):
+            _gravar(caminho_destino, conteudo)
+        if extensao in EXTENSOES_TEXTO:
+            _pre_comprimir(caminho_destino, conteudo)
+        manifest[relativo] = destino
+
+    _gravar(os.path.join(pasta_dist, ARQUIVO_MANIFEST),
+            json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+def limpar_dist(pasta_static, manifest):
+    """Remove de static/dist/ as cópias que não estão mais no manifest (builds antigos)."""
+    pasta_dist = os.path.join(pasta_static, PASTA_DIST)
+    em_uso = {os.path.normpath(os.path.join(pasta_static, destino)) for destino in manifest.values()}
+    removidos = 0
+    for raiz, _, arquivos in os.walk(pasta_dist):
+        for arquivo in arquivos:
+            caminho = os.path.normpath(os.path.join(raiz, arquivo))
+            base = re.sub(r'\.(gz|br)$', '', caminho)
+            if arquivo != ARQUIVO_MANIFEST and base not in em_uso:
+                os.remove(caminho)
+                removidos += 1
+    return removidos
+
+
+# =======================================================
+# EXTENSÃO: static_url() E ENTREGA DOS PRÉ-COMPRIMIDOS
+# =======================================================
+
+class Estaticos:
+    """
+    Registra o helper `static_url()` nos templates e troca a view 'static' do Flask por
+    uma que entrega o .br/.gz quando o navegador aceita. A URL não muda com a
+    compressão, então o cache de páginas continua servindo o mesmo HTML a todos.
+    """
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        self._mtime_manifest = None
+        self._proxima_verificacao = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('STATIC_MAX_AGE_HASH', 365 * 24 * 3600)
+        app.config.setdefault('STATIC_MANIFEST_INTERVALO', 5)  # Segundos entre as checagens do manifest
+        self.intervalo_manifest = app.config['STATIC_MANIFEST_INTERVALO']
+        self.pasta_static = app.static_folder
+        self.caminho_manifest = os.path.join(app.static_folder, PASTA_DIST, ARQUIVO_MANIFEST)
+        self.carregar_manifest()
+        app.add_template_global(self.static_url, 'static_url')
+        app.view_functions['static'] = self.servir
+        app.extensions['estaticos'] = self
+
+    def carregar_manifest(self):
+        """Lê o manifest se ele mudou desde a última leitura (ex.: depois de `flask gerar-estaticos`)."""
+        try:
+            mtime = os.stat(self.caminho_manifest).st_mtime
+        except FileNotFoundError:
+            self.manifest, self._mtime_manifest = {}, None
+            return
+        if mtime != self._mtime_manifest:
+            with open(self.caminho_manifest, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+            self._mtime_manifest = mtime
+
+    def static_url(self, filename):
+        # Um stat() a cada poucos segundos: os workers passam a usar o build novo sem reiniciar
+        agora = time.monotonic()
+        if agora >= self._proxima_verificacao:
+            self._proxima_verificacao = agora + self.intervalo_manifest
+            self.carregar_manifest()
+        return url_for('static', filename=self.manifest.get(filename, filename))
+
+    def servir(self, filename):
+        max_age = None
+        if filename.startswith(PASTA_DIST + '/'):
+            # Nome com hash: o conteúdo nunca muda
+            max_age = current_app.config['STATIC_MAX_AGE_HASH']
+            for codificacao, extensao in (('br', '.br'), ('gzip', '.gz')):
+                if (request.accept_encodings[codificacao] > 0  # "br;q=0" recusa o br
+                        and os.path.isfile(os.path.join(self.pasta_static, filename + extensao))):
+                    resposta = send_from_directory(
+                        self.pasta_static, filename + extensao, max_age=max_age,
+                        mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+                    resposta.headers['Content-Encoding'] = codificacao
+                    resposta.vary.add('Accept-Encoding')
+                    resposta.cache_control.immutable = True
+                    resposta.cache_control.public = True
+                    return resposta
+
+        resposta = send_from_directory(self.pasta_static, filename, max_age=max_age)
+        if max_age is not None:
+            resposta.vary.add('Accept-Encoding')
+            resposta.cache_control.immutable = True
+            resposta.cache_control.public = True
+        return resposta
@@ -0,0 +1,95 @@
+# =======================================================
+# BANCO: RÉPLICA DE LEITURA E ESTATÍSTICAS DOS POOLS
+# =======================================================
+# Com DATABASE_REPLICA_URL definido, as rotas públicas marcadas com
+# @ler_da_replica fazem as consultas numa réplica (só GET/HEAD; o resto, e
+# qualquer flush, continua no primário). As páginas podem ficar alguns
+# segundos atrás do primário, o mesmo atraso da replicação.
+#
+# Os pools de conexão (primário e réplica) aparecem no /admin/metrics: tamanho,
+# conexões em uso, livres, overflow e quantas conexões foram descartadas por
+# estarem quebradas (o pool_pre_ping detecta as que o servidor fechou).
+
+import threading
+from collections import defaultdict
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+
+
+class SessaoRoteada(Session):
+    """Sessão que manda as leituras para a réplica quando a requisição permite."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() and g.get('ler_da_replica'):
+            replica = current_app.extensions.get('replica')
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def ler_da_replica(view):
+    """Decorator das rotas somente leitura que podem usar a réplica."""
+    @wraps(view)
+    def decorada(*args, **kwargs):
+        g.ler_da_replica = request.method in ('GET', 'HEAD')
+        try:
+            return view(*args, **kwargs)
+        finally:
+            g.pop('ler_da_replica', None)
+    return decorada
+
+
+class RoteadorBanco:
+    """Extensão que cria o engine da réplica e coleta as estatísticas dos pools."""
+
+    def __init__(self, app=None, db=None):
+        self._lock = threading.Lock()
+        self.invalidacoes = defaultdict(int)  # nome do engine
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        self.db = db
+        app.config.setdefault('DATABASE_REPLICA_URL', None)
+        url = app.config['DATABASE_REPLICA_URL']
+        if url:
+            # Mesmas opções de pool do primário; a réplica não entra no create_all nem nas migrações
+            app.extensions['replica'] = create_engine(url, **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        app.extensions['roteador_banco'] = self
+        with app.app_context():
+            for nome, engine in self.engines().items():
+                self._observar(nome, engine)
+
+    def engines(self):
+        engines = {'principal': self.db.engine}
+        replica = current_app.extensions.get('replica')
+        if replica is not None:
+            engines['replica'] = replica
+        return engines
+
+    def _observar(self, nome, engine):
+        def invalidada(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidacoes[nome] += 1
+        event.listen(engine, 'invalidate', invalidada)
+
+    # --- Estatísticas ---
+    def estatisticas(self):
+        """{(engine, estado): conexões} dos pools com tamanho fixo (QueuePool)."""
+        valores = {}
+        for nome, engine in self.engines().items():
+            pool = engine.pool
+            if not hasattr(pool, 'checkedout'):
+                continue  # NullPool/StaticPool não têm o que contar
+            valores[(nome, 'tamanho')] = pool.size()
+            valores[(nome, 'em_uso')] = pool.checkedout()
+            valores[(nome, 'livres')] = pool.checkedin()
+            valores[(nome, 'overflow')] = max(pool.overflow(), 0)
+        return valores
+
+    def total_invalidacoes(self):
+        with self._lock:
+            return dict(self.invalidacoes)
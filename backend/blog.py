@@ -0,0 +1,50 @@
+# =======================================================
+# METADADOS DOS POSTS DO BLOG
+# =======================================================
+# O resumo dos cards, o texto puro e o tempo de leitura são calculados uma vez,
+# quando o post é criado ou editado no admin, e ficam gravados no próprio post.
+# Assim a home e a listagem do blog não precisam carregar o HTML completo dos
+# artigos (nem passar o striptags nele) a cada requisição.
+# Posts antigos são preenchidos com `flask preencher-resumos`.
+
+import re
+
+from markupsafe import Markup
+
+TAMANHO_RESUMO = 150
+PALAVRAS_POR_MINUTO = 200
+
+# Tags de bloco: separam palavras mesmo sem espaço no HTML ('</p><p>', '<br>')
+_bloco_re = re.compile(r'<(?=/?(?:p|br|div|li|ul|ol|h[1-6]|blockquote|pre|table|tr|td|th|section|article)\b)', re.I)
+
+
+def extrair_texto(html):
+    """Texto do post sem tags, com as entidades decodificadas e os espaços normalizados."""
+    return Markup(_bloco_re.sub(' <', html or '')).striptags()
+
+
+def resumir(texto, tamanho=TAMANHO_RESUMO):
+    """Corta o texto na última palavra inteira antes de `tamanho`, como o filtro truncate do Jinja."""
+    if len(texto) <= tamanho:
+        return texto
+    corte = texto[:tamanho - 3].rsplit(' ', 1)[0]
+    return corte.rstrip(' .,;:') + '...'
+
+
+def metadados_do_conteudo(html):
+    """Colunas derivadas do conteúdo: resumo, texto_puro, palavras e tempo_leitura (minutos)."""
+    texto = extrair_texto(html)
+    palavras = len(texto.split())
+    return {
+        'resumo': resumir(texto),
+        'texto_puro': texto,
+        'palavras': palavras,
+        'tempo_leitura': max(1, round(palavras / PALAVRAS_POR_MINUTO)),
+    }
+
+
+def preencher_metadados(post):
+    """Atualiza as colunas derivadas de um Post a partir do conteúdo atual."""
+    for campo, valor in metadados_do_conteudo(post.conteudo).items():
+        setattr(post, campo, valor)
+    return post
@@ -0,0 +1,318 @@
+# =======================================================
+# BUSCA TEXTUAL DE CANDIDATOS
+# =======================================================
+# Em PostgreSQL usa tsvector + índice GIN com uma configuração em português
+# sem acentos ('pt_unaccent'). Em SQLite (desenvolvimento) usa um índice
+# invertido em memória, sincronizado de forma incremental a partir da
+# tabela 'pessoa_busca'.
+
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, literal_column, text
+
+CONFIG_PG = 'pt_unaccent'
+_regconfig = literal_column(f"'{CONFIG_PG}'::regconfig")
+
+# Pesos no mesmo espírito do ts_rank (A > B > C)
+PESOS = {'A': 1.0, 'B': 0.4, 'C': 0.2}
+
+_token_re = re.compile(r'\w+', re.UNICODE)
+
+STOPWORDS = {
+    'a', 'ao', 'aos', 'as', 'com', 'como', 'da', 'das', 'de', 'do', 'dos', 'e', 'em',
+    'entre', 'na', 'nas', 'no', 'nos', 'o', 'os', 'ou', 'para', 'pela', 'pelas', 'pelo',
+    'pelos', 'por', 'que', 'se', 'sem', 'sobre', 'um', 'uma', 'uns', 'umas',
+}
+
+
+def criar_configuracao_pg(conexao):
+    """Cria (se ainda não existir) a configuração de busca em português sem acentos."""
+    conexao.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+    conexao.execute(text(f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{CONFIG_PG}') THEN
+                CREATE TEXT SEARCH CONFIGURATION {CONFIG_PG} (COPY = portuguese);
+                ALTER TEXT SEARCH CONFIGURATION {CONFIG_PG}
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+            END IF;
+        END
+        $$;
+    """))
+
+
+def normalizar(texto):
+    """Remove acentos e coloca em minúsculas (mesmo efeito do unaccent no PostgreSQL)."""
+    if texto is None or texto.isascii():
+        return (texto or '').lower()  # Sem acentos a remover: evita percorrer caractere a caractere
+    texto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+
+
+def tokenizar(texto):
+    return [t for t in _token_re.findall(normalizar(texto)) if t not in STOPWORDS]
+
+
+def montar_campos(pessoa):
+    """
+    Monta o texto de cada peso a partir da Pessoa e dos seus relacionamentos.
+    A: competências e cargos | B: formação, cursos e empresas | C: atividades e resumos.
+    """
+    def juntar(valores):
+        return '\n'.join(v for v in valores if v)
+
+    peso_a = juntar([pessoa.competencias_tecnicas] + [e.cargo for e in pessoa.experiencias])
+    peso_b = juntar([f.curso for f in pessoa.formacoes]
+                    + [c.nome for c in pessoa.cursos]
+                    + [e.empresa for e in pessoa.experiencias])
+    peso_c = juntar([e.atividades for e in pessoa.experiencias]
+                    + [c.resumo_profissional for c in pessoa.candidaturas])
+    return peso_a, peso_b, peso_c
+
+
+def frequencias_ponderadas(peso_a, peso_b, peso_c):
+    """{termo: frequência} somando o peso do campo (A/B/C) de cada ocorrência."""
+    frequencias = defaultdict(float)
+    for peso, conteudo in zip('ABC', (peso_a, peso_b, peso_c)):
+        for termo in tokenizar(conteudo):
+            frequencias[termo] += PESOS[peso]
+    return frequencias
+
+
+class IndiceInvertido:
+    """Índice invertido simples (BM25 com pesos por campo), usado quando não há PostgreSQL."""
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resetar()
+
+    def _resetar(self):
+        self._postings = defaultdict(dict)   # termo -> {pessoa_id: frequência ponderada}
+        self._termos_por_doc = {}            # pessoa_id -> set(termos)
+        self._tamanho_doc = {}               # pessoa_id -> tamanho ponderado
+        self._vocabulario = []               # termos ordenados, para busca por prefixo
+        self._vocabulario_sujo = False
+        self._versoes = {}                   # pessoa_id -> atualizado_em do documento aplicado
+        self.sincronizado_ate = None
+
+    def __len__(self):
+        return len(self._tamanho_doc)
+
+    def ids(self):
+        with self._lock:
+            return set(self._tamanho_doc)
+
+    def limpar(self):
+        with self._lock:
+            self._resetar()
+
+    def versao(self, pessoa_id):
+        return self._versoes.get(pessoa_id)
+
+    def atualizar(self, pessoa_id, peso_a, peso_b, peso_c, atualizado_em=None):
+        frequencias = frequencias_ponderadas(peso_a, peso_b, peso_c)
+
+        with self._lock:
+            self._remover(pessoa_id)
+            for termo, freq in frequencias.items():
+                if termo not in self._postings:
+                    self._vocabulario_sujo = True
+                self._postings[termo][pessoa_id] = freq
+            self._termos_por_doc[pessoa_id] = set(frequencias)
+            self._tamanho_doc[pessoa_id] = sum(frequencias.values())
+            self._versoes[pessoa_id] = atualizado_em
+
+    def remover(self, pessoa_ids):
+        with self._lock:
+            for pessoa_id in pessoa_ids:
+                self._remover(pessoa_id)
+
+    def _remover(self, pessoa_id):
+        for termo in self._termos_por_doc.pop(pessoa_id, ()):
+            docs = self._postings.get(termo)
+            if docs is not None:
+                docs.pop(pessoa_id, None)
+                if not docs:
+                    del self._postings[termo]
+                    self._vocabulario_sujo = True
+        self._tamanho_doc.pop(pessoa_id, None)
+        self._versoes.pop(pessoa_id, None)
+
+    def _expandir(self, termo):
+        """Termos do vocabulário que começam com o termo buscado ('desenvolv' -> 'desenvolvedor'...)."""
+        if self._vocabulario_sujo:
+            self._vocabulario = sorted(self._postings)
+            self._vocabulario_sujo = False
+        inicio = bisect_left(self._vocabulario, termo)
+        encontrados = []
+        for candidato in self._vocabulario[inicio:]:
+            if not candidato.startswith(termo):
+                break
+            encontrados.append(candidato)
+        return encontrados
+
+    def buscar(self, consulta, limite=20):
+        """Retorna [(pessoa_id, score)] com todos os termos presentes (E lógico), do mais relevante ao menos."""
+        termos = tokenizar(consulta)
+        if not termos:
+            return []
+
+        with self._lock:
+            total = len(self._tamanho_doc)
+            if not total:
+                return []
+            media = sum(self._tamanho_doc.values()) / total
+            scores = None
+            for termo in termos:
+                parcial = defaultdict(float)
+                for variante in self._expandir(termo):
+                    docs = self._postings[variante]
+                    idf = math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for pessoa_id, freq in docs.items():
+                        norma = self.k1 * (1 - self.b + self.b * self._tamanho_doc[pessoa_id] / media)
+                        parcial[pessoa_id] += idf * freq * (self.k1 + 1) / (freq + norma)
+                if scores is None:
+                    scores = parcial
+                else:
+                    scores = {pid: s + parcial[pid] for pid, s in scores.items() if pid in parcial}
+                if not scores:
+                    return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limite]
+
+
+# --- SINCRONIZAÇÃO DOS ÍNDICES EM MEMÓRIA (busca em SQLite e ranking) ---
+# O atualizado_em é carimbado pelo app antes do commit: uma transação que
+# carimbou T1 pode terminar depois de outra que carimbou T2 > T1, ou vir de um
+# servidor com o relógio atrasado. Por isso a leitura incremental recomeça
+# `janela` antes da maior data já vista (documentos com a versão que o índice
+# já tem são pulados), e de tempos em tempos (ou quando o total de documentos
+# não bate) a reconciliação compara (pessoa_id, atualizado_em) de todos os
+# documentos com as versões do índice: pega exclusões, transações mais longas
+# que a janela e relógios mais atrasados que ela.
+
+def sincronizar_indice(indice, session, modelo, janela, reconciliar=False):
+    """
+    Aplica no índice os documentos de `modelo` (PessoaBusca) novos ou alterados e tira os
+    excluídos. O índice expõe sincronizado_ate, versao(pessoa_id), ids(), __len__,
+    atualizar(pessoa_id, peso_a, peso_b, peso_c, atualizado_em) e remover(pessoa_ids).
+    Retorna quantos documentos aplicou.
+    """
+    campos = (modelo.pessoa_id, modelo.peso_a, modelo.peso_b, modelo.peso_c, modelo.atualizado_em)
+
+    def aplicar(linhas):
+        aplicados = 0
+        for linha in linhas:
+            if indice.versao(linha.pessoa_id) == linha.atualizado_em:
+                continue
+            indice.atualizar(linha.pessoa_id, linha.peso_a, linha.peso_b, linha.peso_c, linha.atualizado_em)
+            if indice.sincronizado_ate is None or linha.atualizado_em > indice.sincronizado_ate:
+                indice.sincronizado_ate = linha.atualizado_em
+            aplicados += 1
+        return aplicados
+
+    query = session.query(*campos)
+    if indice.sincronizado_ate is not None:
+        query = query.filter(modelo.atualizado_em >= indice.sincronizado_ate - janela)
+    aplicados = aplicar(query.yield_per(1000))
+
+    if not reconciliar:
+        reconciliar = session.query(func.count(modelo.pessoa_id)).scalar() != len(indice)
+    if reconciliar:
+        versoes = dict(session.query(modelo.pessoa_id, modelo.atualizado_em))
+        indice.remover(indice.ids() - versoes.keys())
+        pendentes = sorted(pessoa_id for pessoa_id, versao in versoes.items() if indice.versao(pessoa_id) != versao)
+        for inicio in range(0, len(pendentes), 500):
+            aplicados += aplicar(session.query(*campos).filter(modelo.pessoa_id.in_(pendentes[inicio:inicio + 500])))
+    return aplicados
+
+
+class MotorBusca:
+    """
+    Fachada da busca de candidatos. Escolhe o backend pelo dialeto do banco:
+    PostgreSQL (tsvector/GIN) ou o índice invertido em memória.
+    """
+
+    def __init__(self, app=None, db=None, modelo=None):
+        self.db = None
+        self.modelo = None
+        self.indice = IndiceInvertido()
+        self._proxima_reconciliacao = 0
+        if app is not None:
+            self.init_app(app, db, modelo)
+
+    def init_app(self, app, db, modelo):
+        app.config.setdefault('INDICES_JANELA_SINCRONIZACAO', 120)   # Segundos relidos antes da última sincronização
+        app.config.setdefault('INDICES_RECONCILIAR_INTERVALO', 600)  # Segundos entre as conferências completas
+        self.app = app
+        self.db = db
+        self.modelo = modelo
+        app.extensions['busca'] = self
+
+    @property
+    def usa_postgres(self):
+        return self.db.engine.dialect.name == 'postgresql'
+
+    def _vetor_pg(self, peso_a, peso_b, peso_c):
+        partes = [
+            func.setweight(func.to_tsvector(_regconfig, func.coalesce(conteudo, '')), peso)
+            for peso, conteudo in zip('ABC', (peso_a, peso_b, peso_c))
+        ]
+        return partes[0].op('||')(partes[1]).op('||')(partes[2])
+
+    def indexar(self, pessoa):
+        """
+        Atualiza o documento de busca da Pessoa na sessão atual.
+        Deve ser chamado antes do commit; o vetor é gravado na mesma transação do cadastro.
+        """
+        peso_a, peso_b, peso_c = montar_campos(pessoa)
+        registro = pessoa.indice_busca
+        if registro is None:
+            registro = self.modelo()
+            pessoa.indice_busca = registro
+        registro.peso_a = peso_a
+        registro.peso_b = peso_b
+        registro.peso_c = peso_c
+        registro.atualizado_em = datetime.utcnow()
+        if self.usa_postgres:
+            registro.documento = self._vetor_pg(peso_a, peso_b, peso_c)
+        return registro
+
+    def buscar(self, consulta, limite=20):
+        """Retorna os ids das Pessoas mais relevantes para a consulta, em ordem de relevância."""
+        consulta = (consulta or '').strip()
+        if not consulta:
+            return []
+        if self.usa_postgres:
+            return self._buscar_pg(consulta, limite)
+        self._sincronizar_memoria()
+        return [pessoa_id for pessoa_id, _ in self.indice.buscar(consulta, limite)]
+
+    def _buscar_pg(self, consulta, limite):
+        modelo = self.modelo
+        tsquery = func.websearch_to_tsquery(_regconfig, consulta)
+        rank = func.ts_rank_cd(modelo.documento, tsquery)
+        linhas = (self.db.session.query(modelo.pessoa_id)
+                  .filter(modelo.documento.op('@@')(tsquery))
+                  .order_by(rank.desc(), modelo.pessoa_id)
+                  .limit(limite).all())
+        return [linha.pessoa_id for linha in linhas]
+
+    def _sincronizar_memoria(self):
+        """Traz para o índice em memória os documentos alterados (e tira os excluídos) desde a última sincronização."""
+        agora = time.monotonic()
+        reconciliar = agora >= self._proxima_reconciliacao
+        if reconciliar:
+            self._proxima_reconciliacao = agora + self.app.config['INDICES_RECONCILIAR_INTERVALO']
+        sincronizar_indice(self.indice, self.db.session, self.modelo,
+                           timedelta(seconds=self.app.config['INDICES_JANELA_SINCRONIZACAO']), reconciliar)
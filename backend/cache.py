@@ -0,0 +1,244 @@
+# =======================================================
+# CACHE DE PÁGINAS RENDERIZADAS
+# =======================================================
+# Guarda o HTML final das rotas públicas (home, blog, empresas...) para que o
+# tráfego anônimo seja servido da memória, sem consultar o banco nem renderizar
+# o Jinja de novo. Cada rota pertence a um grupo ('posts', 'especialistas'...);
+# as rotas do admin invalidam o grupo inteiro incrementando a sua versão, que
+# faz parte da chave. As entradas antigas somem pelo TTL/LRU.
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, session, current_app
+from flask_login import current_user
+
+
+class MemoriaBackend:
+    """
+    Backend em memória do processo: LRU limitado por número de entradas, com TTL.
+    Cada worker tem o seu, então uma invalidação só vale no worker que a recebeu;
+    com vários workers, use o RedisBackend.
+    """
+
+    def __init__(self, max_entradas=500, max_versoes=10000):
+        self.max_entradas = max_entradas
+        self.max_versoes = max_versoes
+        self._dados = OrderedDict()   # chave -> (expira_em, valor)
+        # Só os grupos já invalidados, em ordem LRU (um por Pessoa com o PERFIL_CACHE_TTL).
+        # As versões vêm de um contador único; ao descartar um grupo, os que não estão
+        # no dicionário passam a usar um piso maior que qualquer versão já emitida, para
+        # que nenhuma entrada antiga volte a ser servida.
+        self._versoes = OrderedDict()
+        self._contador = 0
+        self._piso = 0
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None:
+                return None
+            expira_em, valor = item
+            if expira_em < time.monotonic():
+                del self._dados[chave]
+                return None
+            self._dados.move_to_end(chave)
+            return valor
+
+    def set(self, chave, valor, ttl):
+        with self._lock:
+            self._dados[chave] = (time.monotonic() + ttl, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.max_entradas:
+                self._dados.popitem(last=False)
+
+    def versao(self, grupo):
+        with self._lock:
+            return self._versoes.get(grupo, self._piso)
+
+    def incrementar(self, grupo):
+        with self._lock:
+            self._contador += 1
+            self._versoes[grupo] = self._contador
+            self._versoes.move_to_end(grupo)
+            if len(self._versoes) > self.max_versoes:
+                self._versoes.popitem(last=False)
+                self._contador += 1
+                self._piso = self._contador
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+
+
+class RedisBackend:
+    """
+    Backend compartilhado entre workers. O TTL é aplicado por chave (SETEX) e o
+    limite LRU fica a cargo do próprio Redis (maxmemory-policy allkeys-lru).
+    Aceita qualquer cliente com a API do redis-py (get/setex/incr).
+    """
+
+    def __init__(self, cliente, prefixo='honoriel:'):
+        self.cliente = cliente
+        self.prefixo = prefixo
+
+    @classmethod
+    def from_url(cls, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("PAGE_CACHE_BACKEND='redis' requer o pacote 'redis' (pip install redis).")
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, chave):
+        return self.cliente.get(self.prefixo + chave)
+
+    def set(self, chave, valor, ttl):
+        self.cliente.setex(self.prefixo + chave, int(ttl), valor)
+
+    def versao(self, grupo):
+        valor = self.cliente.get(f'{self.prefixo}versao:{grupo}')
+        return int(valor) if valor else 0
+
+    def incrementar(self, grupo):
+        self.cliente.incr(f'{self.prefixo}versao:{grupo}')
+
+    def limpar(self):
+        for chave in self.cliente.scan_iter(f'{self.prefixo}pagina:*'):
+            self.cliente.delete(chave)
+
+
+def _serializar(resposta):
+    cabecalho = json.dumps({
+        'status': resposta.status_code,
+        'headers': [(k, v) for k, v in resposta.headers.items() if k.lower() != 'set-cookie'],
+    }).encode('utf-8')
+    return cabecalho + b'\n' + resposta.get_data()
+
+
+def _desserializar(valor):
+    cabecalho, corpo = valor.split(b'\n', 1)
+    dados = json.loads(cabecalho)
+    return current_app.response_class(corpo, status=dados['status'], headers=dados['headers'])
+
+
+class CachePaginas:
+    """Extensão do cache de páginas. Configurada por PAGE_CACHE_BACKEND ('memoria', 'redis' ou 'nenhum')."""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.ttl = 300
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        tipo = app.config.get('PAGE_CACHE_BACKEND', 'memoria')
+        self.ttl = app.config.get('PAGE_CACHE_TTL', 300)
+        if tipo == 'redis':
+            self.backend = RedisBackend.from_url(app.config['PAGE_CACHE_REDIS_URL'])
+        elif tipo == 'memoria':
+            self.backend = MemoriaBackend(app.config.get('PAGE_CACHE_MAX_ENTRADAS', 500),
+                                          app.config.get('PAGE_CACHE_MAX_VERSOES', 10000))
+        else:
+            self.backend = None
+        app.extensions['cache_paginas'] = self
+
+    def _pode_usar_cache(self):
+        # Só GET anônimo e sem mensagens flash pendentes (elas aparecem no base.html)
+        return (
+            self.backend is not None
+            and request.method == 'GET'
+            and not current_user.is_authenticated
+            and not session.get('_flashes')
+        )
+
+    def _chave(self, grupo):
+        argumentos = sorted((request.view_args or {}).items()) + sorted(request.args.items(multi=True))
+        return f"pagina:{grupo}:{self.backend.versao(grupo)}:{request.endpoint}:{json.dumps(argumentos, default=str)}"
+
+    def cached(self, grupo):
+        """Decorator das rotas públicas: responde do cache quando possível, senão renderiza e guarda."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self._pode_usar_cache():
+                    return view(*args, **kwargs)
+
+                chave = self._chave(grupo)
+                guardado = self.backend.get(chave)
+                if guardado is not None:
+                    resposta = _desserializar(guardado)
+                    resposta.headers['X-Cache'] = 'HIT'
+                    # Usa o ETag/Last-Modified guardados para responder 304 sem ir ao banco
+                    return resposta.make_conditional(request)
+
+                resposta = current_app.make_response(view(*args, **kwargs))
+                if resposta.status_code == 200 and not resposta.direct_passthrough:
+                    self.backend.set(chave, _serializar(resposta), self.ttl)
+                    resposta.headers['X-Cache'] = 'MISS'
+                return resposta
+            return wrapper
+        return decorator
+
+    def invalidar(self, *grupos):
+        """Chamado pelas rotas do admin depois de um commit que altera o conteúdo público."""
+        if self.backend is None:
+            return
+        for grupo in grupos:
+            self.backend.incrementar(grupo)
+
+
+# =======================================================
+# GET CONDICIONAL (ETag / Last-Modified)
+# =======================================================
+
+def condicional(calcular_validadores):
+    """
+    Decorator para rotas cujo conteúdo depende de poucas datas do banco.
+    `calcular_validadores(**view_args)` deve ser barato (uma consulta agregada) e retornar
+    (partes_do_etag, ultima_modificacao), ou (None, None) se não houver o que validar. Se o navegador já tiver a versão atual,
+    responde 304 antes de renderizar o template.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Mensagens flash pendentes mudam o HTML sem mudar o banco
+            if request.method != 'GET' or session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            partes, ultima_modificacao = calcular_validadores(*args, **kwargs)
+            if partes is None:
+                # Nada a validar (ex.: registro inexistente): segue o fluxo normal da rota
+                return view(*args, **kwargs)
+            bruto = json.dumps([request.endpoint, sorted(request.args.items(multi=True)), partes], default=str)
+            etag = hashlib.sha1(bruto.encode('utf-8')).hexdigest()
+            if ultima_modificacao is not None:
+                ultima_modificacao = ultima_modificacao.replace(microsecond=0)
+
+            if request.if_none_match:
+                nao_modificado = request.if_none_match.contains(etag)
+            else:
+                nao_modificado = (ultima_modificacao is not None
+                                  and request.if_modified_since is not None
+                                  and ultima_modificacao <= request.if_modified_since.replace(tzinfo=None))
+
+            if nao_modificado:
+                resposta = current_app.response_class(status=304)
+            else:
+                resposta = current_app.make_response(view(*args, **kwargs))
+                if resposta.status_code != 200:
+                    return resposta
+
+            resposta.set_etag(etag)
+            if ultima_modificacao is not None:
+                resposta.last_modified = ultima_modificacao
+            # O navegador guarda a página, mas sempre revalida (barato: 304)
+            resposta.cache_control.no_cache = True
+            return resposta
+        return wrapper
+    return decorator
@@ -0,0 +1,370 @@
+# =======================================================
+# COMANDOS DO FLASK CLI
+# =======================================================
+# Registrados pelo create_app(); rode a partir de backend/ (ex.: `flask reindexar-busca`).
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import click
+from sqlalchemy import exists, func, insert, text, update
+from sqlalchemy.orm import load_only
+
+import duplicados
+import estatisticas
+import imagens
+import retencao
+from admin import CANDIDATURAS_POR_PAGINA_PADRAO, consulta_candidatos, consulta_pagina
+from assets import gerar_estaticos, limpar_dist
+from blog import preencher_metadados
+from extensoes import bcrypt, cache_paginas, db, estaticos, fila_curriculos, fila_email, motor_busca, ranking
+from fila_curriculos import FALHOU, PENDENTE
+from models import Candidatura, Especialista, Pessoa, Post, TextoCurriculo, User
+from publico import CAMPOS_CARD_POST
+
+
+def registrar_comandos(app):
+    @app.cli.command("create-admin")
+    def create_admin():
+        """Cria o usuário administrador inicial."""
+        username = input("Digite o nome de usuário do admin: ")
+        password = input("Digite a senha do admin: ")
+
+        user_exists = User.query.filter_by(username=username).first()
+        if user_exists:
+            print(f"Usuário '{username}' já existe.")
+            return
+
+        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+        new_user = User(username=username, password_hash=hashed_password)
+        db.session.add(new_user)
+        db.session.commit()
+        print(f"Usuário admin '{username}' criado com sucesso!")
+
+    @app.cli.command("reindexar-busca")
+    def reindexar_busca():
+        """Recria o documento de busca de todas as Pessoas (use após migrar ou importar dados)."""
+        total = 0
+        ultimo_id = 0
+        while True:
+            # Lotes por id para não carregar todas as pessoas na memória
+            lote = Pessoa.query.filter(Pessoa.id > ultimo_id).order_by(Pessoa.id).limit(500).all()
+            if not lote:
+                break
+            for pessoa in lote:
+                motor_busca.indexar(pessoa)
+            db.session.commit()
+            ultimo_id = lote[-1].id
+            total += len(lote)
+            db.session.expunge_all()
+        print(f"{total} pessoas reindexadas.")
+
+    @app.cli.command("reconstruir-ranking")
+    def reconstruir_ranking():
+        """Remonta do zero a matriz do ranking por vaga (após reindexar-busca ou mudar os pesos)."""
+        matriz = ranking.reconstruir()
+        print(f"Ranking reconstruído: {len(matriz)} pessoas, {len(matriz.termos)} termos "
+              f"em {app.config['RANKING_ARQUIVO']}.")
+
+    @app.cli.command("reconstruir-estatisticas")
+    def reconstruir_estatisticas():
+        """
+        Recalcula do zero as contagens do painel do admin. As gravações do site já
+        as mantêm em dia: rode uma vez depois do upgrade e num cron noturno, para
+        corrigir desvios (ex.: dados importados direto no banco).
+        """
+        import time
+        inicio = time.perf_counter()
+        linhas = estatisticas.reconstruir()
+        print(f"Estatísticas reconstruídas: {linhas} contagens em {time.perf_counter() - inicio:.1f} s.")
+
+    @app.cli.command("verificar-indices")
+    @click.option('--pessoas', type=int, default=20000, help='Pessoas de teste (cada uma com 2 candidaturas).')
+    def verificar_indices(pessoas):
+        """
+        Confere com EXPLAIN se as consultas das rotas usam os índices esperados (PostgreSQL).
+        Insere uma massa de teste numa transação que é desfeita no fim, roda ANALYZE e
+        compara os índices citados no plano com os esperados para cada consulta. Sai com
+        código 1 se faltar algum (ex.: índice trigram removido ou consulta que deixou de usá-lo).
+        """
+        if db.engine.dialect.name != 'postgresql':
+            print("Verificação disponível apenas no PostgreSQL.")
+            return
+
+        import re
+        import uuid
+        # Termo raro na massa (1 em 1000), como uma busca real do admin
+        termo = 'verifindice'
+        prefixo = f'verificar-indices-{uuid.uuid4().hex[:8]}-'
+        massa = [
+            ("""WITH novas AS (
+                    INSERT INTO pessoa (nome_completo, email)
+                    SELECT 'Pessoa ' || md5(i::text) || CASE WHEN i % 1000 = 0 THEN ' ' || :termo ELSE '' END,
+                           :prefixo || i || '@exemplo.invalid'
+                    FROM generate_series(1, :pessoas) AS i
+                    RETURNING id)
+                INSERT INTO candidatura (pessoa_id, vaga_objetivo, data_candidatura)
+                SELECT novas.id, 'Vaga ' || md5(novas.id || '-' || s)
+                                 || CASE WHEN (novas.id + s) % 1000 = 0 THEN ' ' || :termo ELSE '' END,
+                       now() - random() * interval '730 days'
+                FROM novas CROSS JOIN generate_series(1, 2) AS s"""),
+            ("""INSERT INTO post (titulo, conteudo, data_publicacao)
+                SELECT 'Post ' || i, md5(i::text), now() - i * interval '1 hour'
+                FROM generate_series(1, :pessoas / 10) AS i"""),
+            ("""INSERT INTO especialista (nome, titulo, ativo, ordem, area)
+                SELECT 'Especialista ' || i, 'Teste', i % 10 = 0, i, 'outro'
+                FROM generate_series(1, :pessoas / 100) AS i"""),
+        ]
+        tabelas = 'pessoa, candidatura, post, especialista'
+
+        def consultas(pessoa_id):
+            """{nome: (consulta, índices que o plano tem de citar)}; as consultas são as das rotas."""
+            pagina = CANDIDATURAS_POR_PAGINA_PADRAO
+            cursor = (datetime.utcnow() - timedelta(days=365), 0)
+            return {
+                'admin_candidatos (listagem)': (
+                    consulta_pagina(consulta_candidatos(), pagina), {'ix_candidatura_data_candidatura_id'}),
+                'admin_candidatos (página seguinte)': (
+                    consulta_pagina(consulta_candidatos(), pagina, depois=cursor),
+                    {'ix_candidatura_data_candidatura_id'}),
+                'admin_candidatos (nome / e-mail)': (
+                    consulta_pagina(consulta_candidatos('pessoa', termo), pagina),
+                    {'ix_pessoa_nome_completo_trgm', 'ix_pessoa_email_trgm'}),
+                'admin_candidatos (vaga)': (
+                    consulta_pagina(consulta_candidatos('candidatura', termo), pagina),
+                    {'ix_candidatura_vaga_objetivo_trgm'}),
+                'detalhe_candidato (candidaturas)': (
+                    Candidatura.query.filter(Candidatura.pessoa_id.in_([pessoa_id]))
+                    .order_by(Candidatura.data_candidatura.desc(), Candidatura.id.desc()),
+                    {'ix_candidatura_pessoa_id'}),
+                'home': (
+                    Post.query.options(load_only(*CAMPOS_CARD_POST)).order_by(Post.data_publicacao.desc()).limit(3),
+                    {'ix_post_data_publicacao'}),
+                'blog_list': (
+                    Post.query.options(load_only(*CAMPOS_CARD_POST)).order_by(Post.data_publicacao.desc())
+                    .limit(6).offset(6), {'ix_post_data_publicacao'}),
+                'empresas': (
+                    Especialista.query.filter_by(ativo=True).order_by(Especialista.ordem),
+                    {'ix_especialista_ativo_ordem'}),
+            }
+
+        falhas = 0
+        with db.engine.connect() as conexao:
+            with conexao.begin() as transacao:
+                for sql in massa:
+                    conexao.execute(text(sql), {'termo': termo, 'prefixo': prefixo, 'pessoas': pessoas})
+                pessoa_id = conexao.execute(text('SELECT id FROM pessoa WHERE email = :email'),
+                                            {'email': f'{prefixo}1@exemplo.invalid'}).scalar()
+                conexao.execute(text(f'ANALYZE {tabelas}'))
+                # A massa é pequena perto da produção: sem Seq Scan, o planejador escolhe entre os índices
+                conexao.execute(text('SET LOCAL enable_seqscan = off'))
+                for nome, (consulta, esperados) in consultas(pessoa_id).items():
+                    sql = consulta.statement.compile(dialect=db.engine.dialect,
+                                                     compile_kwargs={'render_postcompile': True})
+                    plano = conexao.exec_driver_sql(f'EXPLAIN {sql}', sql.params).scalars().all()
+                    usados = set(re.findall(r'(?:Scan(?: Backward)? using|Bitmap Index Scan on) (\w+)',
+                                            '\n'.join(plano)))
+                    faltando = esperados - usados
+                    if faltando:
+                        falhas += 1
+                        print(f"[FALHA] {nome}: não usa {', '.join(sorted(faltando))}")
+                        print('\n'.join(f'        {linha}' for linha in plano))
+                    else:
+                        print(f"[OK] {nome}: {', '.join(sorted(esperados))}")
+                transacao.rollback()
+            # O ANALYZE grava o número de linhas fora da transação: refaz sem a massa
+            conexao.execution_options(isolation_level='AUTOCOMMIT').execute(text(f'ANALYZE {tabelas}'))
+
+        if falhas:
+            print(f"{falhas} consulta(s) sem o índice esperado.")
+            sys.exit(1)
+
+    @app.cli.command("processar-emails")
+    @click.option('--continuo', is_flag=True, help='Continua rodando e verificando a fila periodicamente.')
+    def processar_emails(continuo):
+        """Envia os e-mails pendentes da fila (útil com MAIL_QUEUE_WORKERS=0 ou num processo dedicado)."""
+        import time
+        total = 0
+        while True:
+            enviados = fila_email.processar_lote()
+            total += enviados
+            if not enviados:
+                if not continuo:
+                    break
+                time.sleep(app.config['MAIL_QUEUE_INTERVALO'])
+        print(f"{total} e-mail(s) processado(s).")
+
+    @app.cli.command("extrair-curriculos")
+    @click.option('--processos', type=int, help='Tamanho do pool (padrão: CURRICULO_TEXTO_PROCESSOS).')
+    @click.option('--refazer-falhas', is_flag=True, help='Devolve para a fila os arquivos que falharam.')
+    @click.option('--continuo', is_flag=True, help='Continua rodando e verificando a fila periodicamente.')
+    def extrair_curriculos(processos, refazer_falhas, continuo):
+        """Enfileira os PDFs que ainda não têm texto extraído e processa a fila."""
+        import time
+        sem_texto = [linha.curriculo_pdf_path for linha in
+                     db.session.query(Candidatura.curriculo_pdf_path)
+                     .filter(Candidatura.curriculo_pdf_path.isnot(None),
+                             ~exists().where(TextoCurriculo.arquivo == Candidatura.curriculo_pdf_path))
+                     .distinct()]
+        if sem_texto:
+            db.session.execute(insert(TextoCurriculo), [
+                {'arquivo': arquivo, 'status': PENDENTE, 'tentativas': 0} for arquivo in sem_texto])
+        if refazer_falhas:
+            db.session.execute(update(TextoCurriculo).where(TextoCurriculo.status == FALHOU)
+                               .values(status=PENDENTE, tentativas=0))
+        db.session.commit()
+        print(f"{len(sem_texto)} arquivo(s) enfileirado(s).")
+
+        total = 0
+        try:
+            while True:
+                tratados = fila_curriculos.processar_lote(processos)
+                total += tratados
+                if tratados:
+                    print(f"  {total} arquivo(s) processado(s)")
+                elif not continuo:
+                    break
+                else:
+                    time.sleep(app.config['CURRICULO_TEXTO_INTERVALO'])
+        finally:
+            fila_curriculos.encerrar()
+        resumo = db.session.query(TextoCurriculo.status, func.count()).group_by(TextoCurriculo.status).all()
+        print(', '.join(f"{status}: {quantidade}" for status, quantidade in sorted(resumo)) or 'Fila vazia.')
+
+    @app.cli.command("gerar-miniaturas")
+    @click.option('--forcar', is_flag=True, help='Recria os derivados mesmo que já existam.')
+    def gerar_miniaturas_cli(forcar):
+        """Gera os derivados responsivos das imagens já enviadas (posts e especialistas)."""
+        nomes = [p.imagem_destaque_path for p in Post.query.filter(Post.imagem_destaque_path.isnot(None))]
+        nomes += [e.foto_path for e in Especialista.query.filter(Especialista.foto_path.isnot(None))]
+        criados = 0
+        for nome in nomes:
+            if not os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], nome)):
+                print(f"Arquivo não encontrado: {nome}")
+                continue
+            try:
+                criados += len(imagens.gerar_derivados(app.config['UPLOAD_FOLDER'], nome, forcar=forcar))
+            except Exception as e:
+                print(f"ERRO AO GERAR MINIATURAS DE {nome}: {e}")
+        print(f"{len(nomes)} imagens verificadas, {criados} derivados criados.")
+
+    @app.cli.command("preencher-resumos")
+    @click.option('--todos', is_flag=True, help='Recalcula também os posts que já têm resumo.')
+    def preencher_resumos(todos):
+        """Calcula resumo, texto puro e tempo de leitura dos posts (use após migrar)."""
+        total = 0
+        ultimo_id = 0
+        while True:
+            query = Post.query.filter(Post.id > ultimo_id)
+            if not todos:
+                query = query.filter(Post.resumo.is_(None))
+            lote = query.order_by(Post.id).limit(200).all()
+            if not lote:
+                break
+            for post in lote:
+                preencher_metadados(post)
+            db.session.commit()
+            ultimo_id = lote[-1].id
+            total += len(lote)
+            db.session.expunge_all()
+        if total:
+            cache_paginas.invalidar('posts')
+        print(f"{total} posts atualizados.")
+
+    @app.cli.command("gerar-estaticos")
+    @click.option('--limpar', is_flag=True, help='Remove de static/dist/ as cópias de builds anteriores.')
+    def gerar_estaticos_cli(limpar):
+        """Minifica CSS/JS, grava cópias com hash em static/dist/, o manifest e os .gz/.br."""
+        manifest = gerar_estaticos(app.static_folder, app.static_url_path)
+        estaticos.carregar_manifest()
+        print(f"{len(manifest)} arquivos no manifest.")
+        if limpar:
+            print(f"{limpar_dist(app.static_folder, manifest)} arquivos antigos removidos.")
+
+    @app.cli.command("excluir-candidaturas")
+    @click.option('--dias', type=int, help='Exclui candidaturas com mais de N dias (retenção).')
+    @click.option('--antes-de', type=click.DateTime(formats=['%Y-%m-%d']), help='Exclui candidaturas anteriores a AAAA-MM-DD.')
+    @click.option('--filtro-por', type=click.Choice(retencao.FILTROS_PERMITIDOS), default='pessoa')
+    @click.option('--termo', help='Mesmo termo de busca da listagem do admin.')
+    @click.option('--manter-pessoas', is_flag=True, help='Não exclui as pessoas que ficarem sem candidaturas.')
+    @click.option('--lote', type=int, help='Candidaturas por transação (padrão: RETENCAO_LOTE).')
+    @click.option('--simular', is_flag=True, help='Só mostra quantas candidaturas seriam excluídas.')
+    @click.option('--retomar', 'retomar_id', type=int, help='Retoma uma exclusão interrompida pelo id.')
+    @click.option('--sim', is_flag=True, help='Não pede confirmação.')
+    def excluir_candidaturas(dias, antes_de, filtro_por, termo, manter_pessoas, lote, simular, retomar_id, sim):
+        """Exclusão em lote/retenção de candidaturas, com remoção dos PDFs em segundo plano."""
+        if retomar_id is None:
+            anteriores_a = antes_de or (datetime.utcnow() - timedelta(days=dias) if dias is not None else None)
+            criterios = dict(anteriores_a=anteriores_a, filtro_por=filtro_por, termo_busca=termo,
+                             remover_pessoas=not manter_pessoas, solicitado_por='cli')
+            try:
+                candidaturas, pessoas = retencao.simular(retencao.montar_exclusao(**criterios))
+            except retencao.CriterioInvalido as e:
+                raise click.UsageError(str(e))
+            print(f"{candidaturas} candidatura(s) de {pessoas} pessoa(s) atendem aos critérios.")
+            if simular or not candidaturas:
+                return
+            if not sim:
+                click.confirm('Excluir definitivamente?', abort=True)
+            retomar_id = retencao.criar_exclusao(**criterios).id
+
+        def progresso(exclusao):
+            print(f"  #{exclusao.id}: {exclusao.candidaturas_excluidas} candidatura(s), "
+                  f"{exclusao.pessoas_excluidas} pessoa(s) excluídas")
+
+        exclusao = retencao.executar_exclusao(retomar_id, lote=lote, progresso=progresso)
+        if exclusao is None:
+            print(f"Exclusão #{retomar_id} não encontrada, já concluída ou em execução em outro processo.")
+            sys.exit(1)
+        print(f"Exclusão #{exclusao.id} {exclusao.status}: {exclusao.candidaturas_excluidas} candidatura(s), "
+              f"{exclusao.pessoas_excluidas} pessoa(s) e {exclusao.arquivos_removidos} arquivo(s) removidos.")
+        if exclusao.erro:
+            print(f"Erro: {exclusao.erro} (rode de novo com --retomar {exclusao.id})")
+            sys.exit(1)
+
+    @app.cli.command("remover-curriculos-orfaos")
+    @click.option('--idade-minima', type=int, default=24, help='Só arquivos mais velhos que N horas.')
+    @click.option('--simular', is_flag=True, help='Só lista os arquivos.')
+    def remover_curriculos_orfaos(idade_minima, simular):
+        """Remove do disco os PDFs que não pertencem a nenhuma candidatura."""
+        pasta = app.config['UPLOAD_FOLDER']
+        orfaos = retencao.curriculos_orfaos(pasta, idade_minima * 3600)
+        for nome in orfaos:
+            print(f"  {nome}")
+        if simular:
+            print(f"{len(orfaos)} arquivo(s) órfão(s).")
+            return
+        removidos = sum(retencao.remover_arquivo(pasta, nome) for nome in orfaos)
+        retencao.remover_texto(orfaos)
+        db.session.commit()
+        print(f"{removidos} arquivo(s) removido(s).")
+
+    @app.cli.command("detectar-duplicados")
+    @click.option('--limiar', type=float, default=duplicados.LIMIAR_PADRAO, show_default=True,
+                  help='Similaridade mínima das experiências (0 a 1) para contar como evidência.')
+    @click.option('--mostrar', type=int, default=30, show_default=True, help='Pares listados no relatório.')
+    @click.option('--simular', is_flag=True, help='Só mostra o relatório, sem atualizar a lista do admin.')
+    def detectar_duplicados(limiar, mostrar, simular):
+        """Procura Pessoas cadastradas com e-mails diferentes que parecem a mesma pessoa."""
+        import time
+        inicio = time.perf_counter()
+        perfis = list(duplicados.carregar_perfis())
+        pares, comparados = duplicados.encontrar_pares(perfis, limiar)
+        total = len(perfis)
+        print(f"{total} pessoas, {comparados} pares comparados (de {total * (total - 1) // 2} possíveis), "
+              f"{len(pares)} possíveis duplicados em {time.perf_counter() - inicio:.1f}s.")
+
+        exibidos = pares[:mostrar]
+        pessoas = {pessoa.id: pessoa for pessoa in Pessoa.query.options(
+            load_only(Pessoa.id, Pessoa.nome_completo, Pessoa.email)).filter(
+            Pessoa.id.in_({pessoa_id for par in exibidos for pessoa_id in par[:2]}))}
+        for pessoa_id, duplicata_id, score, motivos in exibidos:
+            a, b = pessoas[pessoa_id], pessoas[duplicata_id]
+            print(f"  {score:.2f}  #{a.id} {a.nome_completo} <{a.email}>  x  #{b.id} {b.nome_completo} <{b.email}>"
+                  f"  ({motivos})")
+        if len(pares) > mostrar:
+            print(f"  ... e mais {len(pares) - mostrar}.")
+        if not simular:
+            gravados = duplicados.gravar_pares(pares)
+            print(f"{gravados} par(es) pendente(s) no admin (Candidaturas > Duplicados).")
@@ -0,0 +1,118 @@
+# =======================================================
+# CONFIGURAÇÃO
+# =======================================================
+# Lida a partir das variáveis de ambiente (e do .env) no momento em que o
+# create_app() é chamado, não no import, para que scripts e testes possam
+# ajustar o ambiente antes de montar o app.
+
+import os
+
+from dotenv import load_dotenv
+
+PASTA_BACKEND = os.path.dirname(os.path.abspath(__file__))
+
+
+def opcoes_do_engine(url):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS a partir do ambiente. Cada worker (processo) tem o
+    seu pool: workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) precisa caber no
+    max_connections do PostgreSQL.
+    """
+    opcoes = {
+        # Testa a conexão antes de usar: evita erro com conexões que o servidor fechou
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        # Renova conexões mais velhas que isso (segundos), antes de firewalls/PgBouncer as derrubarem
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+    }
+    # O SQLite em memória usa um pool sem tamanho fixo
+    if url and not url.startswith('sqlite'):
+        opcoes.update({
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)), # Segundos esperando uma conexão livre
+        })
+    return opcoes
+
+
+def configuracao_do_ambiente():
+    """Monta o dicionário de configuração do app a partir do ambiente."""
+    # Carrega as variáveis do arquivo .env
+    load_dotenv()
+    return {
+        # --- CONFIGURAÇÕES GERAIS ---
+        'SQLALCHEMY_DATABASE_URI': os.getenv('DATABASE_URL'),
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SQLALCHEMY_ENGINE_OPTIONS': opcoes_do_engine(os.getenv('DATABASE_URL')),
+        # Réplica de leitura opcional para as rotas públicas (ver banco.py)
+        'DATABASE_REPLICA_URL': os.getenv('DATABASE_REPLICA_URL'),
+        'SECRET_KEY': os.getenv('SECRET_KEY'),
+        'UPLOAD_FOLDER': os.getenv('UPLOAD_FOLDER', os.path.join(PASTA_BACKEND, 'uploads')),
+        # Limite da requisição inteira (o Flask responde 413 acima disso) e do PDF do currículo
+        'MAX_CONTENT_LENGTH': int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024)),
+        'CURRICULO_MAX_BYTES': int(os.getenv('CURRICULO_MAX_BYTES', 5 * 1024 * 1024)),
+        # Entrega dos uploads: 'nenhum' (o Flask envia), 'x-accel' (nginx) ou 'x-sendfile' (Apache/lighttpd)
+        'UPLOADS_OFFLOAD': os.getenv('UPLOADS_OFFLOAD', 'nenhum'),
+        'UPLOADS_ACCEL_PREFIXO': os.getenv('UPLOADS_ACCEL_PREFIXO', '/_uploads_internos/'),
+
+        # --- CACHE DE PÁGINAS PÚBLICAS ---
+        # 'memoria' (por processo; com vários workers, use 'redis'), 'redis' (compartilhado entre workers) ou 'nenhum'
+        'PAGE_CACHE_BACKEND': os.getenv('PAGE_CACHE_BACKEND', 'memoria'),
+        'PAGE_CACHE_REDIS_URL': os.getenv('PAGE_CACHE_REDIS_URL', 'redis://localhost:6379/0'),
+        'PAGE_CACHE_TTL': int(os.getenv('PAGE_CACHE_TTL', 300)), # Segundos
+        'PAGE_CACHE_MAX_ENTRADAS': int(os.getenv('PAGE_CACHE_MAX_ENTRADAS', 500)),
+        # Grupos invalidados lembrados pelo backend 'memoria' (um por Pessoa com o PERFIL_CACHE_TTL)
+        'PAGE_CACHE_MAX_VERSOES': int(os.getenv('PAGE_CACHE_MAX_VERSOES', 10000)),
+        # Snapshot do perfil no admin (detalhe_candidato), no mesmo backend; 0 = desligado
+        'PERFIL_CACHE_TTL': int(os.getenv('PERFIL_CACHE_TTL', 0)), # Segundos
+
+        # --- LIMITE DE REQUISIÇÕES (formulários públicos e login) ---
+        # 'memoria' (por processo; com vários workers, use 'redis'), 'redis' (compartilhado entre workers) ou 'nenhum'
+        'RATE_LIMIT_BACKEND': os.getenv('RATE_LIMIT_BACKEND', 'memoria'),
+        'RATE_LIMIT_REDIS_URL': os.getenv('RATE_LIMIT_REDIS_URL', os.getenv('PAGE_CACHE_REDIS_URL', 'redis://localhost:6379/0')),
+        'RATE_LIMIT_MAX_CHAVES': int(os.getenv('RATE_LIMIT_MAX_CHAVES', 10000)), # Baldes guardados no backend 'memoria'
+        # 'capacidade/segundos' por IP e rota: rajada de `capacidade` envios, repostos ao longo do período
+        'RATE_LIMITS': {
+            'contato': os.getenv('RATE_LIMIT_CONTATO', '5/600'),
+            'cadastro': os.getenv('RATE_LIMIT_CADASTRO', '3/600'),
+            'login': os.getenv('RATE_LIMIT_LOGIN', '10/300'),
+        },
+        # Quantos proxies reversos (nginx...) definem o X-Forwarded-For; 0 = usar o IP da conexão
+        'PROXY_FIX_X_FOR': int(os.getenv('PROXY_FIX_X_FOR', 0)),
+
+        # --- CONFIGURAÇÕES DO FLASK-MAIL ---
+        'MAIL_SERVER': os.getenv('MAIL_SERVER', 'smtp.gmail.com'),
+        'MAIL_PORT': int(os.getenv('MAIL_PORT', 587)),
+        'MAIL_USE_TLS': os.getenv('MAIL_USE_TLS', 'true').lower() == 'true',
+        'MAIL_USERNAME': os.getenv('MAIL_USERNAME'),
+        'MAIL_PASSWORD': os.getenv('MAIL_PASSWORD'),
+        'MAIL_RECIPIENT': os.getenv('MAIL_RECIPIENT'),
+
+        # --- FILA DE E-MAILS ---
+        'MAIL_QUEUE_WORKERS': int(os.getenv('MAIL_QUEUE_WORKERS', 1)), # 0 = envio só pelo `flask processar-emails`
+
+        # --- TEXTO DOS CURRÍCULOS (PDF) ---
+        'CURRICULO_TEXTO_PROCESSOS': int(os.getenv('CURRICULO_TEXTO_PROCESSOS', 2)), # Pool por processo (0 = só `flask extrair-curriculos`)
+        'CURRICULO_TEXTO_TIMEOUT': int(os.getenv('CURRICULO_TEXTO_TIMEOUT', 30)), # Segundos por arquivo
+        'CURRICULO_TEXTO_MEMORIA_MB': int(os.getenv('CURRICULO_TEXTO_MEMORIA_MB', 512)), # Por processo do pool
+
+        # --- ÍNDICES EM MEMÓRIA (busca no SQLite e ranking por vaga) ---
+        'INDICES_JANELA_SINCRONIZACAO': int(os.getenv('INDICES_JANELA_SINCRONIZACAO', 120)), # Segundos relidos antes da última sincronização (commits fora de ordem)
+        'INDICES_RECONCILIAR_INTERVALO': int(os.getenv('INDICES_RECONCILIAR_INTERVALO', 600)), # Segundos entre as conferências completas de ids e versões
+
+        # --- RANKING POR VAGA ---
+        'RANKING_ARQUIVO': os.getenv('RANKING_ARQUIVO', os.path.join(PASTA_BACKEND, 'instance', 'ranking_candidatos.npz')),
+        'RANKING_DELTA_MAX': int(os.getenv('RANKING_DELTA_MAX', 2000)), # Perfis alterados antes de compactar e regravar
+
+        # --- EXCLUSÃO EM LOTE / RETENÇÃO ---
+        'RETENCAO_LOTE': int(os.getenv('RETENCAO_LOTE', 500)), # Candidaturas por transação
+        'RETENCAO_THREADS_ARQUIVOS': int(os.getenv('RETENCAO_THREADS_ARQUIVOS', 4)), # Threads que apagam os PDFs
+        'RETENCAO_TIMEOUT': int(os.getenv('RETENCAO_TIMEOUT', 600)), # Segundos sem progresso até poder retomar
+
+        # --- PAINEL DO ADMIN ---
+        'ESTATISTICAS_DIAS': int(os.getenv('ESTATISTICAS_DIAS', 30)), # Dias no gráfico de candidaturas por dia
+        'ESTATISTICAS_ITENS': int(os.getenv('ESTATISTICAS_ITENS', 10)), # Barras nos gráficos de vaga, UF, cidade e idioma
+
+        # --- MÉTRICAS ---
+        'SQL_QUERY_BUDGET': int(os.getenv('SQL_QUERY_BUDGET', 20)), # Consultas por requisição (0 = sem aviso); rotas de escrita declaram o seu com @metricas.orcamento
+        'METRICS_TOKEN': os.getenv('METRICS_TOKEN'), # Bearer token para o Prometheus, sem login
+    }
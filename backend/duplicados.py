@@ -0,0 +1,283 @@
+# =======================================================
+# PESSOAS DUPLICADAS (DETECÇÃO E MESCLAGEM)
+# =======================================================
+# O e-mail é a única chave da Pessoa: quem se cadastra com dois e-mails vira
+# dois perfis. Comparar todos os pares é O(n²); aqui só são comparadas as
+# Pessoas que caem juntas em algum "balde":
+#
+# - blocagem: mesmo telefone normalizado, ou mesmo primeiro + último nome na
+#   mesma cidade/UF;
+# - MinHash/LSH: uma assinatura de NUM_PERMUTACOES mínimos sobre os termos do
+#   nome e das experiências (cargos, empresas e pares de palavras das
+#   atividades), dividida em BANDAS; perfis com texto parecido coincidem em
+#   pelo menos uma banda com alta probabilidade.
+#
+# Baldes com mais de MAX_BALDE Pessoas (um nome muito comum) são ignorados:
+# seriam quadráticos e quase nunca são a mesma pessoa. Cada par candidato só é
+# reportado se os nomes se parecem e há uma evidência além do nome (telefone,
+# experiências semelhantes, ou o nome completo idêntico na mesma cidade). Os
+# pares vão para 'par_duplicado' e o admin decide: mesclar (mesclar_pessoas)
+# ou ignorar.
+#
+# O NumPy só é importado pela detecção (CLI), e não no boot dos workers.
+
+import re
+import zlib
+from collections import defaultdict, namedtuple
+from datetime import datetime
+
+from sqlalchemy import delete, exists, update
+from sqlalchemy.orm import aliased
+
+import estatisticas
+from busca import normalizar, tokenizar
+from extensoes import db, motor_busca
+from models import Candidatura, Curso, Experiencia, Formacao, Idioma, ParDuplicado, Pessoa, PessoaBusca
+from perfil import invalidar_perfil
+
+PENDENTE = 'pendente'
+IGNORADO = 'ignorado'
+
+NUM_PERMUTACOES = 64
+BANDAS = 16             # 4 mínimos por banda: pares com similaridade ~0,5 já costumam coincidir
+MAX_BALDE = 50
+LIMIAR_PADRAO = 0.6     # Similaridade estimada das experiências (0 a 1)
+SIMILARIDADE_NOME = 0.5  # Jaccard mínimo entre os termos dos nomes
+_PRIMO = (1 << 31) - 1
+
+Perfil = namedtuple('Perfil', 'id nome telefone cidade uf experiencias')
+
+# Campos da Pessoa mantida que são completados com os da duplicata, quando vazios
+CAMPOS_COMPLETAVEIS = ('telefone1', 'bairro', 'cidade', 'uf', 'linkedin_url')
+# Linhas da duplicata iguais a uma da Pessoa mantida (nestes campos) não são copiadas
+COLECOES = {
+    Formacao: ('curso', 'instituicao'),
+    Experiencia: ('empresa', 'cargo', 'data_inicio'),
+    Idioma: ('nome', 'nivel'),
+    Curso: ('nome', 'instituicao'),
+}
+
+
+# --- Normalização ---
+def normalizar_telefone(telefone):
+    """Só os dígitos, sem DDI 55 nem o 0 da operadora. None se não parece um telefone com DDD."""
+    digitos = re.sub(r'\D', '', telefone or '')
+    if len(digitos) >= 12 and digitos.startswith('55'):
+        digitos = digitos[2:]
+    digitos = digitos.lstrip('0')
+    return digitos if 10 <= len(digitos) <= 11 else None
+
+
+def chaves_de_bloco(perfil, nome, cidade):
+    """`nome`: termos do nome (tokenizar); `cidade`: (cidade normalizada, UF) ou None."""
+    chaves = set()
+    telefone = normalizar_telefone(perfil.telefone)
+    if telefone:
+        chaves.add(('telefone', telefone))
+    if len(nome) >= 2 and cidade:
+        chaves.add(('nome', nome[0], nome[-1]) + cidade)
+    return chaves
+
+
+def termos(nome, experiencias):
+    """Conjunto de termos do MinHash: nome, palavras das experiências e pares de palavras das atividades."""
+    conjunto = {'n:' + termo for termo in nome}
+    palavras = tokenizar(experiencias)
+    conjunto.update('x:' + termo for termo in palavras)
+    conjunto.update(f'x:{a} {b}' for a, b in zip(palavras, palavras[1:]))
+    return conjunto
+
+
+def _cidade(perfil):
+    return (normalizar(perfil.cidade).strip(), (perfil.uf or '').upper()) if perfil.cidade else None
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+# --- Detecção ---
+def assinaturas(conjuntos):
+    """Matriz (n, NUM_PERMUTACOES) de mínimos; cada termo vira um inteiro estável com crc32."""
+    import numpy as np
+    rng = np.random.default_rng(20261018)  # Fixo: as assinaturas não mudam entre execuções
+    a = rng.integers(1, _PRIMO, NUM_PERMUTACOES, dtype=np.uint64)
+    b = rng.integers(0, _PRIMO, NUM_PERMUTACOES, dtype=np.uint64)
+    resultado = np.full((len(conjuntos), NUM_PERMUTACOES), _PRIMO, dtype=np.uint64)
+    for inicio in range(0, len(conjuntos), 2000):
+        bloco = conjuntos[inicio:inicio + 2000]
+        tamanhos = np.array([len(c) for c in bloco])
+        if not tamanhos.sum():
+            continue
+        hashes = np.fromiter((zlib.crc32(t.encode('utf-8')) for c in bloco for t in c), np.uint64, tamanhos.sum())
+        valores = (hashes[:, None] * a + b) % _PRIMO
+        com_termos = np.flatnonzero(tamanhos)
+        inicios = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))[com_termos]
+        resultado[inicio + com_termos] = np.minimum.reduceat(valores, inicios, axis=0)
+    return resultado
+
+
+def pares_candidatos(perfis, nomes, cidades, assinatura):
+    """Arrays (i, j), com i < j, dos índices que dividem algum balde de blocagem ou banda do LSH."""
+    import numpy as np
+    baldes = defaultdict(list)
+    for i, perfil in enumerate(perfis):
+        for chave in chaves_de_bloco(perfil, nomes[i], cidades[i]):
+            baldes[chave].append(i)
+    linhas = NUM_PERMUTACOES // BANDAS
+    com_termos = np.flatnonzero(~(assinatura == _PRIMO).all(axis=1))
+    for banda in range(BANDAS):
+        fatia = assinatura[com_termos, banda * linhas:(banda + 1) * linhas]
+        for i, chave in zip(com_termos.tolist(), map(bytes, fatia)):
+            baldes[('lsh', banda, chave)].append(i)
+
+    # Baldes do mesmo tamanho viram uma matriz só: um triu_indices por tamanho, e não por balde
+    por_tamanho = defaultdict(list)
+    for membros in baldes.values():
+        if 1 < len(membros) <= MAX_BALDE:
+            por_tamanho[len(membros)].append(membros)
+    pares = []
+    for tamanho, grupos in por_tamanho.items():
+        membros = np.array(grupos, dtype=np.int64)
+        a, b = np.triu_indices(tamanho, 1)
+        pares.append((membros[:, a] * len(perfis) + membros[:, b]).ravel())
+    if not pares:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    pares = np.unique(np.concatenate(pares))  # O mesmo par pode dividir vários baldes
+    return pares // len(perfis), pares % len(perfis)
+
+
+def _codigos(valores):
+    """Um inteiro por valor distinto (-1 para vazio), para comparar os pares em lote."""
+    import numpy as np
+    codigos = {}
+    return np.array([codigos.setdefault(valor, len(codigos)) if valor else -1 for valor in valores])
+
+
+def encontrar_pares(perfis, limiar=LIMIAR_PADRAO):
+    """
+    [(pessoa_id, duplicata_id, score, motivos)] dos perfis que parecem a mesma pessoa,
+    do mais para o menos provável. Retorna também quantos pares foram comparados.
+    """
+    import numpy as np
+    perfis = list(perfis)
+    nomes = [tokenizar(perfil.nome) for perfil in perfis]
+    cidades = [_cidade(perfil) for perfil in perfis]
+    assinatura = assinaturas([termos(nome, perfil.experiencias) for nome, perfil in zip(nomes, perfis)])
+    i, j = pares_candidatos(perfis, nomes, cidades, assinatura)
+    if not len(i):
+        return [], 0
+
+    # Evidências além do nome, comparadas em lote: telefone, texto das experiências
+    # ou nome completo idêntico (3+ termos) na mesma cidade
+    nomes = [frozenset(nome) for nome in nomes]
+    telefone = _codigos(normalizar_telefone(perfil.telefone) for perfil in perfis)
+    cidade = _codigos(cidades)
+    nome_completo = _codigos(nome if len(nome) >= 3 else None for nome in nomes)
+    com_experiencia = np.array([bool(perfil.experiencias) for perfil in perfis])
+
+    similaridade_texto = np.empty(len(i))
+    for inicio in range(0, len(i), 100000):
+        fatia = slice(inicio, inicio + 100000)
+        similaridade_texto[fatia] = (assinatura[i[fatia]] == assinatura[j[fatia]]).mean(axis=1)
+    mesmo_telefone = (telefone[i] >= 0) & (telefone[i] == telefone[j])
+    texto_parecido = com_experiencia[i] & com_experiencia[j] & (similaridade_texto >= limiar)
+    mesma_cidade = (cidade[i] >= 0) & (cidade[i] == cidade[j])
+    mesmo_nome_na_cidade = mesma_cidade & (nome_completo[i] >= 0) & (nome_completo[i] == nome_completo[j])
+
+    encontrados = []
+    for k in np.flatnonzero(mesmo_telefone | texto_parecido | mesmo_nome_na_cidade):
+        a, b = perfis[i[k]], perfis[j[k]]
+        similaridade_nome = _jaccard(nomes[i[k]], nomes[j[k]])
+        if similaridade_nome < SIMILARIDADE_NOME:
+            continue
+        motivos = [motivo for motivo, presente in (('telefone', mesmo_telefone[k]),
+                                                   ('nome e cidade', mesmo_nome_na_cidade[k]),
+                                                   (f'experiências {similaridade_texto[k]:.0%}', texto_parecido[k]))
+                   if presente]
+        score = (0.5 * similaridade_nome + 0.3 * similaridade_texto[k]
+                 + 0.1 * mesmo_telefone[k] + 0.1 * mesma_cidade[k])
+        pessoa_id, duplicata_id = sorted((a.id, b.id))
+        encontrados.append((pessoa_id, duplicata_id, round(float(score), 3), ', '.join(motivos)))
+    encontrados.sort(key=lambda par: (-par[2], par[0], par[1]))
+    return encontrados, len(i)
+
+
+def carregar_perfis():
+    """Perfis de todas as Pessoas, em duas consultas por streaming (sem carregar os objetos do ORM)."""
+    experiencias = defaultdict(list)
+    for linha in (db.session.query(Experiencia.pessoa_id, Experiencia.cargo, Experiencia.empresa,
+                                   Experiencia.atividades).yield_per(2000)):
+        experiencias[linha.pessoa_id].append(' '.join(v for v in linha[1:] if v))
+    for linha in (db.session.query(Pessoa.id, Pessoa.nome_completo, Pessoa.telefone1, Pessoa.cidade, Pessoa.uf)
+                  .order_by(Pessoa.id).yield_per(2000)):
+        yield Perfil(linha.id, linha.nome_completo, linha.telefone1, linha.cidade, linha.uf,
+                     '\n'.join(experiencias.pop(linha.id, [])))
+
+
+def gravar_pares(pares):
+    """Troca os pares pendentes pelos encontrados agora; os que o admin ignorou continuam ignorados."""
+    ignorados = {(linha.pessoa_id, linha.duplicata_id) for linha in
+                 db.session.query(ParDuplicado.pessoa_id, ParDuplicado.duplicata_id).filter_by(status=IGNORADO)}
+    db.session.execute(delete(ParDuplicado).where(ParDuplicado.status == PENDENTE))
+    agora = datetime.utcnow()
+    novos = [dict(pessoa_id=pessoa_id, duplicata_id=duplicata_id, score=score, motivos=motivos,
+                  status=PENDENTE, detectado_em=agora)
+             for pessoa_id, duplicata_id, score, motivos in pares if (pessoa_id, duplicata_id) not in ignorados]
+    for inicio in range(0, len(novos), 1000):
+        db.session.execute(ParDuplicado.__table__.insert(), novos[inicio:inicio + 1000])
+    db.session.commit()
+    return len(novos)
+
+
+# --- Mesclagem ---
+def mesclar_pessoas(manter_id, remover_id):
+    """
+    Move as candidaturas e as coleções de `remover_id` para `manter_id` (um UPDATE
+    por tabela, em número fixo de comandos qualquer que seja o histórico), completa
+    os campos vazios da Pessoa mantida e exclui a duplicata. Faz o commit. Levanta
+    ValueError se alguma das Pessoas não existe.
+    """
+    if manter_id == remover_id:
+        raise ValueError('Escolha duas pessoas diferentes.')
+    manter = db.session.get(Pessoa, manter_id)
+    remover = db.session.get(Pessoa, remover_id)
+    if manter is None or remover is None:
+        raise ValueError('Pessoa não encontrada (talvez já tenha sido mesclada ou excluída).')
+    contagens_antes = estatisticas.contagens_pessoas([manter_id, remover_id])
+
+    for campo in CAMPOS_COMPLETAVEIS:
+        if not getattr(manter, campo) and getattr(remover, campo):
+            setattr(manter, campo, getattr(remover, campo))
+    # Competências são texto livre: as da duplicata são acrescentadas, não descartadas
+    if remover.competencias_tecnicas and remover.competencias_tecnicas not in (manter.competencias_tecnicas or ''):
+        manter.competencias_tecnicas = '\n'.join(filter(None, (manter.competencias_tecnicas,
+                                                               remover.competencias_tecnicas)))
+    db.session.flush()
+
+    db.session.execute(update(Candidatura).where(Candidatura.pessoa_id == remover_id)
+                       .values(pessoa_id=manter_id), execution_options={'synchronize_session': False})
+    for modelo, campos in COLECOES.items():
+        existente = aliased(modelo)
+        repetida = exists().where(existente.pessoa_id == manter_id,
+                                  *(getattr(existente, campo).is_not_distinct_from(getattr(modelo, campo))
+                                    for campo in campos))
+        db.session.execute(delete(modelo).where(modelo.pessoa_id == remover_id, repetida),
+                           execution_options={'synchronize_session': False})
+        db.session.execute(update(modelo).where(modelo.pessoa_id == remover_id).values(pessoa_id=manter_id),
+                           execution_options={'synchronize_session': False})
+
+    db.session.execute(delete(ParDuplicado).where((ParDuplicado.pessoa_id == remover_id)
+                                                  | (ParDuplicado.duplicata_id == remover_id)))
+    db.session.execute(delete(PessoaBusca).where(PessoaBusca.pessoa_id == remover_id))
+    db.session.execute(delete(Pessoa).where(Pessoa.id == remover_id), execution_options={'synchronize_session': False})
+    db.session.expunge(remover)
+
+    # Coleções recarregadas do banco, já com as linhas movidas, para o novo documento de busca
+    db.session.expire(manter)
+    motor_busca.indexar(manter)
+    # Idiomas repetidos saíram e as candidaturas movidas passam a contar na UF/cidade mantida
+    estatisticas.registrar(contagens_antes, estatisticas.contagens_pessoas([manter_id]))
+    db.session.commit()
+    invalidar_perfil(manter_id, remover_id)
+    return manter
@@ -0,0 +1,224 @@
+# =======================================================
+# ESTATÍSTICAS DO PAINEL DO ADMIN (CONTAGENS AGREGADAS)
+# =======================================================
+# O painel mostra as candidaturas por dia, por vaga e por UF/cidade e os
+# idiomas por nível. Contar na hora varreria 'candidatura' e 'pessoa' a cada
+# visita; em vez disso, 'contagem_agregada' guarda uma linha por (dimensão,
+# chave) com o total, e o painel lê só as linhas que exibe.
+#
+# Quem grava candidaturas, idiomas ou a UF/cidade de uma Pessoa conta o que as
+# linhas afetadas somavam antes e depois da alteração (contagens_pessoas,
+# contagens_candidaturas...) e chama registrar(). A diferença se acumula na
+# sessão e vai para a tabela no commit, num único comando com as chaves em
+# ordem: as linhas de contagem ficam bloqueadas só até o fim da transação e
+# duas transações nunca as bloqueiam em ordem inversa. As chaves saem das
+# mesmas consultas que a reconstrução usa, então os dois caminhos batem; o
+# `flask reconstruir-estatisticas` (cron noturno) recalcula tudo do zero e
+# corrige qualquer desvio, como cargas feitas direto no banco.
+#
+# UF e cidade são as atuais da Pessoa: quando ela muda de cidade, as
+# candidaturas dela mudam de linha junto. Os dias são em UTC, como
+# data_candidatura.
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, event, func, insert, literal_column, null, select, text, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from extensoes import db
+from models import Candidatura, ContagemAgregada, Idioma, Pessoa
+
+DIA = 'dia'
+VAGA = 'vaga'
+UF = 'uf'
+CIDADE = 'cidade'
+IDIOMA = 'idioma'
+TOTAL = 'total'
+TOTAL_CANDIDATURAS = 'candidaturas'  # Chave da dimensão 'total'
+CANDIDATURA = 'candidatura'          # Tipo das linhas de _consulta_candidaturas
+
+# Valores do <select> de nível do formulário de currículo
+NIVEIS_IDIOMA = {'basico': 'Básico', 'intermediario': 'Intermediário', 'avancado': 'Avançado', 'fluente': 'Fluente'}
+
+TAMANHO_CHAVE = ContagemAgregada.chave.type.length
+PENDENTES = 'estatisticas_pendentes'  # Chave em session.info
+
+
+def _texto(valor):
+    """Espaços normalizados, no tamanho da chave; None se vazio."""
+    return ' '.join((valor or '').split())[:TAMANHO_CHAVE] or None
+
+
+# --- CONTAGENS (a partir das tabelas) ---
+# As duas consultas têm as mesmas colunas (tipo, a, b, c, d, quantidade) para
+# que contagens_pessoas as junte num UNION ALL: uma ida ao banco no cadastro.
+def _consulta_candidaturas(*criterios):
+    dia = func.date(Candidatura.data_candidatura)
+    return (select(literal_column(f"'{CANDIDATURA}'").label('tipo'), dia.label('a'),
+                   Candidatura.vaga_objetivo.label('b'), Pessoa.uf.label('c'), Pessoa.cidade.label('d'),
+                   func.count(Candidatura.id).label('quantidade'))
+            .select_from(Candidatura).join(Pessoa, Pessoa.id == Candidatura.pessoa_id).where(*criterios)
+            .group_by(dia, Candidatura.vaga_objetivo, Pessoa.uf, Pessoa.cidade))
+
+
+def _consulta_idiomas(*criterios):
+    return (select(literal_column(f"'{IDIOMA}'").label('tipo'), null().label('a'), Idioma.nome.label('b'),
+                   Idioma.nivel.label('c'), null().label('d'), func.count(Idioma.id).label('quantidade'))
+            .where(*criterios).group_by(Idioma.nome, Idioma.nivel))
+
+
+def _contar(consulta):
+    """Counter {(dimensão, chave): quantidade} a partir das linhas das consultas acima."""
+    contagens = Counter()
+    for tipo, a, b, c, d, quantidade in db.session.execute(consulta):
+        if tipo == IDIOMA:
+            nome = _texto(b)
+            if nome:
+                nivel = NIVEIS_IDIOMA.get(c, _texto(c) or '?')
+                contagens[IDIOMA, _texto(f'{nome.capitalize()} - {nivel}')] += quantidade
+            continue
+        contagens[TOTAL, TOTAL_CANDIDATURAS] += quantidade
+        contagens[DIA, str(a)[:10]] += quantidade  # date no PostgreSQL, texto no SQLite
+        uf = (_texto(c) or '').upper() or None
+        cidade = _texto(d)
+        for dimensao, chave in ((VAGA, _texto(b)), (UF, uf),
+                                (CIDADE, _texto(f'{cidade}/{uf}' if cidade and uf else cidade))):
+            if chave:
+                contagens[dimensao, chave] += quantidade
+    return contagens
+
+
+def contagens_candidaturas(*criterios):
+    """Contagens das candidaturas que atendem aos critérios (sem critérios, todas)."""
+    return _contar(_consulta_candidaturas(*criterios))
+
+
+def contagens_idiomas(*criterios):
+    """Contagens dos idiomas ('Nome - Nível') que atendem aos critérios."""
+    return _contar(_consulta_idiomas(*criterios))
+
+
+def contagens_pessoas(pessoa_ids):
+    """Tudo o que as Pessoas somam hoje nas estatísticas (candidaturas e idiomas), numa consulta."""
+    return _contar(union_all(_consulta_candidaturas(Candidatura.pessoa_id.in_(pessoa_ids)),
+                             _consulta_idiomas(Idioma.pessoa_id.in_(pessoa_ids))))
+
+
+# --- GRAVAÇÃO ---
+def registrar(antes, depois):
+    """
+    Acumula `depois - antes` na transação atual. A soma vai para a tabela no
+    commit; um rollback a descarta. Para exclusões, `depois` é {}.
+    """
+    pendentes = db.session.info.setdefault(PENDENTES, Counter())
+    pendentes.update(depois)
+    pendentes.subtract(antes)
+
+
+def _somar(session, diferenca):
+    linhas = [{'dimensao': dimensao, 'chave': chave, 'total': total}
+              for (dimensao, chave), total in sorted(diferenca.items()) if total]
+    if not linhas:
+        return
+    dialeto = session.get_bind().dialect.name
+    if dialeto in ('postgresql', 'sqlite'):
+        modulo = postgresql if dialeto == 'postgresql' else sqlite
+        comando = modulo.insert(ContagemAgregada)
+        comando = comando.on_conflict_do_update(
+            index_elements=[ContagemAgregada.dimensao, ContagemAgregada.chave],
+            set_={'total': ContagemAgregada.total + comando.excluded.total})
+        session.execute(comando, linhas)
+        return
+    # Outros bancos: UPDATE e, se a linha ainda não existe, INSERT num savepoint
+    for linha in linhas:
+        filtro = (ContagemAgregada.dimensao == linha['dimensao'], ContagemAgregada.chave == linha['chave'])
+        somar = update(ContagemAgregada).where(*filtro).values(total=ContagemAgregada.total + linha['total'])
+        if session.execute(somar).rowcount:
+            continue
+        try:
+            with session.begin_nested():
+                session.execute(insert(ContagemAgregada).values(**linha))
+        except IntegrityError:
+            session.execute(somar)
+
+
+def _gravar_pendentes(session):
+    pendentes = session.info.pop(PENDENTES, None)
+    if pendentes:
+        _somar(session, pendentes)
+
+
+def _descartar_pendentes(session):
+    session.info.pop(PENDENTES, None)
+
+
+def configurar_estatisticas(app):
+    """Liga a gravação das contagens pendentes ao commit da sessão."""
+    app.config.setdefault('ESTATISTICAS_DIAS', 30)
+    app.config.setdefault('ESTATISTICAS_ITENS', 10)
+    if not event.contains(db.session, 'before_commit', _gravar_pendentes):
+        event.listen(db.session, 'before_commit', _gravar_pendentes)
+        event.listen(db.session, 'after_rollback', _descartar_pendentes)
+
+
+def reconstruir():
+    """
+    Recalcula todas as contagens a partir das tabelas e troca o conteúdo de
+    'contagem_agregada' numa transação. Retorna quantas linhas gravou.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # Cadastros concorrentes esperam a troca no commit deles (o painel continua lendo)
+        db.session.execute(text('LOCK TABLE contagem_agregada IN SHARE ROW EXCLUSIVE MODE'))
+    # O DELETE vem antes das contagens: no SQLite é ele que reserva o banco para escrita
+    db.session.execute(delete(ContagemAgregada))
+    db.session.info.pop(PENDENTES, None)
+    contagens = _contar(union_all(_consulta_candidaturas(), _consulta_idiomas()))
+    linhas = [{'dimensao': dimensao, 'chave': chave, 'total': total}
+              for (dimensao, chave), total in sorted(contagens.items())]
+    for inicio in range(0, len(linhas), 1000):
+        db.session.execute(insert(ContagemAgregada), linhas[inicio:inicio + 1000])
+    db.session.commit()
+    return len(linhas)
+
+
+# --- LEITURA (painel) ---
+def _barras(linhas):
+    """[(rótulo, total)] -> [{'rotulo', 'total', 'percentual'}], com 100% na maior barra."""
+    maior = max((total for _, total in linhas), default=0) or 1
+    return [{'rotulo': rotulo, 'total': total, 'percentual': round(total * 100 / maior, 1)}
+            for rotulo, total in linhas]
+
+
+def _maiores(dimensao, limite):
+    return (db.session.query(ContagemAgregada.chave, ContagemAgregada.total)
+            .filter(ContagemAgregada.dimensao == dimensao, ContagemAgregada.total > 0)
+            .order_by(ContagemAgregada.total.desc(), ContagemAgregada.chave).limit(limite).all())
+
+
+def painel(dias=30, limite=10):
+    """
+    Dados dos gráficos do painel. Cada gráfico é uma consulta pela chave primária
+    ou pelo índice (dimensao, total), que lê no máximo `dias` ou `limite` linhas,
+    qualquer que seja o tamanho de 'candidatura' e 'pessoa'.
+    """
+    hoje = datetime.utcnow().date()
+    inicio = hoje - timedelta(days=dias - 1)
+    por_dia = dict(db.session.query(ContagemAgregada.chave, ContagemAgregada.total)
+                   .filter(ContagemAgregada.dimensao == DIA, ContagemAgregada.chave >= inicio.isoformat()))
+    serie = [(dia.strftime('%d/%m'), por_dia.get(dia.isoformat(), 0))
+             for dia in (inicio + timedelta(days=i) for i in range(dias))]
+    total = (db.session.query(ContagemAgregada.total)
+             .filter(ContagemAgregada.dimensao == TOTAL, ContagemAgregada.chave == TOTAL_CANDIDATURAS).scalar())
+    return {
+        'total': total or 0,
+        'periodo': sum(quantidade for _, quantidade in serie),
+        'hoje': serie[-1][1] if serie else 0,
+        'dias': dias,
+        'por_dia': _barras(serie),
+        'vagas': _barras(_maiores(VAGA, limite)),
+        'ufs': _barras(_maiores(UF, limite)),
+        'cidades': _barras(_maiores(CIDADE, limite)),
+        'idiomas': _barras(_maiores(IDIOMA, limite)),
+    }
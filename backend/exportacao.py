@@ -0,0 +1,145 @@
+# =======================================================
+# EXPORTAÇÃO EM CSV / XLSX (STREAMING)
+# =======================================================
+# Geradores que recebem o cabeçalho e um iterável de linhas e devolvem os
+# bytes do arquivo aos poucos, para uso com stream_with_context: a memória
+# usada não depende do número de linhas e o download começa na hora.
+#
+# O XLSX é montado aqui mesmo (sem openpyxl): o zipfile escreve num destino
+# sem seek usando descritores de dados, então cada bloco comprimido já pode
+# ser enviado enquanto a planilha ainda está sendo gerada.
+
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+LINHAS_POR_BLOCO = 200
+
+# Caracteres de controle não são permitidos no XML da planilha
+_controle_re = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _texto(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, datetime):
+        return valor.strftime('%d/%m/%Y %H:%M')
+    if isinstance(valor, date):
+        return valor.strftime('%d/%m/%Y')
+    return str(valor)
+
+
+def _celula_csv(valor):
+    texto = _texto(valor)
+    # Evita que o Excel interprete dados do candidato como fórmula (CSV injection)
+    if texto[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        texto = "'" + texto
+    return texto
+
+
+def gerar_csv(cabecalho, linhas):
+    """CSV com ';' e BOM UTF-8, que o Excel em português abre com acentos e colunas certas."""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, delimiter=';')
+    buffer.write('\ufeff')
+    escritor.writerow(cabecalho)
+    for i, linha in enumerate(linhas, 1):
+        escritor.writerow([_celula_csv(valor) for valor in linha])
+        if i % LINHAS_POR_BLOCO == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+# --- XLSX ---
+class _Saida:
+    """Destino sem seek para o zipfile: guarda os bytes até o gerador entregá-los."""
+
+    def __init__(self):
+        self.partes = []
+
+    def write(self, dados):
+        self.partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def retirar(self):
+        dados = b''.join(self.partes)
+        self.partes.clear()
+        return dados
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>')
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>')
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '</Relationships>')
+
+
+def _workbook(nome_aba):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(nome_aba[:31])}" sheetId="1" r:id="rId1"/></sheets></workbook>')
+
+
+def _linha_xlsx(valores):
+    celulas = []
+    for valor in valores:
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            celulas.append(f'<c t="n"><v>{valor}</v></c>')
+        else:
+            texto = escape(_controle_re.sub('', _texto(valor)))
+            celulas.append(f'<c t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>')
+    return '<row>' + ''.join(celulas) + '</row>'
+
+
+def gerar_xlsx(cabecalho, linhas, nome_aba='Planilha1'):
+    """Planilha XLSX de uma aba, com strings inline (sem sharedStrings, que exigiria tudo na memória)."""
+    saida = _Saida()
+    with zipfile.ZipFile(saida, 'w', zipfile.ZIP_DEFLATED) as pacote:
+        pacote.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        pacote.writestr('_rels/.rels', _RELS)
+        pacote.writestr('xl/workbook.xml', _workbook(nome_aba))
+        pacote.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        yield saida.retirar()
+
+        with pacote.open('xl/worksheets/sheet1.xml', 'w') as planilha:
+            planilha.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                            '<sheetData>' + _linha_xlsx(cabecalho)).encode('utf-8'))
+            bloco = []
+            for i, linha in enumerate(linhas, 1):
+                bloco.append(_linha_xlsx(linha))
+                if i % LINHAS_POR_BLOCO == 0:
+                    planilha.write(''.join(bloco).encode('utf-8'))
+                    bloco.clear()
+                    dados = saida.retirar()
+                    if dados:
+                        yield dados
+            planilha.write((''.join(bloco) + '</sheetData></worksheet>').encode('utf-8'))
+    yield saida.retirar()
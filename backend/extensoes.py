@@ -0,0 +1,69 @@
+# =======================================================
+# EXTENSÕES
+# =======================================================
+# Instâncias criadas sem app; o create_app() chama o init_app de cada uma.
+# Blueprints, models e comandos importam daqui, nunca do app.py.
+
+import importlib
+import threading
+
+from flask import current_app
+from flask_login import LoginManager
+from flask_sqlalchemy import SQLAlchemy
+
+from banco import RoteadorBanco, SessaoRoteada
+from busca import MotorBusca
+from cache import CachePaginas
+from assets import Estaticos
+from fila_curriculos import FilaCurriculos
+from fila_email import FilaEmail
+from limite import Limitador
+from metricas import Metricas
+from ranking import RankingCandidatos
+
+
+class ExtensaoPreguicosa:
+    """
+    Importa e inicializa a extensão só no primeiro uso, dentro do contexto do app.
+    O Flask-Bcrypt (com o módulo C do bcrypt) e o Flask-Mail só são carregados
+    quando alguém faz login ou a fila envia um e-mail, e não no boot de cada worker.
+    """
+
+    def __init__(self, modulo, classe):
+        self._modulo = modulo
+        self._classe = classe
+        self._lock = threading.Lock()
+
+    def instancia(self):
+        app = current_app._get_current_object()
+        instancias = app.extensions.setdefault('preguicosas', {})
+        if self._classe not in instancias:
+            with self._lock:
+                if self._classe not in instancias:
+                    classe = getattr(importlib.import_module(self._modulo), self._classe)
+                    instancias[self._classe] = classe(app)
+        return instancias[self._classe]
+
+    def __getattr__(self, nome):
+        return getattr(self.instancia(), nome)
+
+
+db = SQLAlchemy(session_options={'class_': SessaoRoteada})
+roteador_banco = RoteadorBanco()
+login_manager = LoginManager()
+bcrypt = ExtensaoPreguicosa('flask_bcrypt', 'Bcrypt')
+mail = ExtensaoPreguicosa('flask_mail', 'Mail')
+cache_paginas = CachePaginas()
+estaticos = Estaticos()
+metricas = Metricas()
+motor_busca = MotorBusca()
+ranking = RankingCandidatos()
+fila_email = FilaEmail()
+fila_curriculos = FilaCurriculos()
+limitador = Limitador()
+
+
+def iniciar_migrate(app):
+    """O Flask-Migrate importa o Alembic inteiro: só é registrado para os comandos `flask db ...`."""
+    from flask_migrate import Migrate
+    Migrate(app, db)
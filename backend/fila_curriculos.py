@@ -0,0 +1,221 @@
+# =======================================================
+# FILA DE EXTRAÇÃO DE TEXTO DOS CURRÍCULOS
+# =======================================================
+# Cada PDF de currículo ganha uma linha em 'texto_curriculo' (uma por arquivo:
+# o mesmo PDF, deduplicado por hash, pode estar em várias candidaturas). O
+# cadastro_curriculo só grava a linha 'pendente' e retorna; uma thread de
+# despacho por processo reserva lotes da tabela e manda cada arquivo para um
+# pool de processos limitado (CURRICULO_TEXTO_PROCESSOS), para que o parsing,
+# que é pesado em CPU, nunca rode nas threads das requisições.
+#
+# Cada arquivo tem limite de tempo e de memória (ver pdf_texto.py). Se um
+# processo morrer ou travar, o pool é descartado e recriado, e os arquivos do
+# lote voltam para a fila até CURRICULO_TEXTO_MAX_TENTATIVAS.
+
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, wait
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+
+from sqlalchemy import and_, event, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+
+import pdf_texto
+
+PENDENTE = 'pendente'
+PROCESSANDO = 'processando'
+CONCLUIDO = 'concluido'
+FALHOU = 'falhou'
+
+# Tempo extra do lado da fila para o spawn do processo e a volta do resultado
+MARGEM_SEGUNDOS = 15
+
+
+class FilaCurriculos:
+    """Extensão da extração de texto. O modelo deve ter as colunas de 'TextoCurriculo'."""
+
+    def __init__(self, app=None, db=None, modelo=None):
+        self.app = None
+        self._executor = None
+        self._pid_executor = None
+        self._despachante = None
+        self._pid_despachante = None
+        self._acordar = threading.Event()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, db, modelo)
+
+    def init_app(self, app, db, modelo):
+        self.app = app
+        self.db = db
+        self.modelo = modelo
+        app.config.setdefault('CURRICULO_TEXTO_PROCESSOS', 2)          # Tamanho do pool (0 = só via CLI)
+        app.config.setdefault('CURRICULO_TEXTO_TIMEOUT', 30)           # Segundos por arquivo
+        app.config.setdefault('CURRICULO_TEXTO_MEMORIA_MB', 512)       # Limite de memória de cada processo
+        app.config.setdefault('CURRICULO_TEXTO_MAX_CARACTERES', 100000)
+        app.config.setdefault('CURRICULO_TEXTO_MAX_TENTATIVAS', 2)
+        app.config.setdefault('CURRICULO_TEXTO_TAREFAS_POR_PROCESSO', 50)  # Recicla o processo (vazamentos)
+        app.config.setdefault('CURRICULO_TEXTO_INTERVALO', 60)         # Segundos entre varreduras da fila
+        app.extensions['fila_curriculos'] = self
+        if not event.contains(db.session, 'after_commit', self._depois_do_commit):
+            event.listen(db.session, 'after_commit', self._depois_do_commit)
+        if app.config['CURRICULO_TEXTO_PROCESSOS'] > 0:
+            app.before_request(self._garantir_despachante)
+
+    # --- Produtor ---
+    def enfileirar(self, arquivo):
+        """
+        Coloca o PDF na fila, se ele ainda não tem linha (o mesmo arquivo pode vir de
+        outra candidatura). Faz o próprio commit: chame depois do commit do cadastro.
+        """
+        session = self.db.session
+        if session.query(self.modelo.id).filter_by(arquivo=arquivo).first() is not None:
+            return False
+        session.add(self.modelo(arquivo=arquivo, status=PENDENTE, tentativas=0))
+        session.info['fila_curriculos_acordar'] = True
+        try:
+            session.commit()
+        except IntegrityError:
+            # Outro cadastro com o mesmo PDF enfileirou primeiro
+            session.rollback()
+            return False
+        self._garantir_despachante()
+        return True
+
+    def _depois_do_commit(self, session):
+        if session.info.pop('fila_curriculos_acordar', False):
+            self._acordar.set()
+
+    # --- Despacho ---
+    def _garantir_despachante(self):
+        """Sobe a thread de despacho no processo atual (inclusive depois do fork do gunicorn)."""
+        if self.app.config['CURRICULO_TEXTO_PROCESSOS'] <= 0 or self._pid_despachante == os.getpid():
+            return
+        with self._lock:
+            if self._pid_despachante == os.getpid():
+                return
+            self._pid_despachante = os.getpid()
+            self._despachante = threading.Thread(target=self._loop, name='fila-curriculos', daemon=True)
+            self._despachante.start()
+
+    def _loop(self):
+        while True:
+            self._acordar.wait(self.app.config['CURRICULO_TEXTO_INTERVALO'])
+            self._acordar.clear()
+            try:
+                with self.app.app_context():
+                    while self.processar_lote():
+                        pass
+            except Exception as e:
+                print(f"ERRO NA FILA DE CURRÍCULOS: {e}")
+
+    def _pool(self, processos):
+        """Pool de processos do processo atual. 'spawn': os filhos não herdam threads nem conexões do banco."""
+        with self._lock:
+            if self._executor is None or self._pid_executor != os.getpid():
+                config = self.app.config
+                self._executor = ProcessPoolExecutor(
+                    max_workers=processos,
+                    mp_context=get_context('spawn'),
+                    initializer=pdf_texto.iniciar_processo,
+                    initargs=(config['CURRICULO_TEXTO_MEMORIA_MB'],),
+                    max_tasks_per_child=config['CURRICULO_TEXTO_TAREFAS_POR_PROCESSO'],
+                )
+                self._pid_executor = os.getpid()
+            return self._executor
+
+    def _descartar_pool(self):
+        """Encerra o pool à força (processo travado fora do alcance do alarme, ou pool quebrado)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        for processo in list((getattr(executor, '_processes', None) or {}).values()):
+            processo.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _reservar_lote(self, quantidade):
+        """Marca um lote como 'processando' com um UPDATE condicional (seguro entre processos)."""
+        modelo = self.modelo
+        agora = datetime.utcnow()
+        limite_reserva = agora - timedelta(seconds=(self.app.config['CURRICULO_TEXTO_TIMEOUT'] + MARGEM_SEGUNDOS) * 2)
+        disponiveis = or_(
+            modelo.status == PENDENTE,
+            and_(modelo.status == PROCESSANDO, modelo.processando_desde < limite_reserva),
+        )
+        ids = [linha.id for linha in (self.db.session.query(modelo.id).filter(disponiveis)
+                                      .order_by(modelo.id).limit(quantidade))]
+        if not ids:
+            return []
+
+        lote = uuid.uuid4().hex
+        self.db.session.execute(
+            update(modelo)
+            .where(modelo.id.in_(ids), disponiveis)
+            .values(status=PROCESSANDO, lote=lote, processando_desde=agora)
+        )
+        self.db.session.commit()
+        return (modelo.query.options(load_only(modelo.id, modelo.arquivo, modelo.tentativas))
+                .filter_by(lote=lote, status=PROCESSANDO).all())
+
+    def processar_lote(self, processos=None):
+        """Extrai o texto de um lote (um arquivo por processo do pool). Retorna quantos arquivos foram tratados."""
+        config = self.app.config
+        processos = processos or max(config['CURRICULO_TEXTO_PROCESSOS'], 1)
+        itens = self._reservar_lote(processos)
+        if not itens:
+            return 0
+
+        timeout = config['CURRICULO_TEXTO_TIMEOUT']
+        pasta = config['UPLOAD_FOLDER']
+        executor = self._pool(processos)
+        futuros = {}
+        for item in itens:
+            caminho = os.path.join(pasta, item.arquivo)
+            if not os.path.exists(caminho):
+                self._registrar_falha(item, FileNotFoundError('Arquivo não encontrado no disco.'), definitiva=True)
+                continue
+            futuros[executor.submit(pdf_texto.extrair_texto, caminho, timeout,
+                                    config['CURRICULO_TEXTO_MAX_CARACTERES'])] = item
+
+        prontos, atrasados = wait(futuros, timeout=timeout + MARGEM_SEGUNDOS)
+        descartar = bool(atrasados)
+        for futuro in prontos:
+            item = futuros[futuro]
+            erro = futuro.exception()
+            if erro is None:
+                item.texto, item.paginas = futuro.result()
+                item.status = CONCLUIDO
+                item.extraido_em = datetime.utcnow()
+                item.erro = None
+            else:
+                # BrokenProcessPool: um processo morreu (ex.: morto pelo sistema); o pool não serve mais
+                descartar = descartar or type(erro).__name__ == 'BrokenProcessPool'
+                self._registrar_falha(item, erro)
+        for futuro in atrasados:
+            self._registrar_falha(futuros[futuro], TimeoutError(f"Sem resposta do processo após {timeout}s."))
+        if descartar:
+            self._descartar_pool()
+
+        self.db.session.commit()
+        return len(itens)
+
+    def _registrar_falha(self, item, erro, definitiva=False):
+        item.tentativas += 1
+        item.erro = f"{type(erro).__name__}: {erro}"[:1000]
+        if definitiva or item.tentativas >= self.app.config['CURRICULO_TEXTO_MAX_TENTATIVAS']:
+            item.status = FALHOU
+            print(f"ERRO AO EXTRAIR TEXTO DE {item.arquivo} (desistindo após {item.tentativas} tentativa(s)): {item.erro}")
+        else:
+            item.status = PENDENTE
+            print(f"ERRO AO EXTRAIR TEXTO DE {item.arquivo} (nova tentativa): {item.erro}")
+
+    def encerrar(self):
+        """Fecha o pool de processos (fim do comando do CLI)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
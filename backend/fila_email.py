@@ -0,0 +1,173 @@
+# =======================================================
+# FILA DE E-MAILS (OUTBOX)
+# =======================================================
+# As rotas de contato só gravam a mensagem na tabela 'email_pendente' e
+# retornam. Um pool de threads em segundo plano (ou o comando
+# `flask processar-emails`) reserva lotes de mensagens, envia todas por uma
+# única conexão SMTP e reagenda as que falharem com backoff exponencial.
+
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, update, or_, and_
+
+PENDENTE = 'pendente'
+ENVIANDO = 'enviando'
+ENVIADO = 'enviado'
+FALHOU = 'falhou'
+
+
+class FilaEmail:
+    """Extensão da fila de e-mails. O modelo deve ter as colunas de 'EmailPendente'."""
+
+    def __init__(self, app=None, db=None, mail=None, modelo=None):
+        self.app = None
+        self._workers = []
+        self._pid_workers = None
+        self._acordar = threading.Event()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, db, mail, modelo)
+
+    def init_app(self, app, db, mail, modelo):
+        self.app = app
+        self.db = db
+        self.mail = mail
+        self.modelo = modelo
+        app.config.setdefault('MAIL_QUEUE_WORKERS', 1)          # Threads por processo (0 = só via CLI)
+        app.config.setdefault('MAIL_QUEUE_LOTE', 20)            # Mensagens por conexão SMTP
+        app.config.setdefault('MAIL_QUEUE_MAX_TENTATIVAS', 6)
+        app.config.setdefault('MAIL_QUEUE_BACKOFF_BASE', 30)    # Segundos; dobra a cada tentativa
+        app.config.setdefault('MAIL_QUEUE_INTERVALO', 15)       # Segundos entre varreduras da fila
+        app.config.setdefault('MAIL_QUEUE_TIMEOUT_ENVIO', 600)  # Reserva 'enviando' expira (worker morto)
+        app.extensions['fila_email'] = self
+        # Os workers só são acordados depois que a mensagem estiver gravada
+        if not event.contains(db.session, 'after_commit', self._depois_do_commit):
+            event.listen(db.session, 'after_commit', self._depois_do_commit)
+        if app.config['MAIL_QUEUE_WORKERS'] > 0:
+            app.before_request(self._garantir_workers)
+
+    # --- Produtor ---
+    def enfileirar(self, assunto, destinatarios, html, remetente=None):
+        """Adiciona a mensagem na sessão atual. Ela é enviada depois do commit de quem chamou."""
+        email = self.modelo(
+            assunto=assunto,
+            destinatarios=','.join(d for d in destinatarios if d),
+            remetente=remetente or self.app.config.get('MAIL_USERNAME'),
+            html=html,
+            status=PENDENTE,
+            tentativas=0,
+            proxima_tentativa=datetime.utcnow(),
+        )
+        self.db.session.add(email)
+        self.db.session.info['fila_email_acordar'] = True
+        self._garantir_workers()
+        return email
+
+    def _depois_do_commit(self, session):
+        if session.info.pop('fila_email_acordar', False):
+            self._acordar.set()
+
+    # --- Workers ---
+    def _garantir_workers(self):
+        """Sobe as threads no processo atual (inclusive depois do fork do gunicorn)."""
+        quantidade = self.app.config['MAIL_QUEUE_WORKERS']
+        if quantidade <= 0 or self._pid_workers == os.getpid():
+            return
+        with self._lock:
+            if self._pid_workers == os.getpid():
+                return
+            self._pid_workers = os.getpid()
+            self._workers = []
+            for i in range(quantidade):
+                worker = threading.Thread(target=self._loop, name=f'fila-email-{i}', daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _loop(self):
+        while True:
+            self._acordar.wait(self.app.config['MAIL_QUEUE_INTERVALO'])
+            self._acordar.clear()
+            try:
+                with self.app.app_context():
+                    while self.processar_lote():
+                        pass
+            except Exception as e:
+                print(f"ERRO NA FILA DE E-MAIL: {e}")
+
+    def _reservar_lote(self):
+        """Marca um lote como 'enviando' com um UPDATE condicional (seguro entre processos)."""
+        modelo = self.modelo
+        agora = datetime.utcnow()
+        limite_reserva = agora - timedelta(seconds=self.app.config['MAIL_QUEUE_TIMEOUT_ENVIO'])
+        disponiveis = or_(
+            and_(modelo.status == PENDENTE, modelo.proxima_tentativa <= agora),
+            and_(modelo.status == ENVIANDO, modelo.enviando_desde < limite_reserva),
+        )
+        ids = [linha.id for linha in (self.db.session.query(modelo.id).filter(disponiveis)
+                                      .order_by(modelo.proxima_tentativa)
+                                      .limit(self.app.config['MAIL_QUEUE_LOTE']))]
+        if not ids:
+            return []
+
+        lote = uuid.uuid4().hex
+        self.db.session.execute(
+            update(modelo)
+            .where(modelo.id.in_(ids), disponiveis)
+            .values(status=ENVIANDO, lote=lote, enviando_desde=agora)
+        )
+        self.db.session.commit()
+        return modelo.query.filter_by(lote=lote, status=ENVIANDO).all()
+
+    def processar_lote(self):
+        """Envia um lote reutilizando a mesma conexão SMTP. Retorna quantas mensagens foram tratadas."""
+        emails = self._reservar_lote()
+        if not emails:
+            return 0
+
+        pendentes = list(emails)
+        try:
+            with self.mail.connect() as conexao:
+                while pendentes:
+                    email = pendentes[0]
+                    try:
+                        conexao.send(self._montar_mensagem(email))
+                    except Exception as e:
+                        # Falha só desta mensagem: as demais continuam na mesma conexão
+                        self._registrar_falha(email, e)
+                    else:
+                        email.status = ENVIADO
+                        email.enviado_em = datetime.utcnow()
+                        email.ultimo_erro = None
+                    pendentes.pop(0)
+        except Exception as e:
+            # Falha de conexão/autenticação: reagenda o que ainda não foi enviado
+            for email in pendentes:
+                self._registrar_falha(email, e)
+
+        self.db.session.commit()
+        return len(emails)
+
+    def _montar_mensagem(self, email):
+        from flask_mail import Message  # Importado só quando há e-mail para enviar
+        msg = Message(
+            subject=email.assunto,
+            sender=email.remetente,
+            recipients=email.destinatarios.split(','),
+        )
+        msg.html = email.html
+        return msg
+
+    def _registrar_falha(self, email, erro):
+        email.tentativas += 1
+        email.ultimo_erro = str(erro)[:1000]
+        if email.tentativas >= self.app.config['MAIL_QUEUE_MAX_TENTATIVAS']:
+            email.status = FALHOU
+            print(f"ERRO AO ENVIAR E-MAIL #{email.id} (desistindo após {email.tentativas} tentativas): {erro}")
+        else:
+            espera = self.app.config['MAIL_QUEUE_BACKOFF_BASE'] * (2 ** (email.tentativas - 1))
+            email.status = PENDENTE
+            email.proxima_tentativa = datetime.utcnow() + timedelta(seconds=espera)
+            print(f"ERRO AO ENVIAR E-MAIL #{email.id} (nova tentativa em {espera}s): {erro}")
@@ -0,0 +1,89 @@
+# =======================================================
+# MAPEAMENTO FORMULÁRIO -> COLEÇÕES DA PESSOA
+# =======================================================
+# Cada coleção dinâmica do formulário de currículo (formações, experiências,
+# idiomas, cursos) chega como várias listas paralelas ('exp_empresa[]',
+# 'exp_cargo[]'...). Aqui cada lista é lida uma única vez, as linhas são
+# comparadas com o que já está no banco e só a diferença é gravada, com
+# INSERT/UPDATE/DELETE em lote.
+
+from collections import Counter, namedtuple
+from itertools import islice, zip_longest
+
+from sqlalchemy import delete, insert, select, update
+
+ResultadoSincronizacao = namedtuple('ResultadoSincronizacao', 'inseridos atualizados removidos')
+
+
+class ColecaoFormulario:
+    """
+    Liga um modelo filho de Pessoa aos campos do formulário.
+    `campos` mapeia atributo do modelo -> nome do campo no formulário; o primeiro
+    campo define quantas linhas foram enviadas.
+    """
+
+    def __init__(self, modelo, relacao, campos):
+        self.modelo = modelo
+        self.relacao = relacao
+        self.campos = campos
+
+    def ler(self, form):
+        """Converte as listas paralelas do formulário em uma lista de dicts (uma leitura por lista)."""
+        listas = [form.getlist(campo) for campo in self.campos.values()]
+        quantidade = len(listas[0])
+        return [dict(zip(self.campos, valores))
+                for valores in islice(zip_longest(*listas, fillvalue=''), quantidade)]
+
+    def _chave(self, linha):
+        return tuple((linha[atributo] or '') for atributo in self.campos)
+
+    def sincronizar(self, session, pessoa, form):
+        """
+        Aplica no banco só o que mudou entre o formulário e as linhas existentes da Pessoa:
+        linhas idênticas ficam como estão, sobras são reaproveitadas com UPDATE e o
+        restante vira INSERT ou DELETE. `pessoa.id` precisa existir (faça flush antes).
+        """
+        modelo = self.modelo
+        novas = self.ler(form)
+        colunas = [getattr(modelo, atributo) for atributo in self.campos]
+        existentes = session.execute(
+            select(modelo.id, *colunas).where(modelo.pessoa_id == pessoa.id).order_by(modelo.id)
+        ).all()
+
+        # 1. Linhas com o mesmo conteúdo não são tocadas
+        disponiveis = Counter(self._chave(linha) for linha in novas)
+        casados = Counter()
+        sobras_existentes = []
+        for linha in existentes:
+            chave = self._chave(linha._mapping)
+            if disponiveis[chave] > 0:
+                disponiveis[chave] -= 1
+                casados[chave] += 1
+            else:
+                sobras_existentes.append(linha.id)
+
+        sobras_novas = []
+        for linha in novas:
+            chave = self._chave(linha)
+            if casados[chave] > 0:
+                casados[chave] -= 1
+            else:
+                sobras_novas.append(linha)
+
+        # 2. Sobras dos dois lados são pareadas: UPDATE reaproveitando o id
+        pares = list(zip(sobras_existentes, sobras_novas))
+        para_atualizar = [dict(linha, id=id_existente) for id_existente, linha in pares]
+        para_remover = sobras_existentes[len(pares):]
+        para_inserir = [dict(linha, pessoa_id=pessoa.id) for linha in sobras_novas[len(pares):]]
+
+        # 3. Um comando em lote para cada tipo de alteração
+        if para_atualizar:
+            session.execute(update(modelo), para_atualizar)
+        if para_remover:
+            session.execute(delete(modelo).where(modelo.id.in_(para_remover)))
+        if para_inserir:
+            session.execute(insert(modelo), para_inserir)
+
+        # A coleção carregada no ORM ficou desatualizada
+        session.expire(pessoa, [self.relacao])
+        return ResultadoSincronizacao(len(para_inserir), len(para_atualizar), len(para_remover))
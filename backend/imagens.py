@@ -0,0 +1,98 @@
+# =======================================================
+# DERIVADOS RESPONSIVOS DAS IMAGENS ENVIADAS
+# =======================================================
+# Para cada imagem de Post/Especialista são geradas versões menores em WebP
+# (e AVIF, se o Pillow tiver suporte) em uploads/derivados/. Os templates usam
+# `fontes_responsivas()` para montar o srcset e o navegador baixa só o tamanho
+# de que precisa, em vez do arquivo original de vários MB.
+
+import os
+
+PASTA_DERIVADOS = 'derivados'
+LARGURAS = (320, 640, 1024)
+QUALIDADE = {'webp': 80, 'avif': 60}
+
+
+def _pillow():
+    """O Pillow só é importado quando uma imagem é processada, não no boot do app."""
+    from PIL import Image, ImageOps
+    try:
+        import pillow_avif  # noqa: F401 - registra o AVIF em versões antigas do Pillow
+    except ImportError:
+        pass
+    return Image, ImageOps
+
+
+def formatos_suportados():
+    """AVIF primeiro (menor), WebP sempre."""
+    Image, _ = _pillow()
+    extensoes = Image.registered_extensions()
+    return [fmt for fmt in ('avif', 'webp') if f'.{fmt}' in extensoes]
+
+
+def _nome_derivado(nome_arquivo, largura, formato):
+    base = os.path.splitext(os.path.basename(nome_arquivo))[0]
+    return f"{PASTA_DERIVADOS}/{base}-{largura}.{formato}"
+
+
+def gerar_derivados(pasta_uploads, nome_arquivo, forcar=False):
+    """
+    Gera as larguras configuradas menores que a original em cada formato suportado.
+    Retorna a lista de arquivos criados, relativos à pasta de uploads.
+    """
+    Image, ImageOps = _pillow()
+    origem = os.path.join(pasta_uploads, nome_arquivo)
+    os.makedirs(os.path.join(pasta_uploads, PASTA_DERIVADOS), exist_ok=True)
+    criados = []
+
+    with Image.open(origem) as imagem:
+        # GIF animado e imagens já pequenas continuam sendo servidos pelo original
+        if getattr(imagem, 'is_animated', False):
+            return criados
+        imagem = ImageOps.exif_transpose(imagem)  # Respeita a rotação das fotos de celular
+        larguras = [l for l in LARGURAS if l < imagem.width]
+        if not larguras:
+            return criados
+        if imagem.mode not in ('RGB', 'RGBA'):
+            imagem = imagem.convert('RGBA' if 'transparency' in imagem.info else 'RGB')
+
+        for largura in larguras:
+            altura = round(imagem.height * largura / imagem.width)
+            redimensionada = imagem.resize((largura, altura), Image.LANCZOS)
+            for formato in formatos_suportados():
+                nome = _nome_derivado(nome_arquivo, largura, formato)
+                destino = os.path.join(pasta_uploads, nome)
+                if not forcar and os.path.exists(destino):
+                    continue
+                temporario = destino + '.tmp'
+                redimensionada.save(temporario, format=formato.upper(), quality=QUALIDADE[formato])
+                os.replace(temporario, destino)
+                criados.append(nome)
+    return criados
+
+
+def remover_derivados(pasta_uploads, nome_arquivo):
+    for largura in LARGURAS:
+        for formato in QUALIDADE:
+            caminho = os.path.join(pasta_uploads, _nome_derivado(nome_arquivo, largura, formato))
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+
+def fontes_responsivas(pasta_uploads, nome_arquivo, montar_url):
+    """
+    Lista [{'tipo': 'image/webp', 'srcset': 'url 320w, url 640w'}] com os derivados que existem,
+    para uso em <picture><source>. Vazio se a imagem ainda não tiver derivados.
+    """
+    if not nome_arquivo:
+        return []
+    fontes = []
+    for formato in ('avif', 'webp'):
+        itens = []
+        for largura in LARGURAS:
+            nome = _nome_derivado(nome_arquivo, largura, formato)
+            if os.path.exists(os.path.join(pasta_uploads, nome)):
+                itens.append(f"{montar_url(nome)} {largura}w")
+        if itens:
+            fontes.append({'tipo': f'image/{formato}', 'srcset': ', '.join(itens)})
+    return fontes
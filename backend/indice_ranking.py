@@ -0,0 +1,272 @@
+# =======================================================
+# MATRIZ ESPARSA DO RANKING DE CANDIDATOS (NUMPY)
+# =======================================================
+# Cada Pessoa vira uma linha com os pesos BM25 dos seus termos (os mesmos
+# documentos e pesos por campo da busca: competências/cargos, formação/cursos,
+# atividades/resumos). A matriz fica em colunas comprimidas (CSC): para uma
+# descrição de vaga, só as colunas dos termos da vaga são lidas, e um único
+# np.bincount soma as contribuições de todas as linhas de uma vez (o produto
+# matriz x vetor da consulta).
+#
+# Atualização incremental: as Pessoas alteradas depois da montagem vão para um
+# "delta" pequeno e a linha antiga é desativada; quando o delta cresce, ele é
+# fundido na matriz principal (compactar), sem tokenizar tudo de novo. O IDF
+# conta só as linhas ativas (matriz + delta), então compactar não muda o
+# ranking; já a média de tamanho dos documentos só é recalculada numa montagem
+# completa.
+
+import os
+import tempfile
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+from busca import frequencias_ponderadas, tokenizar
+
+K1 = 1.2
+B = 0.75
+VERSAO_ARQUIVO = 2  # 2: versões (atualizado_em) de cada linha
+
+
+class _Colunas:
+    """Matriz CSC mínima: indptr/linhas/pesos por coluna (termo)."""
+
+    def __init__(self, indptr, linhas, pesos):
+        self.indptr = indptr
+        self.linhas = linhas
+        self.pesos = pesos
+
+    @classmethod
+    def de_coordenadas(cls, linhas, colunas, pesos, n_colunas):
+        ordem = np.argsort(colunas, kind='stable')
+        contagem = np.bincount(colunas, minlength=n_colunas)
+        indptr = np.zeros(n_colunas + 1, dtype=np.int64)
+        np.cumsum(contagem, out=indptr[1:])
+        return cls(indptr, linhas[ordem].astype(np.int32), pesos[ordem].astype(np.float32))
+
+    @property
+    def n_colunas(self):
+        return len(self.indptr) - 1
+
+    def coordenadas(self):
+        """(linhas, colunas, pesos) de todas as entradas."""
+        colunas = np.repeat(np.arange(self.n_colunas, dtype=np.int32), np.diff(self.indptr))
+        return self.linhas, colunas, self.pesos
+
+    def frequencia_documentos(self, n_colunas, ativas=None):
+        """Em quantas linhas cada coluna aparece (só as linhas `ativas`, se informadas)."""
+        if ativas is None:
+            contagem = np.diff(self.indptr)
+        else:
+            linhas, colunas, _ = self.coordenadas()
+            contagem = np.bincount(colunas[ativas[linhas]], minlength=self.n_colunas)
+        return np.pad(contagem.astype(np.float64), (0, n_colunas - self.n_colunas))
+
+    def produto(self, colunas, pesos_consulta, n_linhas):
+        """Scores de todas as linhas para a consulta (só as colunas da consulta são lidas)."""
+        dentro = colunas < self.n_colunas
+        colunas, pesos_consulta = colunas[dentro], pesos_consulta[dentro]
+        inicios, fins = self.indptr[colunas], self.indptr[colunas + 1]
+        if not len(colunas) or not (fins - inicios).any():
+            return np.zeros(n_linhas)
+        posicoes = np.concatenate([np.arange(i, f) for i, f in zip(inicios, fins)])
+        pesos = self.pesos[posicoes] * np.repeat(pesos_consulta, fins - inicios)
+        return np.bincount(self.linhas[posicoes], weights=pesos, minlength=n_linhas)
+
+
+class MatrizRanking:
+    """Vocabulário + matriz principal (CSC) + delta das Pessoas alteradas desde a montagem."""
+
+    def __init__(self, termos, principal, pessoa_ids, media, sincronizado_ate, versoes=None):
+        self.termos = list(termos)
+        self.colunas = {termo: i for i, termo in enumerate(self.termos)}
+        self.principal = principal
+        self.pessoa_ids = pessoa_ids
+        self.linha_de = {int(pessoa_id): i for i, pessoa_id in enumerate(pessoa_ids)}
+        self.ativo = np.ones(len(pessoa_ids), dtype=bool)
+        self._df_cache = None
+        self.media = media
+        self.sincronizado_ate = sincronizado_ate
+        # atualizado_em do documento de cada linha, para a reconciliação (ranking._sincronizar)
+        self.versoes = versoes if versoes is not None else np.full(len(pessoa_ids), np.datetime64('NaT'), 'M8[us]')
+        self.delta = {}  # pessoa_id -> (colunas, pesos)
+        self.versoes_delta = {}  # pessoa_id -> atualizado_em
+        self._delta_cache = None
+
+    # --- Montagem ---
+    @classmethod
+    def construir(cls, documentos):
+        """`documentos`: iterável de (pessoa_id, peso_a, peso_b, peso_c, atualizado_em)."""
+        termos, colunas_de = [], {}
+        pessoa_ids, tamanhos, frequencias, versoes = [], [], [], []
+        sincronizado_ate = None
+        for pessoa_id, peso_a, peso_b, peso_c, atualizado_em in documentos:
+            freq = frequencias_ponderadas(peso_a, peso_b, peso_c)
+            for termo in freq:
+                if termo not in colunas_de:
+                    colunas_de[termo] = len(termos)
+                    termos.append(termo)
+            pessoa_ids.append(pessoa_id)
+            versoes.append(atualizado_em)
+            tamanhos.append(sum(freq.values()))
+            frequencias.append((np.fromiter((colunas_de[t] for t in freq), np.int32, len(freq)),
+                                np.fromiter(freq.values(), np.float64, len(freq))))
+            if sincronizado_ate is None or atualizado_em > sincronizado_ate:
+                sincronizado_ate = atualizado_em
+
+        media = (sum(tamanhos) / len(tamanhos) if tamanhos else 0) or 1.0
+        linhas = np.repeat(np.arange(len(pessoa_ids), dtype=np.int32), [len(c) for c, _ in frequencias])
+        colunas = np.concatenate([c for c, _ in frequencias]) if frequencias else np.zeros(0, np.int32)
+        pesos = (np.concatenate([_bm25(f, tamanho, media) for (_, f), tamanho in zip(frequencias, tamanhos)])
+                 if frequencias else np.zeros(0))
+        principal = _Colunas.de_coordenadas(linhas, colunas, pesos, len(termos))
+        return cls(termos, principal, np.array(pessoa_ids, dtype=np.int64), media, sincronizado_ate,
+                   np.array(versoes, dtype='M8[us]'))
+
+    # --- Atualização incremental ---
+    def atualizar(self, pessoa_id, peso_a, peso_b, peso_c, atualizado_em=None):
+        freq = frequencias_ponderadas(peso_a, peso_b, peso_c)
+        for termo in freq:
+            if termo not in self.colunas:
+                self.colunas[termo] = len(self.termos)
+                self.termos.append(termo)
+        colunas = np.fromiter((self.colunas[t] for t in freq), np.int32, len(freq))
+        tf = np.fromiter(freq.values(), np.float64, len(freq))
+        self._desativar(pessoa_id)
+        self.delta[pessoa_id] = (colunas, _bm25(tf, tf.sum(), self.media))
+        self.versoes_delta[pessoa_id] = atualizado_em
+        self._delta_cache = None
+
+    def remover(self, pessoa_ids):
+        for pessoa_id in pessoa_ids:
+            self._desativar(pessoa_id)
+            if self.delta.pop(pessoa_id, None) is not None:
+                del self.versoes_delta[pessoa_id]
+                self._delta_cache = None
+
+    def _desativar(self, pessoa_id):
+        linha = self.linha_de.get(pessoa_id)
+        if linha is not None and self.ativo[linha]:
+            self.ativo[linha] = False
+            self._df_cache = None
+
+    def ids(self):
+        """Pessoas na matriz (linhas ativas e delta)."""
+        return set(self.pessoa_ids[self.ativo].tolist()) | set(self.delta)
+
+    def versao(self, pessoa_id):
+        """atualizado_em do documento aplicado, ou None se a Pessoa não está na matriz."""
+        if pessoa_id in self.delta:
+            return self.versoes_delta[pessoa_id]
+        linha = self.linha_de.get(pessoa_id)
+        if linha is None or not self.ativo[linha] or np.isnat(self.versoes[linha]):
+            return None
+        return self.versoes[linha].item()
+
+    def __len__(self):
+        return int(self.ativo.sum()) + len(self.delta)
+
+    def _matriz_delta(self):
+        if self._delta_cache is None:
+            ids = np.fromiter(self.delta, np.int64, len(self.delta))
+            itens = list(self.delta.values())
+            linhas = np.repeat(np.arange(len(ids), dtype=np.int32), [len(c) for c, _ in itens])
+            colunas = np.concatenate([c for c, _ in itens]) if itens else np.zeros(0, np.int32)
+            pesos = np.concatenate([p for _, p in itens]) if itens else np.zeros(0)
+            self._delta_cache = (ids, _Colunas.de_coordenadas(linhas, colunas, pesos, len(self.termos)))
+        return self._delta_cache
+
+    def compactar(self):
+        """Nova matriz com o delta fundido na principal e sem as linhas desativadas."""
+        linhas, colunas, pesos = self.principal.coordenadas()
+        manter = self.ativo[linhas]
+        nova_linha = np.cumsum(self.ativo) - 1
+        ids = [self.pessoa_ids[self.ativo]]
+        versoes = [self.versoes[self.ativo]]
+        partes = [(nova_linha[linhas[manter]], colunas[manter], pesos[manter])]
+        if self.delta:
+            ids_delta, matriz_delta = self._matriz_delta()
+            linhas_d, colunas_d, pesos_d = matriz_delta.coordenadas()
+            partes.append((linhas_d + int(self.ativo.sum()), colunas_d, pesos_d))
+            ids.append(ids_delta)
+            versoes.append(np.array([self.versoes_delta[pessoa_id] for pessoa_id in ids_delta.tolist()], 'M8[us]'))
+        principal = _Colunas.de_coordenadas(*(np.concatenate(p) for p in zip(*partes)), len(self.termos))
+        return MatrizRanking(self.termos, principal, np.concatenate(ids), self.media, self.sincronizado_ate,
+                             np.concatenate(versoes))
+
+    @property
+    def compactada(self):
+        return not self.delta and bool(self.ativo.all())
+
+    # --- Consulta ---
+    def _idf(self):
+        n_termos = len(self.termos)
+        if self._df_cache is None or len(self._df_cache) != n_termos:
+            # Recalculado só quando alguma linha é desativada (uma vez por sincronização com alterações)
+            self._df_cache = self.principal.frequencia_documentos(
+                n_termos, None if self.ativo.all() else self.ativo)
+        df = self._df_cache
+        if self.delta:
+            df = df + self._matriz_delta()[1].frequencia_documentos(n_termos)
+        total = len(self)
+        return np.log1p(np.maximum(total - df + 0.5, 0.5) / (df + 0.5))
+
+    def ranquear(self, texto, limite=20):
+        """[(pessoa_id, score)] das Pessoas mais próximas do texto (OU lógico dos termos), da maior para a menor."""
+        contagem = Counter(t for t in tokenizar(texto) if t in self.colunas)
+        if not contagem or not len(self):
+            return []
+        colunas = np.fromiter((self.colunas[t] for t in contagem), np.int32, len(contagem))
+        pesos_consulta = self._idf()[colunas] * (1 + np.log(np.fromiter(contagem.values(), np.float64)))
+
+        scores = self.principal.produto(colunas, pesos_consulta, len(self.pessoa_ids))
+        scores[~self.ativo] = 0
+        ids = self.pessoa_ids
+        if self.delta:
+            ids_delta, matriz_delta = self._matriz_delta()
+            scores = np.concatenate([scores, matriz_delta.produto(colunas, pesos_consulta, len(ids_delta))])
+            ids = np.concatenate([ids, ids_delta])
+
+        positivos = np.flatnonzero(scores > 0)
+        if len(positivos) > limite:
+            positivos = positivos[np.argpartition(-scores[positivos], limite - 1)[:limite]]
+        ordem = np.lexsort((ids[positivos], -scores[positivos]))
+        return [(int(ids[i]), float(scores[i])) for i in positivos[ordem]]
+
+    # --- Disco ---
+    def salvar(self, caminho):
+        """Grava a matriz (já compactada) num .npz; a escrita é atômica, nenhum processo lê pela metade."""
+        if not self.compactada:
+            raise ValueError('Compacte a matriz antes de gravar.')
+        pasta = os.path.dirname(caminho) or '.'
+        os.makedirs(pasta, exist_ok=True)
+        fd, temporario = tempfile.mkstemp(dir=pasta, prefix='.ranking-', suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as destino:
+                np.savez(destino, versao=VERSAO_ARQUIVO, termos=np.array(self.termos, dtype=str),
+                         indptr=self.principal.indptr, linhas=self.principal.linhas, pesos=self.principal.pesos,
+                         pessoa_ids=self.pessoa_ids, versoes=self.versoes, media=self.media,
+                         sincronizado_ate=(self.sincronizado_ate.isoformat() if self.sincronizado_ate else ''))
+            os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Matriz gravada por salvar(), ou None se o arquivo não existe ou é de outra versão."""
+        if not os.path.exists(caminho):
+            return None
+        with np.load(caminho, allow_pickle=False) as dados:
+            if int(dados['versao']) != VERSAO_ARQUIVO:
+                return None
+            principal = _Colunas(dados['indptr'], dados['linhas'], dados['pesos'])
+            sincronizado_ate = str(dados['sincronizado_ate'])
+            return cls(dados['termos'].tolist(), principal, dados['pessoa_ids'], float(dados['media']),
+                       datetime.fromisoformat(sincronizado_ate) if sincronizado_ate else None, dados['versoes'])
+
+
+def _bm25(tf, tamanho, media):
+    return tf * (K1 + 1) / (tf + K1 * (1 - B + B * tamanho / media))
@@ -0,0 +1,154 @@
+# =======================================================
+# LIMITE DE REQUISIÇÕES (TOKEN BUCKET)
+# =======================================================
+# Os formulários públicos (contato, cadastro de currículo) e o login custam um
+# envio de e-mail, um bcrypt ou várias escritas no banco e no disco: sem limite,
+# um único robô ocupa todos os workers. Cada rota marcada com @limitador.limitar
+# tem um "balde" por IP com `capacidade` fichas, repostas aos poucos ao longo do
+# `periodo` (ex.: '5/600' = rajada de 5 envios e mais 1 a cada 2 minutos). Sem
+# ficha, a resposta é 429 com Retry-After.
+#
+# O backend 'memoria' vale por processo (com N workers o limite real é N vezes
+# maior); com vários workers ou servidores, use o 'redis'. Atrás de um proxy
+# reverso, configure PROXY_FIX_X_FOR para que o IP seja o do cliente.
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+from werkzeug.exceptions import TooManyRequests
+
+
+def interpretar_limite(texto):
+    """'capacidade/periodo em segundos' -> (capacidade, periodo). Ex.: '5/600'."""
+    try:
+        capacidade, periodo = (float(parte) for parte in texto.split('/'))
+    except ValueError:
+        raise ValueError(f"Limite inválido: {texto!r} (use 'capacidade/segundos', ex.: '5/600').")
+    if capacidade < 1 or periodo <= 0:
+        raise ValueError(f"Limite inválido: {texto!r}.")
+    return capacidade, periodo
+
+
+class BaldesMemoria:
+    """Baldes no processo atual, em LRU limitado por número de chaves (IPs x rotas)."""
+
+    def __init__(self, max_chaves=10000):
+        self.max_chaves = max_chaves
+        self._baldes = OrderedDict()  # chave -> (fichas, atualizado_em)
+        self._lock = threading.Lock()
+
+    def consumir(self, chave, capacidade, periodo):
+        """Gasta uma ficha. Retorna 0 se a requisição pode seguir, senão os segundos até a próxima ficha."""
+        agora = time.monotonic()
+        taxa = capacidade / periodo
+        with self._lock:
+            fichas, atualizado_em = self._baldes.get(chave, (capacidade, agora))
+            fichas = min(capacidade, fichas + (agora - atualizado_em) * taxa)
+            espera = 0.0
+            if fichas >= 1:
+                fichas -= 1
+            else:
+                espera = (1 - fichas) / taxa
+            self._baldes[chave] = (fichas, agora)
+            self._baldes.move_to_end(chave)
+            while len(self._baldes) > self.max_chaves:
+                self._baldes.popitem(last=False)  # Balde esquecido = balde cheio
+        return espera
+
+    def limpar(self):
+        with self._lock:
+            self._baldes.clear()
+
+
+# Atômico no Redis: lê, repõe, consome e grava o balde numa única operação.
+# Usa o relógio do próprio Redis, para que todos os servidores concordem.
+_SCRIPT_REDIS = """
+local capacidade = tonumber(ARGV[1])
+local taxa = tonumber(ARGV[2])
+local relogio = redis.call('TIME')
+local agora = tonumber(relogio[1]) + tonumber(relogio[2]) / 1000000
+local balde = redis.call('HMGET', KEYS[1], 'fichas', 'atualizado_em')
+local fichas = tonumber(balde[1]) or capacidade
+local atualizado_em = tonumber(balde[2]) or agora
+fichas = math.min(capacidade, fichas + math.max(0, agora - atualizado_em) * taxa)
+local espera = 0
+if fichas >= 1 then
+  fichas = fichas - 1
+else
+  espera = (1 - fichas) / taxa
+end
+redis.call('HSET', KEYS[1], 'fichas', fichas, 'atualizado_em', agora)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacidade / taxa) + 1)
+return tostring(espera)
+"""
+
+
+class BaldesRedis:
+    """Baldes compartilhados entre workers. Aceita qualquer cliente com a API do redis-py."""
+
+    def __init__(self, cliente, prefixo='honoriel:limite:'):
+        self.cliente = cliente
+        self.prefixo = prefixo
+        self._script = cliente.register_script(_SCRIPT_REDIS)
+
+    @classmethod
+    def from_url(cls, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND='redis' requer o pacote 'redis' (pip install redis).")
+        return cls(redis.Redis.from_url(url))
+
+    def consumir(self, chave, capacidade, periodo):
+        return float(self._script(keys=[self.prefixo + chave], args=[capacidade, capacidade / periodo]))
+
+    def limpar(self):
+        for chave in self.cliente.scan_iter(f'{self.prefixo}*'):
+            self.cliente.delete(chave)
+
+
+class Limitador:
+    """Extensão do limite de requisições. Configurada por RATE_LIMIT_BACKEND ('memoria', 'redis' ou 'nenhum')."""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.limites = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        tipo = app.config.get('RATE_LIMIT_BACKEND', 'memoria')
+        if tipo == 'redis':
+            self.backend = BaldesRedis.from_url(app.config['RATE_LIMIT_REDIS_URL'])
+        elif tipo == 'memoria':
+            self.backend = BaldesMemoria(app.config.get('RATE_LIMIT_MAX_CHAVES', 10000))
+        else:
+            self.backend = None
+        # Valida na subida: um limite mal escrito não deve aparecer só no primeiro POST
+        self.limites = {nome: interpretar_limite(texto)
+                        for nome, texto in app.config.get('RATE_LIMITS', {}).items() if texto}
+        app.extensions['limitador'] = self
+
+    def limitar(self, nome, metodos=('POST',)):
+        """
+        Decorator das rotas: aplica o limite `nome` de RATE_LIMITS por IP e rota.
+        Só conta os métodos em `metodos` (o GET que exibe o formulário fica livre).
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                limite = self.limites.get(nome)
+                if self.backend is not None and limite and request.method in metodos:
+                    chave = f'{request.endpoint}:{request.remote_addr}'
+                    espera = self.backend.consumir(chave, *limite)
+                    if espera:
+                        current_app.logger.warning('Limite %r excedido por %s em %s', nome,
+                                                   request.remote_addr, request.endpoint)
+                        raise TooManyRequests(retry_after=math.ceil(espera))
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
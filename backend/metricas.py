@@ -0,0 +1,210 @@
+# =======================================================
+# MÉTRICAS POR REQUISIÇÃO
+# =======================================================
+# Para cada requisição registra a latência (histograma por rota), quantas
+# consultas SQL foram feitas e quanto tempo levaram (eventos do engine do
+# SQLAlchemy), o tempo de renderização dos templates e os bytes enviados.
+# `/admin/metrics` exporta tudo no formato texto do Prometheus. Requisições
+# que passam do orçamento de consultas (SQL_QUERY_BUDGET) geram um warning no
+# log, o que denuncia N+1 assim que ele aparece. Rotas de escrita que fazem
+# mais consultas por natureza declaram o próprio limite com
+# `@metricas.orcamento(n)`.
+#
+# Os valores ficam na memória de cada processo: com vários workers do
+# gunicorn, cada scrape vê só o worker que respondeu.
+
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class Histograma:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.contagens = [0] * len(buckets)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.soma += valor
+        self.total += 1
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.contagens[i] += 1
+
+
+def _rotulos(**rotulos):
+    def escapar(valor):
+        return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{nome}="{escapar(valor)}"' for nome, valor in rotulos.items()) + '}'
+
+
+class Metricas:
+    """Extensão de métricas. Use `exportar()` para obter o texto no formato do Prometheus."""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._resetar()
+        self.medidores = {}  # nome -> (ajuda, função, rótulos, tipo)
+        if app is not None:
+            self.init_app(app)
+
+    def _resetar(self):
+        self.latencia = defaultdict(lambda: Histograma(BUCKETS_LATENCIA))     # (rota, método)
+        self.consultas_por_requisicao = defaultdict(lambda: Histograma(BUCKETS_CONSULTAS))  # rota
+        self.requisicoes = defaultdict(int)         # (rota, método, status)
+        self.sql_consultas = defaultdict(int)       # rota
+        self.sql_segundos = defaultdict(float)      # rota
+        self.template_segundos = defaultdict(float) # rota
+        self.bytes_enviados = defaultdict(int)      # rota
+        self.orcamento_excedido = defaultdict(int)  # rota
+
+    def init_app(self, app):
+        app.config.setdefault('SQL_QUERY_BUDGET', 20)  # Consultas por requisição antes do warning
+        self.app = app
+        app.before_request(self._inicio)
+        app.after_request(self._fim)
+        # Vale para todos os engines (inclusive réplicas de leitura); registrado uma vez só
+        if not event.contains(Engine, 'before_cursor_execute', self._antes_sql):
+            event.listen(Engine, 'before_cursor_execute', self._antes_sql)
+            event.listen(Engine, 'after_cursor_execute', self._depois_sql)
+        before_render_template.connect(self._antes_template, app)
+        template_rendered.connect(self._depois_template, app)
+        app.extensions['metricas'] = self
+
+    def adicionar_medidor(self, nome, ajuda, funcao, rotulos, tipo='gauge'):
+        """Valores lidos na hora da exportação: `funcao()` devolve {chave: valor}."""
+        self.medidores[nome] = (ajuda, funcao, rotulos, tipo)
+
+    def orcamento(self, consultas):
+        """Decorator das rotas: troca o SQL_QUERY_BUDGET pelo limite da rota nesta requisição."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                atual = self._atual()
+                if atual is not None:
+                    atual['orcamento'] = consultas
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # --- Coleta ---
+    def _inicio(self):
+        g.metricas = {'inicio': time.perf_counter(), 'sql': 0, 'sql_segundos': 0.0,
+                      'template_segundos': 0.0, 'templates': []}
+
+    def _atual(self):
+        return g.get('metricas') if has_request_context() else None
+
+    def _antes_sql(self, conn, cursor, statement, parameters, context, executemany):
+        if self._atual() is not None:
+            conn.info.setdefault('metricas_inicio', []).append(time.perf_counter())
+
+    def _depois_sql(self, conn, cursor, statement, parameters, context, executemany):
+        atual = self._atual()
+        inicios = conn.info.get('metricas_inicio')
+        if atual is None or not inicios:
+            return
+        atual['sql'] += 1
+        atual['sql_segundos'] += time.perf_counter() - inicios.pop()
+
+    def _antes_template(self, app, template, context, **extra):
+        atual = self._atual()
+        if atual is not None:
+            atual['templates'].append(time.perf_counter())
+
+    def _depois_template(self, app, template, context, **extra):
+        atual = self._atual()
+        if atual is not None and atual['templates']:
+            duracao = time.perf_counter() - atual['templates'].pop()
+            # Templates renderizados dentro de outro não contam duas vezes
+            if not atual['templates']:
+                atual['template_segundos'] += duracao
+
+    def _fim(self, resposta):
+        atual = g.pop('metricas', None)
+        if atual is None:
+            return resposta
+        duracao = time.perf_counter() - atual['inicio']
+        rota = request.url_rule.rule if request.url_rule else 'sem_rota'
+        tamanho = resposta.content_length or 0
+
+        with self._lock:
+            self.latencia[(rota, request.method)].observar(duracao)
+            self.consultas_por_requisicao[rota].observar(atual['sql'])
+            self.requisicoes[(rota, request.method, resposta.status_code)] += 1
+            self.sql_consultas[rota] += atual['sql']
+            self.sql_segundos[rota] += atual['sql_segundos']
+            self.template_segundos[rota] += atual['template_segundos']
+            self.bytes_enviados[rota] += tamanho
+
+        # SQL_QUERY_BUDGET = 0 desliga o aviso em todas as rotas
+        orcamento = self.app.config['SQL_QUERY_BUDGET'] and atual.get('orcamento', self.app.config['SQL_QUERY_BUDGET'])
+        if orcamento and atual['sql'] > orcamento:
+            with self._lock:
+                self.orcamento_excedido[rota] += 1
+            self.app.logger.warning(
+                "ORÇAMENTO DE CONSULTAS EXCEDIDO: %s %s fez %d consultas SQL (limite %d, %.1f ms no banco)",
+                request.method, request.full_path.rstrip('?'), atual['sql'], orcamento,
+                atual['sql_segundos'] * 1000)
+        return resposta
+
+    # --- Exportação ---
+    def exportar(self):
+        linhas = []
+        # Lidos fora do lock: as funções podem consultar os pools do banco
+        lidos = {nome: (ajuda, funcao(), rotulos, tipo)
+                 for nome, (ajuda, funcao, rotulos, tipo) in self.medidores.items()}
+
+        def contador(nome, ajuda, valores, rotulos, tipo='counter'):
+            linhas.append(f'# HELP {nome} {ajuda}')
+            linhas.append(f'# TYPE {nome} {tipo}')
+            for chave, valor in sorted(valores.items()):
+                chave = chave if isinstance(chave, tuple) else (chave,)
+                linhas.append(f'{nome}{_rotulos(**dict(zip(rotulos, chave)))} {valor}')
+
+        def histograma(nome, ajuda, valores, rotulos):
+            linhas.append(f'# HELP {nome} {ajuda}')
+            linhas.append(f'# TYPE {nome} histogram')
+            for chave, hist in sorted(valores.items()):
+                chave = chave if isinstance(chave, tuple) else (chave,)
+                base = dict(zip(rotulos, chave))
+                for limite, quantidade in zip(hist.buckets, hist.contagens):
+                    linhas.append(f'{nome}_bucket{_rotulos(**base, le=limite)} {quantidade}')
+                linhas.append(f'{nome}_bucket{_rotulos(**base, le="+Inf")} {hist.total}')
+                linhas.append(f'{nome}_sum{_rotulos(**base)} {hist.soma}')
+                linhas.append(f'{nome}_count{_rotulos(**base)} {hist.total}')
+
+        with self._lock:
+            histograma('honoriel_http_request_duration_seconds', 'Latência das requisições por rota.',
+                       self.latencia, ('rota', 'metodo'))
+            contador('honoriel_http_requests_total', 'Requisições por rota, método e status.',
+                     self.requisicoes, ('rota', 'metodo', 'status'))
+            histograma('honoriel_sql_queries_per_request', 'Consultas SQL por requisição.',
+                       self.consultas_por_requisicao, ('rota',))
+            contador('honoriel_sql_queries_total', 'Consultas SQL executadas.',
+                     self.sql_consultas, ('rota',))
+            contador('honoriel_sql_duration_seconds_total', 'Tempo gasto em consultas SQL.',
+                     self.sql_segundos, ('rota',))
+            contador('honoriel_template_render_seconds_total', 'Tempo de renderização dos templates.',
+                     self.template_segundos, ('rota',))
+            contador('honoriel_response_bytes_total', 'Bytes enviados no corpo das respostas.',
+                     self.bytes_enviados, ('rota',))
+            contador('honoriel_sql_query_budget_exceeded_total',
+                     'Requisições acima do orçamento de consultas (SQL_QUERY_BUDGET).',
+                     self.orcamento_excedido, ('rota',))
+        for nome, (ajuda, valores, rotulos, tipo) in sorted(lidos.items()):
+            contador(nome, ajuda, valores, rotulos, tipo)
+        return '\n'.join(linhas) + '\n'
+
+    def limpar(self):
+        with self._lock:
+            self._resetar()
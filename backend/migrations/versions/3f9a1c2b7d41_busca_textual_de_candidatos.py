@@ -0,0 +1,63 @@
+"""busca textual de candidatos
+
+Revision ID: 3f9a1c2b7d41
+Revises: 
+Create Date: 2026-10-18 09:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2b7d41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+
+    if is_postgres:
+        # Configuração de busca em português, sem acentos
+        op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+        op.execute("""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'pt_unaccent') THEN
+                    CREATE TEXT SEARCH CONFIGURATION pt_unaccent (COPY = portuguese);
+                    ALTER TEXT SEARCH CONFIGURATION pt_unaccent
+                        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+                END IF;
+            END
+            $$;
+        """)
+
+    op.create_table(
+        'pessoa_busca',
+        sa.Column('pessoa_id', sa.Integer(), nullable=False),
+        sa.Column('peso_a', sa.Text(), nullable=True),
+        sa.Column('peso_b', sa.Text(), nullable=True),
+        sa.Column('peso_c', sa.Text(), nullable=True),
+        sa.Column('documento', sa.Text().with_variant(postgresql.TSVECTOR(), 'postgresql'), nullable=True),
+        sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['pessoa_id'], ['pessoa.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('pessoa_id')
+    )
+    op.create_index('ix_pessoa_busca_atualizado_em', 'pessoa_busca', ['atualizado_em'], unique=False)
+    if is_postgres:
+        op.create_index('ix_pessoa_busca_documento', 'pessoa_busca', ['documento'], unique=False,
+                        postgresql_using='gin')
+
+    # Depois de migrar, rode `flask reindexar-busca` para preencher os documentos existentes.
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.drop_index('ix_pessoa_busca_documento', table_name='pessoa_busca', postgresql_using='gin')
+    op.drop_index('ix_pessoa_busca_atualizado_em', table_name='pessoa_busca')
+    op.drop_table('pessoa_busca')
@@ -0,0 +1,60 @@
+"""indices trigram e de ordenacao
+
+Revision ID: 8c2e4d6a9b13
+Revises: 3f9a1c2b7d41
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2e4d6a9b13'
+down_revision = '3f9a1c2b7d41'
+branch_labels = None
+depends_on = None
+
+# (nome, tabela, colunas)
+INDICES_BTREE = [
+    ('ix_candidatura_pessoa_id', 'candidatura', ['pessoa_id']),
+    ('ix_candidatura_data_candidatura_id', 'candidatura', ['data_candidatura', 'id']),
+    ('ix_post_data_publicacao', 'post', ['data_publicacao']),
+    ('ix_especialista_ativo_ordem', 'especialista', ['ativo', 'ordem']),
+]
+
+# (nome, tabela, coluna) - GIN com gin_trgm_ops, para ILIKE '%termo%'
+INDICES_TRIGRAM = [
+    ('ix_pessoa_nome_completo_trgm', 'pessoa', 'nome_completo'),
+    ('ix_pessoa_email_trgm', 'pessoa', 'email'),
+    ('ix_candidatura_vaga_objetivo_trgm', 'candidatura', 'vaga_objetivo'),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        for nome, tabela, colunas in INDICES_BTREE:
+            op.create_index(nome, tabela, colunas, unique=False)
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY não bloqueia as escritas nas tabelas já populadas,
+    # mas não pode rodar dentro de uma transação.
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES_BTREE:
+            op.create_index(nome, tabela, colunas, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+        for nome, tabela, coluna in INDICES_TRIGRAM:
+            op.create_index(nome, tabela, [coluna], unique=False,
+                            postgresql_using='gin', postgresql_ops={coluna: 'gin_trgm_ops'},
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for nome, tabela, coluna in INDICES_TRIGRAM:
+            op.drop_index(nome, table_name=tabela)
+    for nome, tabela, colunas in INDICES_BTREE:
+        op.drop_index(nome, table_name=tabela)
@@ -0,0 +1,41 @@
+"""exclusao em lote
+
+Revision ID: a5d19c3e7f42
+Revises: e93b5a17d2c4
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5d19c3e7f42'
+down_revision = 'e93b5a17d2c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'exclusao_lote',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('anteriores_a', sa.DateTime(), nullable=True),
+        sa.Column('filtro_por', sa.String(length=20), nullable=True),
+        sa.Column('termo_busca', sa.String(length=255), nullable=True),
+        sa.Column('remover_pessoas', sa.Boolean(), nullable=False),
+        sa.Column('solicitado_por', sa.String(length=80), nullable=True),
+        sa.Column('candidaturas_excluidas', sa.Integer(), nullable=False),
+        sa.Column('pessoas_excluidas', sa.Integer(), nullable=False),
+        sa.Column('arquivos_removidos', sa.Integer(), nullable=False),
+        sa.Column('erro', sa.Text(), nullable=True),
+        sa.Column('criado_em', sa.DateTime(), nullable=False),
+        sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+        sa.Column('concluido_em', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('exclusao_lote')
@@ -0,0 +1,29 @@
+"""token de envio
+
+Revision ID: a9e3c6d15f28
+Revises: d3a7b5e91c04
+Create Date: 2026-10-18 19:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9e3c6d15f28'
+down_revision = 'd3a7b5e91c04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Candidaturas antigas ficam com NULL (não conflitam no índice único)
+    with op.batch_alter_table('candidatura', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_envio', sa.String(length=32), nullable=True))
+        batch_op.create_index('ix_candidatura_token_envio', ['token_envio'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('candidatura', schema=None) as batch_op:
+        batch_op.drop_index('ix_candidatura_token_envio')
+        batch_op.drop_column('token_envio')
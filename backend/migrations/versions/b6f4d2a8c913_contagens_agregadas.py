@@ -0,0 +1,33 @@
+"""contagens agregadas
+
+Revision ID: b6f4d2a8c913
+Revises: a9e3c6d15f28
+Create Date: 2026-10-18 20:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6f4d2a8c913'
+down_revision = 'a9e3c6d15f28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Preenchida pelo `flask reconstruir-estatisticas` (rode uma vez depois do upgrade)
+    op.create_table(
+        'contagem_agregada',
+        sa.Column('dimensao', sa.String(length=20), nullable=False),
+        sa.Column('chave', sa.String(length=255), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('dimensao', 'chave')
+    )
+    op.create_index('ix_contagem_agregada_dimensao_total', 'contagem_agregada', ['dimensao', 'total'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_contagem_agregada_dimensao_total', table_name='contagem_agregada')
+    op.drop_table('contagem_agregada')
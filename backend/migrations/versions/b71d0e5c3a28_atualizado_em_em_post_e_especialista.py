@@ -0,0 +1,36 @@
+"""atualizado_em em post e especialista
+
+Revision ID: b71d0e5c3a28
+Revises: 8c2e4d6a9b13
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71d0e5c3a28'
+down_revision = '8c2e4d6a9b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('atualizado_em', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('especialista', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('atualizado_em', sa.DateTime(), nullable=True))
+
+    # Registros existentes: usa a data de publicação do post / o momento da migração
+    op.execute("UPDATE post SET atualizado_em = data_publicacao WHERE atualizado_em IS NULL")
+    op.execute("UPDATE especialista SET atualizado_em = CURRENT_TIMESTAMP WHERE atualizado_em IS NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('especialista', schema=None) as batch_op:
+        batch_op.drop_column('atualizado_em')
+
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.drop_column('atualizado_em')
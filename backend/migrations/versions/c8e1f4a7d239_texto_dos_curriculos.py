@@ -0,0 +1,44 @@
+"""texto dos curriculos
+
+Revision ID: c8e1f4a7d239
+Revises: f2c6e8a41b95
+Create Date: 2026-10-18 17:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e1f4a7d239'
+down_revision = 'f2c6e8a41b95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Os PDFs já enviados entram na fila com `flask extrair-curriculos`
+    op.create_table(
+        'texto_curriculo',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('arquivo', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('texto', sa.Text(), nullable=True),
+        sa.Column('paginas', sa.Integer(), nullable=True),
+        sa.Column('tentativas', sa.Integer(), nullable=False),
+        sa.Column('lote', sa.String(length=32), nullable=True),
+        sa.Column('processando_desde', sa.DateTime(), nullable=True),
+        sa.Column('erro', sa.Text(), nullable=True),
+        sa.Column('criado_em', sa.DateTime(), nullable=False),
+        sa.Column('extraido_em', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('arquivo')
+    )
+    op.create_index('ix_texto_curriculo_lote', 'texto_curriculo', ['lote'], unique=False)
+    op.create_index('ix_texto_curriculo_status', 'texto_curriculo', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_texto_curriculo_status', table_name='texto_curriculo')
+    op.drop_index('ix_texto_curriculo_lote', table_name='texto_curriculo')
+    op.drop_table('texto_curriculo')
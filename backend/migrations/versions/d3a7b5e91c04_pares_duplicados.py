@@ -0,0 +1,42 @@
+"""pares duplicados
+
+Revision ID: d3a7b5e91c04
+Revises: c8e1f4a7d239
+Create Date: 2026-10-18 18:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7b5e91c04'
+down_revision = 'c8e1f4a7d239'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Preenchida pelo `flask detectar-duplicados`
+    op.create_table(
+        'par_duplicado',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('pessoa_id', sa.Integer(), nullable=False),
+        sa.Column('duplicata_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('motivos', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('detectado_em', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['pessoa_id'], ['pessoa.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['duplicata_id'], ['pessoa.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('pessoa_id', 'duplicata_id', name='uq_par_duplicado_pessoas')
+    )
+    op.create_index('ix_par_duplicado_duplicata_id', 'par_duplicado', ['duplicata_id'], unique=False)
+    op.create_index('ix_par_duplicado_status_score', 'par_duplicado', ['status', 'score'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_par_duplicado_status_score', table_name='par_duplicado')
+    op.drop_index('ix_par_duplicado_duplicata_id', table_name='par_duplicado')
+    op.drop_table('par_duplicado')
@@ -0,0 +1,45 @@
+"""fila de e-mails
+
+Revision ID: d4a8f2e61c07
+Revises: b71d0e5c3a28
+Create Date: 2026-10-18 12:02:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8f2e61c07'
+down_revision = 'b71d0e5c3a28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'email_pendente',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('assunto', sa.String(length=255), nullable=False),
+        sa.Column('remetente', sa.String(length=150), nullable=True),
+        sa.Column('destinatarios', sa.Text(), nullable=False),
+        sa.Column('html', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('tentativas', sa.Integer(), nullable=False),
+        sa.Column('proxima_tentativa', sa.DateTime(), nullable=False),
+        sa.Column('lote', sa.String(length=32), nullable=True),
+        sa.Column('enviando_desde', sa.DateTime(), nullable=True),
+        sa.Column('ultimo_erro', sa.Text(), nullable=True),
+        sa.Column('criado_em', sa.DateTime(), nullable=False),
+        sa.Column('enviado_em', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_email_pendente_lote', 'email_pendente', ['lote'], unique=False)
+    op.create_index('ix_email_pendente_status_proxima_tentativa', 'email_pendente',
+                    ['status', 'proxima_tentativa'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_email_pendente_status_proxima_tentativa', table_name='email_pendente')
+    op.drop_index('ix_email_pendente_lote', table_name='email_pendente')
+    op.drop_table('email_pendente')
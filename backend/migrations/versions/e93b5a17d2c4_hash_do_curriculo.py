@@ -0,0 +1,30 @@
+"""hash do curriculo
+
+Revision ID: e93b5a17d2c4
+Revises: d4a8f2e61c07
+Create Date: 2026-10-18 13:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e93b5a17d2c4'
+down_revision = 'd4a8f2e61c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('candidatura', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('curriculo_sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_candidatura_curriculo_sha256', ['curriculo_sha256'], unique=False)
+        batch_op.create_index('ix_candidatura_curriculo_pdf_path', ['curriculo_pdf_path'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('candidatura', schema=None) as batch_op:
+        batch_op.drop_index('ix_candidatura_curriculo_pdf_path')
+        batch_op.drop_index('ix_candidatura_curriculo_sha256')
+        batch_op.drop_column('curriculo_sha256')
@@ -0,0 +1,33 @@
+"""metadados dos posts
+
+Revision ID: f2c6e8a41b95
+Revises: a5d19c3e7f42
+Create Date: 2026-10-18 16:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6e8a41b95'
+down_revision = 'a5d19c3e7f42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Os valores dos posts existentes são calculados em Python: rode `flask preencher-resumos`
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resumo', sa.String(length=200), nullable=True))
+        batch_op.add_column(sa.Column('texto_puro', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('palavras', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('tempo_leitura', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.drop_column('tempo_leitura')
+        batch_op.drop_column('palavras')
+        batch_op.drop_column('texto_puro')
+        batch_op.drop_column('resumo')
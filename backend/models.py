@@ -0,0 +1,273 @@
+# =======================================================
+# MODELS
+# =======================================================
+
+from datetime import datetime
+
+from flask_login import UserMixin
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from extensoes import db
+
+# --- DICIONÁRIOS GLOBAIS ---
+ESPECIALISTA_AREAS = {
+    'psicologia': 'Psicologia',
+    'direito': 'Direito',
+    'desenvolvimento': 'Desenvolvimento',
+    'medicina': 'Medicina',
+    'nutricao': 'Nutrição',
+    'financeiro': 'Finança',
+    'contabilidade': 'Contabilidade', # Adicione mais áreas conforme necessário
+    'outro': 'Outro'
+}
+
+# Dicionário que mapeia a chave da área para a classe do ícone.
+AREA_ICONS = {
+    'psicologia': 'fa-solid fa-brain',
+    'direito': 'fa-solid fa-gavel',
+    'desenvolvimento': 'fa-solid fa-code',
+    'medicina': 'fa-solid fa-user-doctor',
+    'nutricao': 'fa-solid fa-apple-whole',
+    'financeiro': 'fa-solid fa-money-bill-trend-up',
+    'contabilidade': 'fa-solid fa-calculator',
+    'outro': 'fa-solid fa-handshake' # Ícone padrão
+}
+
+
+# --- MODELS ---
+class Pessoa(db.Model):
+    __tablename__ = 'pessoa' # Nome da tabela no banco
+    id = db.Column(db.Integer, primary_key=True)
+    nome_completo = db.Column(db.String(150), nullable=False)
+    bairro = db.Column(db.String(100))
+    cidade = db.Column(db.String(100))
+    uf = db.Column(db.String(2))
+    telefone1 = db.Column(db.String(20))
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    linkedin_url = db.Column(db.String(200))
+    
+    competencias_tecnicas = db.Column(db.Text)
+
+    __table_args__ = (
+        # Índices trigram para as buscas '%termo%' do admin (só PostgreSQL, exigem pg_trgm)
+        db.Index('ix_pessoa_nome_completo_trgm', 'nome_completo',
+                 postgresql_using='gin', postgresql_ops={'nome_completo': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        db.Index('ix_pessoa_email_trgm', 'email',
+                 postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
+
+    # A ordem vem do banco: candidaturas da mais recente para a mais antiga, o resto na ordem de cadastro
+    candidaturas = db.relationship('Candidatura', backref='pessoa', lazy=True, cascade="all, delete-orphan",
+                                   order_by='(Candidatura.data_candidatura.desc(), Candidatura.id.desc())')
+    formacoes = db.relationship('Formacao', backref='pessoa', lazy=True, cascade="all, delete-orphan",
+                                order_by='Formacao.id')
+    experiencias = db.relationship('Experiencia', backref='pessoa', lazy=True, cascade="all, delete-orphan",
+                                   order_by='Experiencia.id')
+    idiomas = db.relationship('Idioma', backref='pessoa', lazy=True, cascade="all, delete-orphan",
+                              order_by='Idioma.id')
+    cursos = db.relationship('Curso', backref='pessoa', lazy=True, cascade="all, delete-orphan",
+                             order_by='Curso.id')
+    indice_busca = db.relationship('PessoaBusca', uselist=False, lazy=True, cascade="all, delete-orphan")
+    
+class Candidatura(db.Model):
+    __tablename__ = 'candidatura' # Nome da tabela no banco
+    id = db.Column(db.Integer, primary_key=True)
+    vaga_objetivo = db.Column(db.String(255), nullable=False)
+    resumo_profissional = db.Column(db.Text, nullable=True)
+    curriculo_pdf_path = db.Column(db.String(255), index=True)
+    curriculo_sha256 = db.Column(db.String(64), index=True) # Mesmo PDF = mesmo arquivo no disco
+    data_candidatura = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Token do formulário (campo oculto): reenviar o mesmo formulário não cria outra candidatura
+    token_envio = db.Column(db.String(32), unique=True, index=True)
+    
+    # A "ponte" que liga esta candidatura a uma pessoa
+    pessoa_id = db.Column(db.Integer, db.ForeignKey('pessoa.id'), nullable=False, index=True)
+
+    __table_args__ = (
+        # Ordenação/paginação por keyset do admin (data_candidatura, id)
+        db.Index('ix_candidatura_data_candidatura_id', 'data_candidatura', 'id'),
+        db.Index('ix_candidatura_vaga_objetivo_trgm', 'vaga_objetivo',
+                 postgresql_using='gin', postgresql_ops={'vaga_objetivo': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
+
+class Formacao(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    curso = db.Column(db.String(150), nullable=False)
+    instituicao = db.Column(db.String(150), nullable=False)
+    ano_conclusao = db.Column(db.String(10))
+    conclusao_prevista = db.Column(db.String(10))
+    pessoa_id = db.Column(db.Integer, db.ForeignKey('pessoa.id'), nullable=False)
+
+class Experiencia(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    empresa = db.Column(db.String(150), nullable=False)
+    cargo = db.Column(db.String(150), nullable=False)
+    data_inicio = db.Column(db.String(20))
+    data_fim = db.Column(db.String(20))
+    atividades = db.Column(db.Text)
+    pessoa_id = db.Column(db.Integer, db.ForeignKey('pessoa.id'), nullable=False)
+
+class Idioma(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(50), nullable=False)
+    nivel = db.Column(db.String(50), nullable=False)
+    pessoa_id = db.Column(db.Integer, db.ForeignKey('pessoa.id'), nullable=False)
+
+class Curso(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(150), nullable=False)
+    instituicao = db.Column(db.String(150))
+    carga_horaria = db.Column(db.String(20))
+    ano_conclusao = db.Column(db.String(10))
+    pessoa_id = db.Column(db.Integer, db.ForeignKey('pessoa.id'), nullable=False)
+
+class PessoaBusca(db.Model):
+    # Documento de busca textual da Pessoa (mantido em sincronia pelo cadastro_curriculo)
+    __tablename__ = 'pessoa_busca'
+    pessoa_id = db.Column(db.Integer, db.ForeignKey('pessoa.id', ondelete='CASCADE'), primary_key=True)
+    peso_a = db.Column(db.Text) # Competências e cargos
+    peso_b = db.Column(db.Text) # Formação, cursos e empresas
+    peso_c = db.Column(db.Text) # Atividades e resumos
+    documento = db.Column(db.Text().with_variant(TSVECTOR(), 'postgresql')) # Só é preenchido no PostgreSQL
+    atualizado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        db.Index('ix_pessoa_busca_documento', 'documento', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+
+class Post(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    titulo = db.Column(db.String(200), nullable=False)
+    conteudo = db.Column(db.Text, nullable=False)
+    autor = db.Column(db.String(100), nullable=True, default='Equipe Honoriel')
+    data_publicacao = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    atualizado_em = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+    imagem_destaque_path = db.Column(db.String(255), nullable=True)
+    # Derivados do conteúdo, gravados pelo admin (blog.preencher_metadados)
+    resumo = db.Column(db.String(200), nullable=True)
+    texto_puro = db.deferred(db.Column(db.Text, nullable=True))
+    palavras = db.Column(db.Integer, nullable=True)
+    tempo_leitura = db.Column(db.Integer, nullable=True)  # minutos
+
+    def __repr__(self):
+        return f"Post('{self.titulo}', '{self.data_publicacao}')"
+    
+class Especialista(db.Model):
+    __tablename__ = 'especialista'
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(150), nullable=False)
+    titulo = db.Column(db.String(150), nullable=False)
+    foto_path = db.Column(db.String(255), nullable=True)    
+    bio_intro = db.Column(db.Text, nullable=True)     # "Especialista em gestão..."
+    bio_lista_titulo = db.Column(db.String(255), nullable=True) # "Nossa expertise elimina..."
+    bio_lista_itens = db.Column(db.Text, nullable=True) # Os itens da lista, um por linha
+    bio_conclusao = db.Column(db.Text, nullable=True) # "Oferecemos um serviço..."
+    contato_whatsapp = db.Column(db.String(50), nullable=True)
+    contato_email = db.Column(db.String(150), nullable=True)
+    contato_linkedin = db.Column(db.String(255), nullable=True) # Para a URL completa
+    contato_instagram = db.Column(db.String(100), nullable=True) # Apenas para o @usuario
+    contato_extra = db.Column(db.String(150), nullable=True) # "Atendimento a todo o Brasil"
+    ativo = db.Column(db.Boolean, default=True, nullable=False)
+    ordem = db.Column(db.Integer, default=0)    
+    area = db.Column(db.String(50), nullable=False, default='outro')
+    atualizado_em = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_especialista_ativo_ordem', 'ativo', 'ordem'),
+    )
+
+    def __repr__(self):
+        return f'<Especialista {self.nome}>'
+
+class EmailPendente(db.Model):
+    # Outbox: e-mails gravados pelas rotas e enviados em segundo plano pela FilaEmail
+    __tablename__ = 'email_pendente'
+    id = db.Column(db.Integer, primary_key=True)
+    assunto = db.Column(db.String(255), nullable=False)
+    remetente = db.Column(db.String(150))
+    destinatarios = db.Column(db.Text, nullable=False) # Separados por vírgula
+    html = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pendente') # pendente, enviando, enviado, falhou
+    tentativas = db.Column(db.Integer, nullable=False, default=0)
+    proxima_tentativa = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    lote = db.Column(db.String(32), index=True) # Reserva do worker que está enviando
+    enviando_desde = db.Column(db.DateTime)
+    ultimo_erro = db.Column(db.Text)
+    criado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    enviado_em = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_email_pendente_status_proxima_tentativa', 'status', 'proxima_tentativa'),
+    )
+
+class TextoCurriculo(db.Model):
+    # Texto extraído de cada PDF de currículo pela FilaCurriculos (um por arquivo, que é deduplicado por hash)
+    __tablename__ = 'texto_curriculo'
+    id = db.Column(db.Integer, primary_key=True)
+    arquivo = db.Column(db.String(255), nullable=False, unique=True) # Candidatura.curriculo_pdf_path
+    status = db.Column(db.String(20), nullable=False, default='pendente', index=True) # pendente, processando, concluido, falhou
+    texto = db.deferred(db.Column(db.Text))
+    paginas = db.Column(db.Integer)
+    tentativas = db.Column(db.Integer, nullable=False, default=0)
+    lote = db.Column(db.String(32), index=True) # Reserva do processo que está extraindo
+    processando_desde = db.Column(db.DateTime)
+    erro = db.Column(db.Text)
+    criado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    extraido_em = db.Column(db.DateTime)
+
+class User(db.Model, UserMixin):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(150), unique=True, nullable=False)
+    password_hash = db.Column(db.String(60), nullable=False)
+
+    def __repr__(self):
+        return f"User('{self.username}')"
+
+class ExclusaoLote(db.Model):
+    # Exclusão em lote/retenção (LGPD) de candidaturas, executada pela extensão Retencao
+    __tablename__ = 'exclusao_lote'
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default='pendente') # pendente, executando, concluida, falhou
+    anteriores_a = db.Column(db.DateTime) # Candidaturas com data_candidatura anterior a esta
+    filtro_por = db.Column(db.String(20)) # 'pessoa' ou 'candidatura', como na listagem do admin
+    termo_busca = db.Column(db.String(255))
+    remover_pessoas = db.Column(db.Boolean, nullable=False, default=True) # Pessoas que ficarem sem candidaturas
+    solicitado_por = db.Column(db.String(80))
+    candidaturas_excluidas = db.Column(db.Integer, nullable=False, default=0)
+    pessoas_excluidas = db.Column(db.Integer, nullable=False, default=0)
+    arquivos_removidos = db.Column(db.Integer, nullable=False, default=0)
+    erro = db.Column(db.Text)
+    criado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    atualizado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow) # Batimento a cada lote
+    concluido_em = db.Column(db.DateTime)
+
+class ParDuplicado(db.Model):
+    # Possível duplicata encontrada pelo `flask detectar-duplicados` (pessoa_id < duplicata_id)
+    __tablename__ = 'par_duplicado'
+    id = db.Column(db.Integer, primary_key=True)
+    pessoa_id = db.Column(db.Integer, db.ForeignKey('pessoa.id', ondelete='CASCADE'), nullable=False)
+    duplicata_id = db.Column(db.Integer, db.ForeignKey('pessoa.id', ondelete='CASCADE'), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)
+    motivos = db.Column(db.String(255)) # Ex.: "telefone, nome e cidade"
+    status = db.Column(db.String(20), nullable=False, default='pendente') # pendente, ignorado
+    detectado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    pessoa = db.relationship('Pessoa', foreign_keys=[pessoa_id])
+    duplicata = db.relationship('Pessoa', foreign_keys=[duplicata_id])
+
+    __table_args__ = (
+        db.UniqueConstraint('pessoa_id', 'duplicata_id', name='uq_par_duplicado_pessoas'),
+        db.Index('ix_par_duplicado_status_score', 'status', 'score'),
+    )
+
+class ContagemAgregada(db.Model):
+    # Contagens do painel do admin, mantidas a cada gravação (ver estatisticas.py)
+    __tablename__ = 'contagem_agregada'
+    dimensao = db.Column(db.String(20), primary_key=True) # dia, vaga, uf, cidade, idioma, total
+    chave = db.Column(db.String(255), primary_key=True)   # Ex.: '2026-10-18', 'Analista de RH', 'PR'
+    total = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Maiores contagens de cada dimensão (gráficos do painel)
+        db.Index('ix_contagem_agregada_dimensao_total', 'dimensao', 'total'),
+    )
@@ -0,0 +1,65 @@
+# =======================================================
+# EXTRAÇÃO DE TEXTO DOS PDFs (EXECUTADA NOS PROCESSOS DO POOL)
+# =======================================================
+# Este módulo roda dentro dos processos filhos da FilaCurriculos, e não nas
+# threads das requisições. Por isso só importa a biblioteca padrão no topo:
+# cada processo novo (spawn) carrega apenas isto e o pypdf.
+#
+# Os limites valem por processo: o tempo de cada arquivo é cortado por um
+# alarme (SIGALRM) e a memória pelo RLIMIT_AS. Um PDF malformado que estoura a
+# memória vira MemoryError só naquele arquivo. No Windows (sem signal.setitimer
+# e sem o módulo resource) esses limites não existem, e quem corta o tempo é o
+# prazo do lado da fila.
+
+import signal
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class TempoEsgotado(BaseException):
+    """BaseException: o pypdf captura Exception em vários pontos e engoliria o alarme."""
+
+
+def _alarme(signum, frame):
+    raise TempoEsgotado()
+
+
+def iniciar_processo(memoria_mb):
+    """Initializer do pool: limita a memória do processo e ignora o Ctrl+C (quem encerra é o pai)."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if resource is not None and memoria_mb:
+        limite = memoria_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limite, limite))
+
+
+def extrair_texto(caminho, timeout, max_caracteres):
+    """(texto, páginas) do PDF, limitado a `max_caracteres` e a `timeout` segundos."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("A extração de texto requer o pacote 'pypdf' (pip install pypdf).")
+
+    com_alarme = hasattr(signal, 'setitimer')
+    if com_alarme:
+        signal.signal(signal.SIGALRM, _alarme)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        leitor = PdfReader(caminho)
+        partes = []
+        tamanho = 0
+        for pagina in leitor.pages:
+            texto = pagina.extract_text() or ''
+            partes.append(texto)
+            tamanho += len(texto)
+            if tamanho >= max_caracteres:
+                break
+        texto = '\n'.join(partes).replace('\x00', '').strip()
+        return texto[:max_caracteres], len(leitor.pages)
+    except TempoEsgotado:
+        raise TimeoutError(f"Extração interrompida após {timeout}s.")
+    finally:
+        if com_alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)
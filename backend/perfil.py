@@ -0,0 +1,88 @@
+# =======================================================
+# PERFIL DO CANDIDATO (detalhe_candidato)
+# =======================================================
+# O perfil é carregado num número fixo de consultas: a Pessoa e um SELECT ... IN
+# por coleção (selectinload), já ordenadas pelo banco (order_by dos
+# relacionamentos). O resultado vira um "snapshot" (dicionários simples) que o
+# template renderiza e que, com PERFIL_CACHE_TTL > 0, fica guardado no backend
+# do cache de páginas. Cada Pessoa tem a sua versão no cache: o cadastro de
+# currículo e as exclusões chamam invalidar_perfil() depois do commit.
+#
+# Com o backend 'memoria', a invalidação vale só para o processo que a fez:
+# com vários workers, use o Redis (ou um TTL curto).
+
+import json
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy.orm import selectinload
+
+from extensoes import cache_paginas
+from models import Pessoa
+
+CAMPOS_PESSOA = ('id', 'nome_completo', 'email', 'telefone1', 'bairro', 'cidade', 'uf', 'linkedin_url',
+                 'competencias_tecnicas')
+CAMPOS_COLECOES = {
+    'candidaturas': ('id', 'vaga_objetivo', 'resumo_profissional', 'curriculo_pdf_path', 'data_candidatura'),
+    'formacoes': ('curso', 'instituicao', 'ano_conclusao', 'conclusao_prevista'),
+    'experiencias': ('empresa', 'cargo', 'data_inicio', 'data_fim', 'atividades'),
+    'idiomas': ('nome', 'nivel'),
+    'cursos': ('nome', 'instituicao', 'carga_horaria', 'ano_conclusao'),
+}
+
+
+def carregar_pessoa(pessoa_id):
+    """Pessoa com todas as coleções do perfil: 1 + 5 consultas, qualquer que seja o tamanho do histórico."""
+    return (Pessoa.query
+            .options(*(selectinload(getattr(Pessoa, colecao)) for colecao in CAMPOS_COLECOES))
+            .filter_by(id=pessoa_id)
+            .first())
+
+
+def montar_snapshot(pessoa):
+    snapshot = {campo: getattr(pessoa, campo) for campo in CAMPOS_PESSOA}
+    for colecao, campos in CAMPOS_COLECOES.items():
+        snapshot[colecao] = [{campo: getattr(item, campo) for campo in campos} for item in getattr(pessoa, colecao)]
+    return snapshot
+
+
+def _serializar(snapshot):
+    return json.dumps(snapshot, default=lambda valor: valor.isoformat()).encode('utf-8')
+
+
+def _desserializar(valor):
+    snapshot = json.loads(valor)
+    for candidatura in snapshot['candidaturas']:
+        candidatura['data_candidatura'] = datetime.fromisoformat(candidatura['data_candidatura'])
+    return snapshot
+
+
+def _ttl():
+    return current_app.config.get('PERFIL_CACHE_TTL', 0) if cache_paginas.backend is not None else 0
+
+
+def snapshot_perfil(pessoa_id):
+    """Snapshot do perfil (do cache, se ligado), ou None se a Pessoa não existe."""
+    ttl = _ttl()
+    if ttl:
+        backend = cache_paginas.backend
+        chave = f"perfil:{pessoa_id}:{backend.versao(f'perfil:{pessoa_id}')}"
+        guardado = backend.get(chave)
+        if guardado is not None:
+            return _desserializar(guardado)
+
+    pessoa = carregar_pessoa(pessoa_id)
+    if pessoa is None:
+        return None
+    snapshot = montar_snapshot(pessoa)
+    if ttl:
+        backend.set(chave, _serializar(snapshot), ttl)
+    return snapshot
+
+
+def invalidar_perfil(*pessoa_ids):
+    """Chamado depois do commit que altera (ou exclui) as Pessoas."""
+    if not _ttl():
+        return
+    for pessoa_id in pessoa_ids:
+        cache_paginas.backend.incrementar(f'perfil:{pessoa_id}')
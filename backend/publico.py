@@ -0,0 +1,447 @@
+# =======================================================
+# BLUEPRINT 'public': SITE INSTITUCIONAL, BLOG E CANDIDATURAS
+# =======================================================
+
+
+import re
+import uuid
+
+from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+
+import estatisticas
+from banco import ler_da_replica
+from cache import condicional
+from extensoes import cache_paginas, db, fila_curriculos, fila_email, limitador, metricas, motor_busca
+from formulario import ColecaoFormulario
+from models import AREA_ICONS, Candidatura, Curso, Especialista, Experiencia, Formacao, Idioma, Pessoa, Post
+from perfil import invalidar_perfil
+from uploads import UploadMuitoGrande, allowed_file, salvar_por_conteudo
+
+bp = Blueprint('public', __name__)
+
+
+# --- COLEÇÕES DO FORMULÁRIO DE CURRÍCULO ---
+# atributo do modelo -> campo do formulário (o primeiro define a quantidade de linhas)
+COLECOES_CURRICULO = [
+    ColecaoFormulario(Formacao, 'formacoes', {
+        'curso': 'form_curso[]',
+        'instituicao': 'form_instituicao[]',
+        'ano_conclusao': 'form_ano_conclusao[]',
+        'conclusao_prevista': 'form_conclusao_prevista[]',
+    }),
+    ColecaoFormulario(Experiencia, 'experiencias', {
+        'empresa': 'exp_empresa[]',
+        'cargo': 'exp_cargo[]',
+        'data_inicio': 'exp_data_inicio[]',
+        'data_fim': 'exp_data_fim[]',
+        'atividades': 'exp_atividades[]',
+    }),
+    ColecaoFormulario(Idioma, 'idiomas', {
+        'nome': 'idioma_nome[]',
+        'nivel': 'idioma_nivel[]',
+    }),
+    ColecaoFormulario(Curso, 'cursos', {
+        'nome': 'curso_nome[]',
+        'instituicao': 'curso_instituicao[]',
+        'carga_horaria': 'curso_carga_horaria[]',
+        'ano_conclusao': 'curso_ano_conclusao[]',
+    }),
+]
+
+# Campos da Pessoa que o formulário de currículo grava no upsert (o e-mail é a chave).
+# UF e cidade ficam de fora: mudam as estatísticas e são gravadas depois da contagem anterior.
+CAMPOS_PESSOA = ('nome_completo', 'bairro', 'telefone1', 'linkedin_url', 'competencias_tecnicas')
+
+# Formato do token de envio gerado no GET (uuid4().hex)
+TOKEN_ENVIO = re.compile(r'[0-9a-f]{32}')
+
+# Colunas que os cards de post (home e /blog) usam: nunca o conteúdo completo
+CAMPOS_CARD_POST = (Post.id, Post.titulo, Post.data_publicacao, Post.imagem_destaque_path, Post.resumo,
+                    Post.tempo_leitura)
+
+
+
+# --- VALIDADORES DO GET CONDICIONAL (ETag / Last-Modified) ---
+# Cada função faz uma única consulta leve e não carrega o conteúdo das páginas.
+def validadores_blog_list():
+    ultima, total = db.session.query(
+        func.max(func.coalesce(Post.atualizado_em, Post.data_publicacao)), func.count(Post.id)
+    ).one()
+    return [ultima, total], ultima
+
+def validadores_blog_post(post_id):
+    linha = db.session.query(Post.data_publicacao, Post.atualizado_em).filter(Post.id == post_id).first()
+    if linha is None:
+        return None, None
+    ultima = linha.atualizado_em or linha.data_publicacao
+    return [post_id, ultima], ultima
+
+def validadores_empresas():
+    # Considera todos os especialistas: desativar um deles também muda a página
+    ultima, total_ativos = db.session.query(
+        func.max(Especialista.atualizado_em),
+        func.count(Especialista.id).filter(Especialista.ativo.is_(True)),
+    ).one()
+    return [ultima, total_ativos], ultima
+
+
+@bp.route('/')
+@ler_da_replica
+@cache_paginas.cached('posts')
+def home():
+    # BUSCA OS 3 POSTS MAIS RECENTES
+    # Ordena por data de publicação em ordem decrescente e pega os 3 primeiros
+    posts_recentes = Post.query.options(load_only(*CAMPOS_CARD_POST)).order_by(Post.data_publicacao.desc()).limit(3).all()
+    
+    # PASSA OS POSTS PARA O TEMPLATE
+    return render_template('index.html', posts=posts_recentes)
+
+@bp.route('/empresas')
+@ler_da_replica
+@cache_paginas.cached('especialistas')
+@condicional(validadores_empresas)
+def empresas():
+    especialistas = Especialista.query.filter_by(ativo=True).order_by(Especialista.ordem).all()
+    # Envia a lista de especialistas E o dicionário de ícones para o template
+    return render_template('empresas.html', especialistas=especialistas, area_icons=AREA_ICONS)
+
+@bp.route('/contato-empresa', methods=['POST'])
+@limitador.limitar('contato')
+def contato_empresa():
+    # Como este formulário só envia dados, ele só precisa do método 'POST'.
+    if request.method == 'POST':
+        # --- Pega os dados específicos deste formulário ---
+        nome = request.form.get('nome')
+        empresa = request.form.get('empresa')
+        cnpj_cpf = request.form.get('cnpj_cpf')
+        email = request.form.get('email')
+        telefone = request.form.get('telefone')
+        mensagem = request.form.get('mensagem')
+
+        # Validação
+        if not nome or not empresa or not email or not mensagem:
+            flash('Todos os campos, exceto CPF/CNPJ e Telefone, são obrigatórios.', 'warning')
+            # Redireciona de volta para a página de onde veio
+            return redirect(url_for('public.empresas'))
+        
+        try:
+            # Corpo do e-mail em formato HTML, com os campos corretos
+            html = f"""
+                <h3>Nova Solicitação de Contato (Empresa) Recebida</h3>
+                <p><strong>Nome do Contato:</strong> {nome}</p>
+                <p><strong>Empresa:</strong> {empresa}</p>
+                <p><strong>CPF/CNPJ:</strong> {cnpj_cpf}</p>
+                <p><strong>E-mail:</strong> {email}</p>
+                <p><strong>Telefone:</strong> {telefone}</p>
+                <hr>
+                <p><strong>Mensagem:</strong></p>
+                <p>{mensagem.replace('\n', '<br>')}</p>
+            """
+
+            # Grava na fila; o envio acontece em segundo plano
+            fila_email.enfileirar(
+                assunto=f"Novo Contato de Empresa: {empresa}",
+                destinatarios=[current_app.config['MAIL_RECIPIENT']], # E-mail destinatário
+                html=html,
+            )
+            db.session.commit()
+
+            flash('Sua solicitação foi enviada com sucesso! Nossa equipe entrará em contato em breve.', 'success')
+            # Redireciona para a própria página de empresas, onde o usuário estava
+            return redirect(url_for('public.empresas'))
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"ERRO AO ENVIAR E-MAIL (EMPRESA): {e}")
+            flash('Ocorreu um erro ao tentar enviar sua solicitação. Por favor, tente novamente mais tarde.', 'danger')
+            return redirect(url_for('public.empresas'))
+
+
+# --- CADASTRO DE CURRÍCULO: GRAVAÇÃO SEGURA COM ENVIOS SIMULTÂNEOS ---
+def gravar_pessoa(email, dados):
+    """
+    Encontra ou cria a Pessoa pelo e-mail e grava `dados` num único comando
+    (INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING id). Dois envios
+    simultâneos do mesmo e-mail não disputam mais a constraint única: o segundo
+    espera o primeiro e atualiza a mesma linha. Retorna o id da Pessoa.
+    """
+    dialeto = db.session.get_bind().dialect
+    if dialeto.name in ('postgresql', 'sqlite'):
+        modulo = postgresql if dialeto.name == 'postgresql' else sqlite
+        comando = modulo.insert(Pessoa).values(email=email, **dados)
+        comando = comando.on_conflict_do_update(index_elements=[Pessoa.email],
+                                                set_={campo: comando.excluded[campo] for campo in dados})
+        if dialeto.insert_returning:
+            return db.session.execute(comando.returning(Pessoa.id)).scalar_one()
+        db.session.execute(comando)  # SQLite < 3.35 não tem RETURNING
+    else:
+        # Outros bancos: tenta inserir num savepoint e, se o e-mail já existe, atualiza
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(Pessoa).values(email=email, **dados))
+        except IntegrityError:
+            db.session.execute(update(Pessoa).where(Pessoa.email == email).values(**dados))
+    return db.session.query(Pessoa.id).filter(Pessoa.email == email).scalar()
+
+def candidatura_registrada(token):
+    """True se o formulário com este token de envio já gerou uma candidatura."""
+    return token is not None and \
+        db.session.query(Candidatura.id).filter(Candidatura.token_envio == token).first() is not None
+
+
+@bp.route('/candidatos')
+def candidatos():
+    return render_template('candidatos.html')
+
+@bp.route('/cadastro-curriculo/', methods=['GET', 'POST'])
+@limitador.limitar('cadastro')
+@metricas.orcamento(30)  # Upsert, coleções, busca, estatísticas e fila do PDF: ~25 consultas
+def cadastro_curriculo():
+    if request.method == 'POST':
+        
+        # 1. Validação de consentimento
+        if not request.form.get('consent'):
+            flash('Você precisa ler e aceitar os termos para continuar.', 'danger')
+            return redirect(url_for('public.cadastro_curriculo'))
+
+        email_enviado = request.form.get('email')
+
+        # Token do formulário: o mesmo formulário reenviado (duplo clique, nova
+        # tentativa do celular) não cria uma segunda candidatura
+        token = request.form.get('token_envio')
+        token = token if token and TOKEN_ENVIO.fullmatch(token) else None
+        if candidatura_registrada(token):
+            flash('Sua candidatura já foi registrada com sucesso!', 'success')
+            return redirect(url_for('public.cadastro_curriculo'))
+
+        # Grava o PDF ANTES de abrir a transação: a cópia em blocos, o hash e o
+        # rename acontecem sem nenhuma linha do banco bloqueada.
+        curriculo = None
+        file = request.files.get('curriculo_pdf')
+        if file and file.filename and allowed_file(file.filename):
+            try:
+                curriculo = salvar_por_conteudo(file, current_app.config['UPLOAD_FOLDER'], 'cv', 'pdf',
+                                                current_app.config['CURRICULO_MAX_BYTES'])
+            except UploadMuitoGrande as e:
+                flash(f'Não foi possível enviar o currículo: {e}', 'danger')
+                return redirect(url_for('public.cadastro_curriculo'))
+        
+        try:    
+            # 1. Encontra ou cria a Pessoa e ATUALIZA (ou preenche pela primeira vez)
+            # TODOS os dados dela num único comando. A consulta anterior só escolhe a mensagem.
+            existia = db.session.query(Pessoa.id).filter(Pessoa.email == email_enviado).first() is not None
+            if existia:
+                flash_message = 'Seu perfil foi atualizado e sua nova candidatura foi registrada com sucesso!'
+            else:
+                flash_message = 'Sua candidatura foi enviada com sucesso! Boa sorte!'
+
+            pessoa_id = gravar_pessoa(email_enviado, {campo: request.form.get(campo) for campo in CAMPOS_PESSOA})
+            # O que a Pessoa somava nas estatísticas do painel (a linha já está bloqueada pelo upsert)
+            contagens_antes = estatisticas.contagens_pessoas([pessoa_id])
+            pessoa = db.session.get(Pessoa, pessoa_id, populate_existing=True)
+            pessoa.cidade = request.form.get('cidade')
+            pessoa.uf = request.form.get('uf')
+
+            # 2. Sincroniza os relacionamentos: grava só as linhas que mudaram
+            for colecao in COLECOES_CURRICULO:
+                colecao.sincronizar(db.session, pessoa, request.form)
+
+            # 3. Cria a nova CANDIDATURA
+            nova_candidatura = Candidatura(
+                vaga_objetivo=request.form.get('objetivo'),
+                resumo_profissional=request.form.get('resumo_profissional'),
+                token_envio=token,
+                pessoa=pessoa
+            )
+            db.session.add(nova_candidatura)
+
+            # Atualiza o documento de busca textual na mesma transação
+            motor_busca.indexar(pessoa)
+
+            # 4. Associa o PDF (já gravado no disco) à candidatura
+            if curriculo:
+                nova_candidatura.curriculo_pdf_path = curriculo.nome
+                nova_candidatura.curriculo_sha256 = curriculo.sha256
+            
+            # 5. Salva TUDO no banco de dados, com a diferença nas estatísticas do painel
+            estatisticas.registrar(contagens_antes, estatisticas.contagens_pessoas([pessoa.id]))
+            db.session.commit()
+            invalidar_perfil(pessoa_id)
+            if curriculo:
+                # O texto do PDF é extraído em segundo plano, num pool de processos
+                fila_curriculos.enfileirar(curriculo.nome)
+
+            flash(flash_message, 'success')
+            return redirect(url_for('public.cadastro_curriculo'))
+
+        except IntegrityError:
+            # Um envio simultâneo do mesmo formulário gravou a candidatura primeiro
+            db.session.rollback()
+            if candidatura_registrada(token):
+                flash('Sua candidatura já foi registrada com sucesso!', 'success')
+                return redirect(url_for('public.cadastro_curriculo'))
+            flash('Ocorreu um erro ao processar sua solicitação. Por favor, tente novamente.', 'danger')
+            return redirect(url_for('public.cadastro_curriculo'))
+
+        except Exception as e:
+            db.session.rollback()
+            print("="*50)
+            print(f"ERRO NO CADASTRO/ATUALIZAÇÃO: {e}")
+            import traceback
+            traceback.print_exc()
+            print("="*50)
+            flash('Ocorreu um erro ao processar sua solicitação. Por favor, tente novamente.', 'danger')
+            return redirect(url_for('public.cadastro_curriculo'))
+        
+    # Cada formulário exibido recebe um token novo (a página não é cacheada)
+    return render_template('cadastro-curriculo.html', token_envio=uuid.uuid4().hex)
+
+@bp.route('/servicos')
+@cache_paginas.cached('institucional')
+def servicos():
+    return render_template('servicos.html')
+
+@bp.route('/sobre')
+@cache_paginas.cached('institucional')
+def sobre():
+    return render_template('sobre.html')
+
+# ==================================================================
+# INÍCIO DA MODIFICAÇÃO: Rota do Blog para Listagem de Posts
+# ==================================================================
+@bp.route('/blog')
+@ler_da_replica
+@cache_paginas.cached('posts')
+@condicional(validadores_blog_list)
+def blog_list():
+    """
+    Busca os posts de forma paginada e os exibe na página pública do blog.
+    """
+    try:
+        # 1. Pega o número da página da URL (ex: /blog?page=2). Se não houver, o padrão é 1.
+        page = request.args.get('page', 1, type=int)
+
+        # 2. Em vez de .all(), usamos .paginate().
+        #    - page=page: informa a página atual.
+        #    - per_page=5: define quantos posts você quer por página. Altere este número como quiser.
+        #    Só as colunas do card: o conteúdo completo fica para a página do post.
+        #    O total é contado à parte: o count() do paginate envolveria todas as colunas numa subquery.
+        posts_pagination = (Post.query.options(load_only(*CAMPOS_CARD_POST))
+                            .order_by(Post.data_publicacao.desc()).paginate(page=page, per_page=6, count=False))
+        posts_pagination.total = db.session.query(func.count(Post.id)).scalar()
+        
+        # 3. Passamos o objeto de paginação completo para o template.
+        #    Ele contém não só os posts da página atual, mas também informações
+        #    sobre outras páginas, total de posts, etc.
+        return render_template('blog_list.html', pagination=posts_pagination)
+
+    except Exception as e:
+        flash('Não foi possível carregar os posts do blog. Tente novamente mais tarde.', 'warning')
+        print(f"Erro ao buscar posts: {e}")
+        return redirect(url_for('public.home'))
+# ==================================================================
+# FIM DA MODIFICAÇÃO
+# ==================================================================
+
+# ==================================================================
+# INÍCIO ROTA: Página de Post Individual
+# ==================================================================
+@bp.route('/blog/post/<int:post_id>')
+@ler_da_replica
+@cache_paginas.cached('posts')
+@condicional(validadores_blog_post)
+def blog_post(post_id):
+    """
+    Busca um post específico pelo seu ID e exibe seu conteúdo completo.
+    """
+    try:
+        post = Post.query.get_or_404(post_id)
+        return render_template('blog_post.html', post=post)
+    except Exception as e:
+        flash('Post não encontrado ou ocorreu um erro.', 'danger')
+        print(f"Erro ao buscar post individual: {e}") # Log do erro
+        return redirect(url_for('public.blog_list'))
+# ==================================================================
+# FIM DA ROTA
+# ==================================================================
+
+# ==================================================================
+# INÍCIO ROTA: Página de Contato
+# ==================================================================
+@bp.route('/contato', methods=['GET', 'POST'])
+@limitador.limitar('contato')
+def contato():
+    if request.method == 'POST':
+        nome = request.form.get('nome')
+        email = request.form.get('email')
+        telefone = request.form.get('telefone')
+        assunto = request.form.get('assunto')
+        mensagem = request.form.get('mensagem')
+
+        if not nome or not email or not mensagem:
+            flash('Nome, e-mail e mensagem são campos obrigatórios.', 'warning')
+            return render_template('contato.html')
+        
+        try:
+            # Corpo do e-mail em formato HTML para ficar mais bonito
+            html = f"""
+                <h3>Nova Mensagem Recebida do Site Honoriel</h3>
+                <p><strong>Nome:</strong> {nome}</p>
+                <p><strong>E-mail:</strong> {email}</p>
+                <p><strong>Telefone:</strong> {telefone}</p>
+                <p><strong>Assunto:</strong> {assunto}</p>
+                <hr>
+                <p><strong>Mensagem:</strong></p>
+                <p>{mensagem.replace('\n', '<br>')}</p>
+            """
+
+            # Grava na fila; o envio acontece em segundo plano
+            fila_email.enfileirar(
+                assunto=f"Nova Mensagem de Contato de {nome}",
+                destinatarios=[current_app.config['MAIL_RECIPIENT']], # O destinatário
+                html=html,
+            )
+            db.session.commit()
+
+            flash('Sua mensagem foi enviada com sucesso! Entraremos em contato em breve.', 'success')
+            return redirect(url_for('public.contato'))
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"ERRO AO ENVIAR E-MAIL: {e}") # Loga o erro no terminal
+            flash('Ocorreu um erro ao tentar enviar sua mensagem. Por favor, tente novamente mais tarde.', 'danger')
+            return redirect(url_for('public.contato'))
+
+    return render_template('contato.html')
+# ==================================================================
+# FIM DA ROTA
+# ==================================================================
+
+# ==================================================================
+# INICIO DA ROTA: Termos Legais
+# ==================================================================
+
+@bp.route('/politica-de-privacidade')
+def politica_privacidade():
+    return render_template('politica_privacidade.html') # Supondo que você criará este template
+
+@bp.route('/termos-de-uso')
+def termos_de_uso():
+# Vamos unificar a Isenção de Responsabilidade aqui
+    return render_template('termos_de_uso.html')
+
+@bp.route('/termo-dos-parceiros')
+def termos_parceiros():
+    # Esta rota renderiza o template 'termos_parceiros.html'
+    return render_template('termo_parceiros.html')
+
+@bp.route('/codigo-de-etica')
+def codigo_de_etica():
+    return render_template('codigo-de-etica.html') # Supondo que você criará este template
+# ==================================================================
+# FIM DA ROTA
+# ==================================================================
@@ -0,0 +1,87 @@
+# =======================================================
+# RANKING DE CANDIDATOS POR DESCRIÇÃO DE VAGA
+# =======================================================
+# Ordena todas as Pessoas pela proximidade (BM25) entre o perfil e a descrição
+# da vaga colada pelo recrutador. A matriz (indice_ranking.py) é montada a
+# partir da tabela 'pessoa_busca', gravada em disco (RANKING_ARQUIVO) e, em
+# cada consulta, recebe só as Pessoas alteradas desde a última sincronização,
+# como o índice em memória da busca. Assim um worker novo carrega o arquivo em
+# vez de tokenizar todos os perfis, e o cadastro_curriculo não precisa avisar
+# ninguém: basta o documento de busca ter sido atualizado.
+#
+# O NumPy só é importado no primeiro uso, para não pesar no boot dos workers.
+
+import os
+import threading
+import time
+from datetime import timedelta
+
+from busca import sincronizar_indice
+
+
+class RankingCandidatos:
+    """Extensão do ranking. O modelo deve ter as colunas de 'PessoaBusca'."""
+
+    def __init__(self, app=None, db=None, modelo=None):
+        self.matriz = None
+        self._lock = threading.Lock()
+        self._proxima_reconciliacao = 0  # A primeira consulta do processo confere tudo (o arquivo pode ser antigo)
+        if app is not None:
+            self.init_app(app, db, modelo)
+
+    def init_app(self, app, db, modelo):
+        self.app = app
+        self.db = db
+        self.modelo = modelo
+        app.config.setdefault('RANKING_ARQUIVO', os.path.join(app.instance_path, 'ranking_candidatos.npz'))
+        app.config.setdefault('RANKING_DELTA_MAX', 2000)  # Pessoas alteradas antes de compactar e regravar
+        app.config.setdefault('INDICES_JANELA_SINCRONIZACAO', 120)
+        app.config.setdefault('INDICES_RECONCILIAR_INTERVALO', 600)
+        app.extensions['ranking'] = self
+
+    def _documentos(self, desde=None):
+        modelo = self.modelo
+        query = self.db.session.query(modelo.pessoa_id, modelo.peso_a, modelo.peso_b, modelo.peso_c,
+                                      modelo.atualizado_em)
+        if desde is not None:
+            query = query.filter(modelo.atualizado_em >= desde)
+        return query.order_by(modelo.pessoa_id).yield_per(1000)
+
+    def reconstruir(self):
+        """Monta a matriz do zero a partir do banco e grava em disco (CLI, ou quando não há arquivo)."""
+        from indice_ranking import MatrizRanking
+        matriz = MatrizRanking.construir(self._documentos())
+        matriz.salvar(self.app.config['RANKING_ARQUIVO'])
+        with self._lock:
+            self.matriz = matriz
+        return matriz
+
+    def _sincronizar(self):
+        """Carrega do disco (ou monta) e aplica as Pessoas alteradas e excluídas desde então."""
+        if self.matriz is None:
+            from indice_ranking import MatrizRanking
+            self.matriz = MatrizRanking.carregar(self.app.config['RANKING_ARQUIVO'])
+            if self.matriz is None:
+                self.matriz = MatrizRanking.construir(self._documentos())
+                self.matriz.salvar(self.app.config['RANKING_ARQUIVO'])
+
+        matriz = self.matriz
+        agora = time.monotonic()
+        reconciliar = agora >= self._proxima_reconciliacao
+        if reconciliar:
+            self._proxima_reconciliacao = agora + self.app.config['INDICES_RECONCILIAR_INTERVALO']
+        sincronizar_indice(matriz, self.db.session, self.modelo,
+                           timedelta(seconds=self.app.config['INDICES_JANELA_SINCRONIZACAO']), reconciliar)
+
+        if len(matriz.delta) > self.app.config['RANKING_DELTA_MAX']:
+            self.matriz = matriz.compactar()
+            self.matriz.salvar(self.app.config['RANKING_ARQUIVO'])
+
+    def ranquear(self, descricao, limite=20):
+        """[(pessoa_id, score)] das Pessoas mais aderentes à descrição da vaga, da maior para a menor."""
+        descricao = (descricao or '').strip()
+        if not descricao:
+            return []
+        with self._lock:
+            self._sincronizar()
+            return self.matriz.ranquear(descricao, limite)
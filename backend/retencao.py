@@ -0,0 +1,239 @@
+# =======================================================
+# EXCLUSÃO EM LOTE / RETENÇÃO DE CANDIDATURAS (LGPD)
+# =======================================================
+# Cada pedido de exclusão vira uma linha em 'exclusao_lote' com os critérios
+# (data limite e/ou o mesmo filtro da listagem do admin). A execução apaga as
+# candidaturas em lotes, cada lote na sua transação, e manda os PDFs que
+# ficaram sem nenhuma candidatura para um pool de threads remover do disco.
+#
+# Como os critérios ficam gravados e cada lote é buscado de novo no banco, a
+# exclusão é idempotente e pode ser retomada: se o processo morrer no meio,
+# basta rodar a mesma exclusão outra vez (pelo admin ou pelo
+# `flask excluir-candidaturas --retomar ID`) que ela continua de onde parou.
+# PDFs que ficarem para trás por uma queda entre o commit e a remoção saem com
+# o `flask remover-curriculos-orfaos`.
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, delete, func, or_, update
+from werkzeug.security import safe_join
+
+import estatisticas
+from extensoes import db
+from models import (Candidatura, Curso, ExclusaoLote, Experiencia, Formacao, Idioma, ParDuplicado, Pessoa,
+                    PessoaBusca, TextoCurriculo)
+from perfil import invalidar_perfil
+
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDA = 'concluida'
+FALHOU = 'falhou'
+
+FILTROS_PERMITIDOS = ('pessoa', 'candidatura')  # A busca por perfil é ranqueada e limitada: não serve aqui
+
+
+class CriterioInvalido(ValueError):
+    pass
+
+
+def montar_exclusao(anteriores_a=None, filtro_por=None, termo_busca=None, remover_pessoas=True,
+                    solicitado_por=None):
+    """Valida os critérios e devolve a ExclusaoLote ainda fora da sessão (serve para simular)."""
+    termo_busca = (termo_busca or '').strip() or None
+    if termo_busca and filtro_por not in FILTROS_PERMITIDOS:
+        raise CriterioInvalido('Filtro inválido para exclusão em lote.')
+    if anteriores_a is None and not termo_busca:
+        raise CriterioInvalido('Informe uma data limite ou um termo de busca.')
+    return ExclusaoLote(
+        status=PENDENTE, anteriores_a=anteriores_a, filtro_por=filtro_por if termo_busca else None,
+        termo_busca=termo_busca, remover_pessoas=remover_pessoas, solicitado_por=solicitado_por,
+        candidaturas_excluidas=0, pessoas_excluidas=0, arquivos_removidos=0,
+    )
+
+
+def criar_exclusao(**criterios):
+    """Grava o pedido de exclusão. Exige data limite ou termo, para nunca apagar tudo por engano."""
+    exclusao = montar_exclusao(**criterios)
+    db.session.add(exclusao)
+    db.session.commit()
+    return exclusao
+
+
+def consulta_candidaturas(exclusao):
+    """Candidaturas que ainda atendem aos critérios da exclusão (id, pessoa e PDF)."""
+    from admin import filtrar_candidaturas  # O blueprint do admin importa este módulo
+    query = (db.session.query(Candidatura.id, Candidatura.pessoa_id, Candidatura.curriculo_pdf_path)
+             .join(Candidatura.pessoa))
+    if exclusao.anteriores_a is not None:
+        query = query.filter(Candidatura.data_candidatura < exclusao.anteriores_a)
+    return filtrar_candidaturas(query, exclusao.filtro_por, exclusao.termo_busca)
+
+
+def simular(exclusao):
+    """(candidaturas, pessoas) que a exclusão apagaria agora."""
+    alvo = consulta_candidaturas(exclusao).subquery()
+    return db.session.query(func.count(alvo.c.id), func.count(func.distinct(alvo.c.pessoa_id))).one()
+
+
+def retomaveis():
+    """Exclusões que podem ser (re)executadas: pendentes, com falha ou paradas há mais que o timeout."""
+    return ExclusaoLote.query.filter(_disponivel()).order_by(ExclusaoLote.id).all()
+
+
+def _disponivel():
+    limite = datetime.utcnow() - timedelta(seconds=current_app.config['RETENCAO_TIMEOUT'])
+    return or_(ExclusaoLote.status.in_((PENDENTE, FALHOU)),
+               and_(ExclusaoLote.status == EXECUTANDO, ExclusaoLote.atualizado_em < limite))
+
+
+def _reservar(exclusao_id):
+    """Marca a exclusão como 'executando' com um UPDATE condicional: só um processo a executa por vez."""
+    resultado = db.session.execute(
+        update(ExclusaoLote)
+        .where(ExclusaoLote.id == exclusao_id, _disponivel())
+        .values(status=EXECUTANDO, atualizado_em=datetime.utcnow(), erro=None)
+    )
+    db.session.commit()
+    return resultado.rowcount == 1
+
+
+def remover_texto(nomes):
+    """Apaga o texto extraído dos PDFs que saíram do disco (o commit fica com quem chamou)."""
+    if nomes:
+        db.session.execute(delete(TextoCurriculo).where(TextoCurriculo.arquivo.in_(nomes)))
+
+
+# Um cadastro que reaproveita um PDF já gravado (mesmo hash) renova o mtime dele
+# antes de commitar a candidatura (uploads.salvar_por_conteudo). Entre a
+# consulta "nenhuma candidatura usa o arquivo" e a remoção, esse commit pode
+# acontecer; por isso o arquivo sai do lugar com um rename atômico e só então o
+# mtime é conferido: renovado há pouco, ele volta. Do outro lado, o os.utime do
+# cadastro ou encontra o arquivo no lugar (e a remoção vê o mtime novo) ou não o
+# encontra e grava uma cópia nova. O que voltar sai depois com o
+# `flask remover-curriculos-orfaos`, se continuar sem candidatura.
+CARENCIA_REAPROVEITAMENTO = 600  # Segundos
+
+
+def remover_arquivo(pasta, nome):
+    """Remove um PDF do disco. Retorna 1 se removeu, 0 se já não existia ou foi reaproveitado há pouco."""
+    caminho = safe_join(pasta, nome)
+    if caminho is None:
+        return 0
+    removendo = os.path.join(os.path.dirname(caminho), f'.{os.path.basename(caminho)}.{uuid.uuid4().hex}.removendo')
+    try:
+        os.rename(caminho, removendo)
+    except FileNotFoundError:
+        return 0
+    if time.time() - os.stat(removendo).st_mtime < CARENCIA_REAPROVEITAMENTO:
+        # Se outro envio já gravou o arquivo de novo, o conteúdo é o mesmo (o nome é o hash)
+        os.replace(removendo, caminho)
+        return 0
+    os.remove(removendo)
+    return 1
+
+
+def _excluir_pessoas_sem_candidatura(pessoa_ids):
+    sem_candidatura = [linha.id for linha in db.session.query(Pessoa.id).filter(
+        Pessoa.id.in_(pessoa_ids), ~Pessoa.candidaturas.any())]
+    if sem_candidatura:
+        estatisticas.registrar(estatisticas.contagens_idiomas(Idioma.pessoa_id.in_(sem_candidatura)), {})
+        # DELETE em lote das coleções (o cascade do ORM carregaria pessoa por pessoa)
+        for modelo in (Formacao, Experiencia, Idioma, Curso, PessoaBusca):
+            db.session.execute(delete(modelo).where(modelo.pessoa_id.in_(sem_candidatura)))
+        db.session.execute(delete(ParDuplicado).where(ParDuplicado.pessoa_id.in_(sem_candidatura)
+                                                      | ParDuplicado.duplicata_id.in_(sem_candidatura)))
+        db.session.execute(delete(Pessoa).where(Pessoa.id.in_(sem_candidatura)))
+    return len(sem_candidatura)
+
+
+def executar_exclusao(exclusao_id, lote=None, threads=None, progresso=None):
+    """
+    Executa (ou retoma) uma exclusão. Retorna a ExclusaoLote ao final, ou None se
+    ela não estava disponível (concluída ou em execução em outro processo).
+    """
+    if not _reservar(exclusao_id):
+        return None
+    config = current_app.config
+    lote = lote or config['RETENCAO_LOTE']
+    pasta = config['UPLOAD_FOLDER']
+    exclusao = db.session.get(ExclusaoLote, exclusao_id)
+
+    futuros = []
+    with ThreadPoolExecutor(threads or config['RETENCAO_THREADS_ARQUIVOS'],
+                            thread_name_prefix='retencao-arquivos') as executor:
+        try:
+            while True:
+                linhas = consulta_candidaturas(exclusao).order_by(Candidatura.id).limit(lote).all()
+                if not linhas:
+                    break
+                ids = [linha.id for linha in linhas]
+                caminhos = {linha.curriculo_pdf_path for linha in linhas if linha.curriculo_pdf_path}
+
+                estatisticas.registrar(estatisticas.contagens_candidaturas(Candidatura.id.in_(ids)), {})
+                db.session.execute(delete(Candidatura).where(Candidatura.id.in_(ids)))
+                if exclusao.remover_pessoas:
+                    exclusao.pessoas_excluidas += _excluir_pessoas_sem_candidatura(
+                        {linha.pessoa_id for linha in linhas})
+                exclusao.candidaturas_excluidas += len(ids)
+                exclusao.atualizado_em = datetime.utcnow()
+                db.session.commit()
+                invalidar_perfil(*{linha.pessoa_id for linha in linhas})
+
+                # Só apaga o PDF que nenhuma outra candidatura usa (deduplicado por hash)
+                if caminhos:
+                    em_uso = {linha.curriculo_pdf_path for linha in db.session.query(Candidatura.curriculo_pdf_path)
+                              .filter(Candidatura.curriculo_pdf_path.in_(caminhos)).distinct()}
+                    orfaos = caminhos - em_uso
+                    if orfaos:
+                        # O texto extraído do PDF também é dado pessoal: sai junto com o arquivo
+                        remover_texto(orfaos)
+                        db.session.commit()
+                    futuros += [executor.submit(remover_arquivo, pasta, nome) for nome in orfaos]
+                if progresso:
+                    progresso(exclusao)
+        except Exception as e:
+            db.session.rollback()
+            exclusao.status = FALHOU
+            exclusao.erro = str(e)[:1000]
+            print(f"ERRO NA EXCLUSÃO EM LOTE #{exclusao_id}: {e}")
+
+    # O pool já terminou: todos os arquivos dos lotes confirmados foram tratados
+    exclusao.arquivos_removidos += sum(futuro.result() for futuro in futuros if futuro.exception() is None)
+    if exclusao.status != FALHOU:
+        exclusao.status = CONCLUIDA
+        exclusao.concluido_em = datetime.utcnow()
+    exclusao.atualizado_em = datetime.utcnow()
+    db.session.commit()
+    return exclusao
+
+
+def executar_em_segundo_plano(exclusao_id):
+    """Roda a exclusão numa thread do processo atual (usado pelo admin, para não prender a requisição)."""
+    app = current_app._get_current_object()
+
+    def alvo():
+        with app.app_context():
+            executar_exclusao(exclusao_id)
+
+    thread = threading.Thread(target=alvo, name=f'exclusao-lote-{exclusao_id}', daemon=True)
+    thread.start()
+    return thread
+
+
+def curriculos_orfaos(pasta, idade_minima):
+    """PDFs de currículo no disco sem nenhuma candidatura, mais velhos que `idade_minima` segundos."""
+    em_uso = {linha.curriculo_pdf_path for linha in
+              db.session.query(Candidatura.curriculo_pdf_path).filter(Candidatura.curriculo_pdf_path.isnot(None))
+              .distinct()}
+    limite = time.time() - idade_minima
+    with os.scandir(pasta) as entradas:
+        return [entrada.name for entrada in entradas
+                if entrada.is_file() and entrada.name.endswith('.pdf') and entrada.name not in em_uso
+                # Um upload recém-gravado ou reaproveitado pode ainda não ter a candidatura commitada
+                and entrada.stat().st_mtime < limite]
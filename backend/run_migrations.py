@@ -1,9 +1,15 @@
 import os
-from app import app, db
+from app import create_app
+from extensoes import db, iniciar_migrate
+from busca import criar_configuracao_pg
 from flask_migrate import stamp
 from sqlalchemy import text
 import sys
 
+# Sem workers da fila de e-mail: este processo só prepara o banco
+app = create_app({'MAIL_QUEUE_WORKERS': 0})
+iniciar_migrate(app)
+
 print("==========================================")
 print("  EXECUTING DATABASE SETUP SCRIPT (FORCE)  ")
 print("==========================================")
@@ -14,6 +20,15 @@ with app.app_context():
         db.session.execute(text('SELECT 1'))
         print(">>> Database connection successful.")
 
+        # Extensões e configurações do PostgreSQL usadas pelos models
+        # (pg_trgm para os índices trigram, unaccent para a busca textual).
+        if db.engine.dialect.name == 'postgresql':
+            print("Ensuring PostgreSQL extensions and text search configuration...")
+            with db.engine.begin() as conexao:
+                conexao.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+                criar_configuracao_pg(conexao)
+            print(">>> PostgreSQL extensions ready.")
+
         # FORÇA a criação de todas as tabelas a partir dos models.
         print("Running db.create_all() to ensure all tables exist...")
         db.create_all()
@@ -0,0 +1,126 @@
+# =======================================================
+# GRAVAÇÃO DE UPLOADS
+# =======================================================
+# O arquivo é copiado em blocos de tamanho fixo para um temporário na própria
+# pasta de uploads, calculando o SHA-256 e o tamanho durante a cópia. No fim,
+# o temporário é renomeado (os.replace é atômico no mesmo sistema de arquivos)
+# para um nome derivado do conteúdo. Arquivos idênticos viram um só no disco.
+
+import hashlib
+import mimetypes
+import os
+import tempfile
+from collections import namedtuple
+from urllib.parse import quote
+
+from flask import abort, current_app, send_file
+from werkzeug.security import safe_join
+
+TAMANHO_BLOCO = 64 * 1024
+ALLOWED_EXTENSIONS = {'pdf'}
+ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+
+ArquivoSalvo = namedtuple('ArquivoSalvo', 'nome sha256 tamanho novo')
+
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def allowed_image_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_IMAGE_EXTENSIONS
+
+
+class UploadMuitoGrande(ValueError):
+    """O arquivo passou do limite de tamanho permitido."""
+
+
+def salvar_por_conteudo(arquivo, pasta, prefixo, extensao, max_bytes):
+    """
+    Grava um FileStorage em `pasta` com o nome '<prefixo>_<sha256>.<extensao>'.
+    Levanta UploadMuitoGrande (sem deixar lixo no disco) se passar de `max_bytes`.
+    Se o mesmo conteúdo já existir, o arquivo existente é reaproveitado (novo=False) e tem o mtime renovado.
+    """
+    sha256 = hashlib.sha256()
+    tamanho = 0
+    fd, caminho_temp = tempfile.mkstemp(dir=pasta, prefix='.upload-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as destino:
+            while True:
+                bloco = arquivo.stream.read(TAMANHO_BLOCO)
+                if not bloco:
+                    break
+                tamanho += len(bloco)
+                if tamanho > max_bytes:
+                    raise UploadMuitoGrande(f"O arquivo excede o limite de {max_bytes // (1024 * 1024)} MB.")
+                sha256.update(bloco)
+                destino.write(bloco)
+            destino.flush()
+            os.fsync(destino.fileno())
+
+        digest = sha256.hexdigest()
+        nome = f"{prefixo}_{digest}.{extensao}"
+        caminho_final = os.path.join(pasta, nome)
+        try:
+            # Mesmo conteúdo já no disco: reaproveita e renova o mtime, o que impede que uma
+            # exclusão em andamento o remova antes do commit desta candidatura
+            # (ver retencao.remover_arquivo). Se ele sumiu no meio tempo, grava de novo.
+            os.utime(caminho_final)
+        except FileNotFoundError:
+            os.replace(caminho_temp, caminho_final)
+            return ArquivoSalvo(nome, digest, tamanho, True)
+        os.remove(caminho_temp)
+        return ArquivoSalvo(nome, digest, tamanho, False)
+    except BaseException:
+        if os.path.exists(caminho_temp):
+            os.remove(caminho_temp)
+        raise
+
+
+# =======================================================
+# ENTREGA DE UPLOADS
+# =======================================================
+# Os nomes dos arquivos nunca são reaproveitados para outro conteúdo (hash do
+# conteúdo nos currículos, timestamp nas imagens), então o navegador/CDN pode
+# guardá-los por um ano sem revalidar. O Werkzeug já responde Range (206) e
+# 304; com UPLOADS_OFFLOAD o worker só devolve os cabeçalhos e o proxy
+# (nginx/Apache) lê o arquivo do disco.
+
+MODOS_OFFLOAD = ('nenhum', 'x-accel', 'x-sendfile')
+
+
+def configurar_entrega(app):
+    modo = app.config.setdefault('UPLOADS_OFFLOAD', 'nenhum')
+    if modo not in MODOS_OFFLOAD:
+        raise RuntimeError(f"UPLOADS_OFFLOAD inválido: '{modo}'. Use um de {MODOS_OFFLOAD}.")
+    app.config.setdefault('UPLOADS_ACCEL_PREFIXO', '/_uploads_internos/')  # location 'internal' do nginx
+    app.config.setdefault('UPLOADS_MAX_AGE', 365 * 24 * 3600)
+    # O X-Sendfile (Apache/lighttpd) já é suportado pelo próprio send_file do Flask
+    app.config['USE_X_SENDFILE'] = modo == 'x-sendfile'
+
+
+def servir_arquivo(pasta, nome, como_anexo=False, privado=False):
+    """
+    Responde com o arquivo `nome` de `pasta`, com Cache-Control longo e imutável.
+    `privado` impede que proxies/CDNs compartilhados guardem a resposta (ex.: currículos).
+    """
+    caminho = safe_join(pasta, nome)
+    if caminho is None or not os.path.isfile(caminho):
+        abort(404)
+
+    config = current_app.config
+    if config['UPLOADS_OFFLOAD'] == 'x-accel':
+        resposta = current_app.response_class(
+            mimetype=mimetypes.guess_type(nome)[0] or 'application/octet-stream')
+        resposta.headers['X-Accel-Redirect'] = config['UPLOADS_ACCEL_PREFIXO'] + quote(nome)
+        if como_anexo:
+            resposta.headers.set('Content-Disposition', 'attachment', filename=os.path.basename(nome))
+    else:
+        resposta = send_file(caminho, as_attachment=como_anexo, conditional=True,
+                             max_age=config['UPLOADS_MAX_AGE'])
+
+    resposta.cache_control.max_age = config['UPLOADS_MAX_AGE']
+    resposta.cache_control.immutable = True
+    resposta.cache_control.public = not privado
+    resposta.cache_control.private = privado
+    return resposta
@@ -0,0 +1,30 @@
+"""
+Preparação comum aos scripts de benchmarks/: coloca backend/ no sys.path (no
+import deste módulo, para que `models` e `extensoes` possam ser importados em
+seguida) e define valores padrão para as variáveis de ambiente antes de montar
+o app. Sem DATABASE_URL, usa um SQLite em benchmarks/.dados/bench.db.
+"""
+
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_DADOS = os.path.join(RAIZ, 'benchmarks', '.dados')
+PASTA_BACKEND = os.path.join(RAIZ, 'backend')
+
+if PASTA_BACKEND not in sys.path:
+    sys.path.insert(0, PASTA_BACKEND)
+
+
+def carregar_app(**variaveis):
+    """Monta e devolve o app Flask. `variaveis` sobrescrevem o ambiente (ex.: PAGE_CACHE_BACKEND)."""
+    os.makedirs(PASTA_DADOS, exist_ok=True)
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(PASTA_DADOS, 'bench.db'))
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('MAIL_QUEUE_WORKERS', '0')   # Sem envio de e-mail durante a medição
+    os.environ.setdefault('SQL_QUERY_BUDGET', '0')     # Sem warnings no meio da saída
+    os.environ.setdefault('RATE_LIMIT_BACKEND', 'nenhum')  # A carga vem toda do mesmo IP
+    os.environ.update({chave: str(valor) for chave, valor in variaveis.items()})
+
+    from app import create_app
+    return create_app()
@@ -0,0 +1,84 @@
+"""
+Confere o índice de busca em memória (SQLite/dev, busca.MotorBusca) depois de
+exclusões e cadastros entre duas buscas: a cada rodada exclui algumas Pessoas e
+cadastra o mesmo número de novas (o total de documentos não muda), busca pelo
+termo exclusivo de cada uma e compara os documentos do índice com os da tabela
+pessoa_busca. Sai com código 1 se uma Pessoa excluída ainda aparecer ou uma
+nova não aparecer.
+
+    python benchmarks/busca_memoria.py
+    python benchmarks/busca_memoria.py --pessoas 2000 --rodadas 20 --trocas 5
+
+Usa o DATABASE_URL (ou o SQLite de benchmarks/.dados/); com PostgreSQL a busca
+vai ao banco e o índice em memória não é usado.
+"""
+
+import argparse
+import sys
+import time
+import uuid
+
+from ambiente import carregar_app
+from extensoes import db, motor_busca
+from models import Pessoa
+
+
+def cadastrar(prefixo, quantidade):
+    """Cria Pessoas com um termo exclusivo nas competências. Retorna {termo: pessoa_id}."""
+    pessoas = {}
+    for _ in range(quantidade):
+        termo = f"{prefixo}{uuid.uuid4().hex[:12]}"
+        pessoa = Pessoa(nome_completo='Busca Memória', email=f"{termo}@exemplo.com",
+                        competencias_tecnicas=f"{termo}, Python")
+        db.session.add(pessoa)
+        motor_busca.indexar(pessoa)
+        db.session.flush()
+        pessoas[termo] = pessoa.id
+    db.session.commit()
+    return pessoas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Índice de busca em memória depois de exclusões e cadastros.')
+    parser.add_argument('--pessoas', type=int, default=500)
+    parser.add_argument('--rodadas', type=int, default=10)
+    parser.add_argument('--trocas', type=int, default=3, help='Pessoas excluídas (e cadastradas) por rodada.')
+    args = parser.parse_args()
+
+    app = carregar_app()
+    falhas = 0
+    with app.app_context():
+        db.create_all()
+        if motor_busca.usa_postgres:
+            print("PostgreSQL: a busca não usa o índice em memória; nada a conferir.")
+            return
+        prefixo = f"bm{int(time.time())}x"
+        ativas = cadastrar(prefixo, args.pessoas)
+        motor_busca.buscar('python')  # Primeira sincronização
+
+        for rodada in range(1, args.rodadas + 1):
+            excluidas = dict(list(ativas.items())[:args.trocas])
+            for termo, pessoa_id in excluidas.items():
+                db.session.delete(db.session.get(Pessoa, pessoa_id))
+                del ativas[termo]
+            db.session.commit()
+            novas = cadastrar(prefixo, args.trocas)
+            ativas.update(novas)
+
+            # Sem buscas no meio: a primeira depois das trocas é a que sincroniza
+            inicio = time.perf_counter()
+            restantes = [termo for termo in excluidas if motor_busca.buscar(termo)]
+            sincronizacao = time.perf_counter() - inicio
+            faltando = [termo for termo, pessoa_id in novas.items() if motor_busca.buscar(termo) != [pessoa_id]]
+
+            existentes = {pessoa_id for (pessoa_id,) in db.session.query(motor_busca.modelo.pessoa_id)}
+            ok = not restantes and not faltando and motor_busca.indice.ids() == existentes
+            falhas += not ok
+            print(f"{'OK  ' if ok else 'FALHOU'} rodada {rodada}: {len(excluidas)} excluídas "
+                  f"({len(restantes)} ainda na busca), {len(novas)} novas ({len(faltando)} fora da busca), "
+                  f"{len(motor_busca.indice)} documentos | buscas das excluídas {sincronizacao * 1000:.1f} ms")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == '__main__':
+    main()
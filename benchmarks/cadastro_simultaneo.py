@@ -0,0 +1,103 @@
+"""
+Envios simultâneos do cadastro de currículo com o mesmo e-mail, disparados
+juntos por várias threads (barreira), em dois cenários por rodada:
+
+- mesmo formulário (duplo clique, nova tentativa do celular): o mesmo token de
+  envio em todas as threads; deve gerar uma única candidatura;
+- formulários diferentes: um token por thread; uma candidatura por envio.
+
+Em ambos, todos os envios devem terminar com a mensagem de sucesso, a Pessoa
+deve existir uma única vez e as formações/idiomas do formulário não podem ser
+duplicados. Sai com código 1 se algum resultado fugir do esperado.
+
+    python benchmarks/cadastro_simultaneo.py
+    python benchmarks/cadastro_simultaneo.py --threads 16 --rodadas 10
+    DATABASE_URL=postgresql://... python benchmarks/cadastro_simultaneo.py
+
+Usa o cliente de teste do Flask (sem servidor), um cliente por thread.
+"""
+
+import argparse
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from ambiente import carregar_app
+from extensoes import db
+from models import Candidatura, Formacao, Idioma, Pessoa
+
+
+def formulario(email, token):
+    return {
+        'consent': 'on', 'email': email, 'token_envio': token,
+        'nome_completo': 'Envio Simultâneo', 'bairro': 'Centro', 'cidade': 'Curitiba', 'uf': 'PR',
+        'telefone1': '(41) 99999-0000', 'objetivo': 'Analista de testes',
+        'form_curso[]': 'Sistemas de Informação', 'form_instituicao[]': 'UFPR', 'form_ano_conclusao[]': '2020',
+        'idioma_nome[]': 'Inglês', 'idioma_nivel[]': 'Avançado',
+    }
+
+
+def disparar(app, formularios):
+    """Posta os formulários ao mesmo tempo. Retorna a lista de (status, categorias das mensagens)."""
+    barreira = threading.Barrier(len(formularios))
+
+    def enviar(dados):
+        cliente = app.test_client()
+        barreira.wait()
+        resposta = cliente.post('/cadastro-curriculo/', data=dados)
+        with cliente.session_transaction() as sessao:
+            categorias = [categoria for categoria, _ in sessao.get('_flashes', [])]
+        return resposta.status_code, categorias
+
+    with ThreadPoolExecutor(len(formularios)) as executor:
+        return list(executor.map(enviar, formularios))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Envios simultâneos do cadastro de currículo.')
+    parser.add_argument('--threads', type=int, default=8, help='Envios simultâneos por cenário.')
+    parser.add_argument('--rodadas', type=int, default=5)
+    args = parser.parse_args()
+
+    app = carregar_app()
+    with app.app_context():
+        db.create_all()
+    falhas = []
+
+    def conferir(descricao, obtido, esperado):
+        if obtido != esperado:
+            print(f"FALHOU {descricao}: {obtido} (esperado {esperado})")
+            falhas.append(descricao)
+
+    inicio = time.perf_counter()
+    envios = 0
+    for rodada in range(1, args.rodadas + 1):
+        for cenario in ('mesmo formulário', 'formulários diferentes'):
+            email = f'simultaneo-{uuid.uuid4().hex[:12]}@exemplo.com'
+            token = uuid.uuid4().hex
+            tokens = [token if cenario == 'mesmo formulário' else uuid.uuid4().hex for _ in range(args.threads)]
+            respostas = disparar(app, [formulario(email, t) for t in tokens])
+            envios += len(respostas)
+
+            rotulo = f'rodada {rodada}, {cenario}'
+            conferir(f'{rotulo}: envios com erro',
+                     sum(1 for status, categorias in respostas if status != 302 or categorias != ['success']), 0)
+            with app.app_context():
+                pessoas = db.session.query(Pessoa.id).filter(Pessoa.email == email).all()
+                conferir(f'{rotulo}: pessoas com o e-mail', len(pessoas), 1)
+                if len(pessoas) != 1:
+                    continue
+                for modelo, esperado in ((Candidatura, len(set(tokens))), (Formacao, 1), (Idioma, 1)):
+                    total = db.session.query(modelo.id).filter(modelo.pessoa_id == pessoas[0].id).count()
+                    conferir(f'{rotulo}: {modelo.__tablename__}', total, esperado)
+
+    duracao = time.perf_counter() - inicio
+    print(f"{envios} envios em {duracao:.1f} s ({args.rodadas} rodadas x 2 cenários x {args.threads} threads)")
+    print(f"{'OK  ' if not falhas else 'FALHOU'} {len(falhas)} verificações fora do esperado")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == '__main__':
+    main()
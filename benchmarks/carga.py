@@ -0,0 +1,274 @@
+"""
+Driver de carga HTTP: dispara requisições concorrentes contra as rotas
+principais e grava p50/p95/p99, RPS e consultas SQL por requisição em JSON,
+para comparar uma versão com a anterior.
+
+Por padrão sobe o app num servidor local (thread) usando o DATABASE_URL
+(SQLite de benchmarks/.dados/ ou um PostgreSQL local). Com --url, mede um
+servidor já rodando (ex.: gunicorn), que precisa usar o mesmo banco.
+
+    python benchmarks/dados.py --pessoas 5000
+    python benchmarks/carga.py --concorrencia 8 --duracao 15 --saida resultado.json
+
+As consultas SQL vêm do /admin/metrics. Com vários workers, cada scrape só
+enxerga um processo, então rode o servidor com um worker ao comparar consultas.
+Com --url, suba o servidor com RATE_LIMIT_BACKEND=nenhum: os POSTs saem todos
+do mesmo IP e esbarrariam no limite de requisições.
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import random
+import re
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+
+from ambiente import RAIZ, carregar_app
+from extensoes import db
+from models import Pessoa
+
+_metrica = re.compile(r'^(honoriel_sql_queries_total|honoriel_http_requests_total)\{rota="([^"]*)"[^}]*\} (\S+)$')
+
+
+class Cliente:
+    """Uma conexão HTTP keep-alive por thread."""
+
+    def __init__(self, base, cookie=None):
+        partes = urlsplit(base)
+        self.host, self.porta = partes.hostname, partes.port or 80
+        self.cookie = cookie
+        self._local = threading.local()
+
+    def _conexao(self):
+        if getattr(self._local, 'conexao', None) is None:
+            self._local.conexao = http.client.HTTPConnection(self.host, self.porta, timeout=60)
+        return self._local.conexao
+
+    def requisitar(self, metodo, caminho, corpo=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+        conexao = self._conexao()
+        try:
+            conexao.request(metodo, caminho, body=corpo, headers=headers)
+            resposta = conexao.getresponse()
+            resposta.corpo = resposta.read()
+            return resposta
+        except (http.client.HTTPException, OSError):
+            conexao.close()
+            self._local.conexao = None
+            raise
+
+
+def login(base, usuario, senha):
+    cliente = Cliente(base)
+    resposta = cliente.requisitar('POST', '/login', urlencode({'username': usuario, 'password': senha}),
+                                  {'Content-Type': 'application/x-www-form-urlencoded'})
+    cookie = resposta.getheader('Set-Cookie', '').split(';', 1)[0]
+    if resposta.status != 302 or not cookie:
+        raise SystemExit(f"Login falhou para '{usuario}' (rode benchmarks/dados.py para criar o usuário).")
+    return cookie
+
+
+def formulario_curriculo(rng):
+    """Corpo do POST de /cadastro-curriculo/ com um e-mail novo a cada chamada."""
+    campos = [
+        ('consent', 'on'), ('email', f"carga-{uuid.uuid4().hex}@exemplo.com.br"),
+        ('nome_completo', 'Pessoa de Carga'), ('cidade', 'Recife'), ('uf', 'PE'),
+        ('telefone1', '(81) 99999-0000'), ('objetivo', 'Analista de RH'),
+        ('resumo_profissional', 'Resumo gerado pelo benchmark.'),
+        ('competencias_tecnicas', 'Excel, eSocial, folha de pagamento'),
+    ]
+    for i in range(rng.randint(1, 3)):
+        campos += [('exp_empresa[]', f'Empresa {i}'), ('exp_cargo[]', 'Assistente'),
+                   ('exp_data_inicio[]', '01/2020'), ('exp_data_fim[]', '12/2023'),
+                   ('exp_atividades[]', 'Rotinas administrativas e atendimento.')]
+    campos += [('form_curso[]', 'Administração'), ('form_instituicao[]', 'UFPE'),
+               ('form_ano_conclusao[]', '2019'), ('form_conclusao_prevista[]', ''),
+               ('idioma_nome[]', 'Inglês'), ('idioma_nivel[]', 'Intermediário')]
+    return urlencode(campos)
+
+
+def montar_cenarios(ids_pessoas):
+    rng = random.Random(7)
+    form = {'Content-Type': 'application/x-www-form-urlencoded'}
+    return {
+        'home': (False, lambda: ('GET', '/', None, None)),
+        'blog_list': (False, lambda: ('GET', f'/blog?page={rng.randint(1, 3)}', None, None)),
+        'admin_candidatos': (True, lambda: ('GET', '/admin/candidatos', None, None)),
+        'admin_candidatos_busca': (True, lambda: (
+            'GET', '/admin/candidatos?' + urlencode({'filtro_por': 'pessoa', 'termo_busca': rng.choice(
+                ('Silva', 'Ana', 'Recife', 'Costa'))}), None, None)),
+        'detalhe_candidato': (True, lambda: ('GET', f'/pessoa/{rng.choice(ids_pessoas)}', None, None)),
+        'cadastro_curriculo': (False, lambda: ('POST', '/cadastro-curriculo/', formulario_curriculo(rng), form)),
+    }
+
+
+def ler_metricas(cliente):
+    """{rota: (requisições, consultas SQL)} a partir do /admin/metrics."""
+    texto = cliente.requisitar('GET', '/admin/metrics').corpo.decode('utf-8')
+    valores = {}
+    for linha in texto.splitlines():
+        m = _metrica.match(linha)
+        if m:
+            nome, rota, valor = m.groups()
+            req, sql = valores.get(rota, (0, 0))
+            if nome == 'honoriel_sql_queries_total':
+                sql += float(valor)
+            else:
+                req += float(valor)
+            valores[rota] = (req, sql)
+    return valores
+
+
+def percentil(ordenados, p):
+    if not ordenados:
+        return None
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def executar_cenario(cliente, gerar, concorrencia, duracao, aquecimento):
+    latencias, erros, status = [], 0, {}
+    lock = threading.Lock()
+    fim_aquecimento = time.perf_counter() + aquecimento
+    fim = fim_aquecimento + duracao
+
+    def trabalhador():
+        nonlocal erros
+        while time.perf_counter() < fim:
+            metodo, caminho, corpo, headers = gerar()
+            inicio = time.perf_counter()
+            try:
+                resposta = cliente.requisitar(metodo, caminho, corpo, headers)
+                codigo = resposta.status
+            except Exception:
+                codigo = 'erro'
+            decorrido = time.perf_counter() - inicio
+            if inicio < fim_aquecimento:
+                continue
+            with lock:
+                status[codigo] = status.get(codigo, 0) + 1
+                if codigo == 'erro' or codigo >= 400:
+                    erros += 1
+                else:
+                    latencias.append(decorrido)
+
+    with ThreadPoolExecutor(concorrencia) as executor:
+        for _ in range(concorrencia):
+            executor.submit(trabalhador)
+
+    latencias.sort()
+    ms = lambda v: round(v * 1000, 2) if v is not None else None  # noqa: E731
+    return {
+        'requisicoes': len(latencias) + erros,
+        'erros': erros,
+        'status': {str(k): v for k, v in sorted(status.items(), key=str)},
+        'rps': round((len(latencias) + erros) / duracao, 1),
+        'p50_ms': ms(percentil(latencias, 50)),
+        'p95_ms': ms(percentil(latencias, 95)),
+        'p99_ms': ms(percentil(latencias, 99)),
+        'max_ms': ms(latencias[-1] if latencias else None),
+    }
+
+
+def subir_servidor(app, porta):
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # Sem uma linha de log por requisição
+    servidor = make_server('127.0.0.1', porta, app, threaded=True)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f'http://127.0.0.1:{servidor.server_port}'
+
+
+def versao_git():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Driver de carga HTTP das rotas principais.')
+    parser.add_argument('--url', help='Servidor já rodando. Sem isso, sobe o app localmente.')
+    parser.add_argument('--porta', type=int, default=0)
+    parser.add_argument('--concorrencia', type=int, default=8)
+    parser.add_argument('--duracao', type=float, default=10, help='Segundos medidos por cenário.')
+    parser.add_argument('--aquecimento', type=float, default=2, help='Segundos descartados no início.')
+    parser.add_argument('--cenarios', help='Lista separada por vírgula (padrão: todos).')
+    parser.add_argument('--sem-cache', action='store_true', help='Desliga o cache de páginas (só no modo local).')
+    parser.add_argument('--usuario', default='benchmark')
+    parser.add_argument('--senha', default='benchmark')
+    parser.add_argument('--saida', help='Arquivo JSON de saída (padrão: só imprime).')
+    args = parser.parse_args()
+
+    variaveis = {'PAGE_CACHE_BACKEND': 'nenhum'} if args.sem_cache else {}
+    app = carregar_app(**variaveis)
+    with app.app_context():
+        ids_pessoas = [linha.id for linha in db.session.query(Pessoa.id).limit(5000)]
+        banco = db.engine.url.render_as_string(hide_password=True)
+    if not ids_pessoas:
+        raise SystemExit("Banco sem pessoas: rode benchmarks/dados.py antes.")
+
+    servidor = None
+    base = args.url
+    if not base:
+        servidor, base = subir_servidor(app, args.porta)
+
+    cookie = login(base, args.usuario, args.senha)
+    admin = Cliente(base, cookie)
+    anonimo = Cliente(base)
+    cenarios = montar_cenarios(ids_pessoas)
+    escolhidos = args.cenarios.split(',') if args.cenarios else list(cenarios)
+
+    resultado = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'versao': versao_git(),
+        'banco': banco,
+        'servidor': args.url or 'local (werkzeug, threaded)',
+        'concorrencia': args.concorrencia,
+        'duracao_s': args.duracao,
+        'cache_paginas': not args.sem_cache,
+        'cenarios': {},
+    }
+    try:
+        for nome in escolhidos:
+            precisa_login, gerar = cenarios[nome]
+            antes = ler_metricas(admin)
+            medido = executar_cenario(admin if precisa_login else anonimo, gerar,
+                                      args.concorrencia, args.duracao, args.aquecimento)
+            depois = ler_metricas(admin)
+            # Consultas por requisição nas rotas que este cenário tocou (exceto o próprio /admin/metrics)
+            delta_req = delta_sql = 0
+            for rota, (req, sql) in depois.items():
+                if rota == '/admin/metrics':
+                    continue
+                req_antes, sql_antes = antes.get(rota, (0, 0))
+                delta_req += req - req_antes
+                delta_sql += sql - sql_antes
+            medido['consultas_por_requisicao'] = round(delta_sql / delta_req, 2) if delta_req else None
+            resultado['cenarios'][nome] = medido
+            print(f"{nome:<24} {medido['rps']:>8} req/s  p50 {medido['p50_ms']} ms  p95 {medido['p95_ms']} ms  "
+                  f"p99 {medido['p99_ms']} ms  SQL/req {medido['consultas_por_requisicao']}  erros {medido['erros']}")
+    finally:
+        if servidor is not None:
+            servidor.shutdown()
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto + '\n')
+        print(f"Resultado gravado em {args.saida}")
+    else:
+        print(texto)
+
+
+if __name__ == '__main__':
+    main()
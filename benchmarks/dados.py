@@ -0,0 +1,190 @@
+"""
+Gera dados sintéticos para os benchmarks: pessoas com formações, experiências,
+idiomas, cursos e candidaturas, além de posts e especialistas. As linhas são
+gravadas com INSERT em lote (executemany), em blocos, sem passar pelo ORM.
+
+    python benchmarks/dados.py --pessoas 10000 --posts 200 --especialistas 12
+
+Usa DATABASE_URL (padrão: SQLite em benchmarks/.dados/bench.db). Cria as
+tabelas se não existirem e o usuário admin usado pelo driver de carga.
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from ambiente import carregar_app
+import estatisticas
+from blog import metadados_do_conteudo
+from extensoes import bcrypt, db
+from models import (ESPECIALISTA_AREAS, Candidatura, Curso, Especialista, Experiencia, Formacao,
+                    Idioma, Pessoa, Post, User)
+
+NOMES = ['Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela',
+         'João', 'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael', 'Sofia', 'Thiago']
+SOBRENOMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Costa', 'Ferreira',
+              'Almeida', 'Ribeiro', 'Carvalho', 'Gomes', 'Martins', 'Rocha', 'Barbosa']
+CIDADES = [('Recife', 'PE'), ('Olinda', 'PE'), ('São Paulo', 'SP'), ('Campinas', 'SP'),
+           ('Salvador', 'BA'), ('Fortaleza', 'CE'), ('Belo Horizonte', 'MG'), ('Curitiba', 'PR')]
+CARGOS = ['Analista de RH', 'Assistente Administrativo', 'Auxiliar Contábil', 'Analista Financeiro',
+          'Desenvolvedor Python', 'Recepcionista', 'Vendedor', 'Coordenador de Logística',
+          'Técnico em Segurança do Trabalho', 'Analista de Departamento Pessoal']
+EMPRESAS = ['Vélos Consultoria', 'Auditec', 'Doutor SM', 'Mercado Central', 'Transportes Nordeste',
+            'Clínica Vida', 'Construtora Horizonte', 'Tech Recife']
+COMPETENCIAS = ['Excel avançado', 'folha de pagamento', 'eSocial', 'recrutamento e seleção', 'Python',
+                'SQL', 'atendimento ao cliente', 'negociação', 'Power BI', 'gestão de equipes',
+                'rotinas fiscais', 'SAP', 'comunicação', 'inglês técnico']
+CURSOS_SUPERIORES = ['Administração', 'Ciências Contábeis', 'Psicologia', 'Gestão de RH',
+                     'Sistemas de Informação', 'Logística', 'Direito']
+INSTITUICOES = ['UFPE', 'UPE', 'UNICAP', 'Senac', 'Senai', 'Estácio', 'Unopar']
+IDIOMAS = [('Inglês', 'Básico'), ('Inglês', 'Intermediário'), ('Inglês', 'Avançado'),
+           ('Espanhol', 'Básico'), ('Espanhol', 'Intermediário')]
+PALAVRAS = ('gestão pessoas carreira entrevista currículo liderança empresa equipe mercado '
+            'trabalho contratação cultura desenvolvimento talento feedback').split()
+
+
+def _texto(rng, palavras, minimo, maximo):
+    return ' '.join(rng.choice(palavras) for _ in range(rng.randint(minimo, maximo)))
+
+
+def _data(rng, dias_atras):
+    return datetime.utcnow() - timedelta(days=rng.uniform(0, dias_atras), seconds=rng.randint(0, 86400))
+
+
+def gerar_pessoas(rng, quantidade, bloco, prefixo_email):
+    """Insere `quantidade` pessoas (e coleções filhas) em blocos. Retorna o total de linhas gravadas."""
+    linhas = 0
+    for inicio in range(0, quantidade, bloco):
+        pessoas = []
+        for i in range(inicio, min(inicio + bloco, quantidade)):
+            cidade, uf = rng.choice(CIDADES)
+            nome = f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+            pessoas.append({
+                'nome_completo': nome,
+                'email': f"{prefixo_email}{i}@exemplo.com.br",
+                'bairro': 'Centro', 'cidade': cidade, 'uf': uf,
+                'telefone1': f"(81) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+                'linkedin_url': None,
+                'competencias_tecnicas': ', '.join(rng.sample(COMPETENCIAS, rng.randint(2, 6))),
+            })
+        ids = db.session.scalars(
+            insert(Pessoa).returning(Pessoa.id, sort_by_parameter_order=True), pessoas
+        ).all()
+
+        candidaturas, formacoes, experiencias, idiomas, cursos = [], [], [], [], []
+        for pessoa_id in ids:
+            for _ in range(rng.choice((1, 1, 1, 2, 3))):
+                candidaturas.append({
+                    'pessoa_id': pessoa_id, 'vaga_objetivo': rng.choice(CARGOS),
+                    'resumo_profissional': _texto(rng, PALAVRAS, 15, 40),
+                    'data_candidatura': _data(rng, 730), 'curriculo_pdf_path': None,
+                })
+            for _ in range(rng.randint(1, 2)):
+                formacoes.append({
+                    'pessoa_id': pessoa_id, 'curso': rng.choice(CURSOS_SUPERIORES),
+                    'instituicao': rng.choice(INSTITUICOES),
+                    'ano_conclusao': str(rng.randint(2000, 2024)), 'conclusao_prevista': None,
+                })
+            for _ in range(rng.randint(1, 4)):
+                experiencias.append({
+                    'pessoa_id': pessoa_id, 'empresa': rng.choice(EMPRESAS), 'cargo': rng.choice(CARGOS),
+                    'data_inicio': f"{rng.randint(1, 12):02d}/{rng.randint(2010, 2020)}",
+                    'data_fim': f"{rng.randint(1, 12):02d}/{rng.randint(2021, 2025)}",
+                    'atividades': _texto(rng, PALAVRAS + COMPETENCIAS, 10, 30),
+                })
+            for nome, nivel in rng.sample(IDIOMAS, rng.randint(0, 2)):
+                idiomas.append({'pessoa_id': pessoa_id, 'nome': nome, 'nivel': nivel})
+            for _ in range(rng.randint(0, 3)):
+                cursos.append({
+                    'pessoa_id': pessoa_id, 'nome': rng.choice(COMPETENCIAS).capitalize(),
+                    'instituicao': rng.choice(INSTITUICOES), 'carga_horaria': f"{rng.choice((20, 40, 80))}h",
+                    'ano_conclusao': str(rng.randint(2015, 2025)),
+                })
+
+        for modelo, dados in ((Candidatura, candidaturas), (Formacao, formacoes),
+                              (Experiencia, experiencias), (Idioma, idiomas),
+                              (Curso, cursos)):
+            if dados:
+                db.session.execute(insert(modelo), dados)
+        db.session.commit()
+        linhas += len(ids) + len(candidaturas) + len(formacoes) + len(experiencias) + len(idiomas) + len(cursos)
+        print(f"  pessoas: {min(inicio + bloco, quantidade)}/{quantidade}")
+    return linhas
+
+
+def gerar_posts(rng, quantidade):
+    posts = []
+    for _ in range(quantidade):
+        conteudo = '\n\n'.join(f"<p>{_texto(rng, PALAVRAS, 40, 90)}</p>" for _ in range(rng.randint(3, 8)))
+        posts.append({
+            'titulo': f"{rng.choice(PALAVRAS).capitalize()} e {rng.choice(PALAVRAS)}: {rng.choice(CARGOS)}",
+            'conteudo': conteudo,
+            'autor': 'Equipe Honoriel',
+            'data_publicacao': _data(rng, 1000),
+            'atualizado_em': datetime.utcnow(),
+            **metadados_do_conteudo(conteudo),
+        })
+    if posts:
+        db.session.execute(insert(Post), posts)
+    return len(posts)
+
+
+def gerar_especialistas(rng, quantidade):
+    especialistas = [{
+        'nome': f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}",
+        'titulo': rng.choice(CARGOS),
+        'bio_intro': _texto(rng, PALAVRAS, 20, 40),
+        'bio_lista_titulo': 'Como posso ajudar',
+        'bio_lista_itens': '\n'.join(rng.sample(COMPETENCIAS, 4)),
+        'bio_conclusao': _texto(rng, PALAVRAS, 10, 20),
+        'contato_email': f"especialista{i}@exemplo.com.br",
+        'ativo': True, 'ordem': i, 'area': rng.choice(list(ESPECIALISTA_AREAS)),
+        'atualizado_em': datetime.utcnow(),
+    } for i in range(quantidade)]
+    if especialistas:
+        db.session.execute(insert(Especialista), especialistas)
+    return len(especialistas)
+
+
+def garantir_admin(usuario, senha):
+    if not User.query.filter_by(username=usuario).first():
+        hash_senha = bcrypt.generate_password_hash(senha).decode('utf-8')
+        db.session.add(User(username=usuario, password_hash=hash_senha))
+        db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera dados sintéticos para os benchmarks.')
+    parser.add_argument('--pessoas', type=int, default=5000)
+    parser.add_argument('--posts', type=int, default=100)
+    parser.add_argument('--especialistas', type=int, default=12)
+    parser.add_argument('--bloco', type=int, default=1000, help='Pessoas por INSERT em lote.')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--usuario', default='benchmark')
+    parser.add_argument('--senha', default='benchmark')
+    args = parser.parse_args()
+
+    app = carregar_app()
+    rng = random.Random(args.semente)
+    with app.app_context():
+        db.create_all()
+        garantir_admin(args.usuario, args.senha)
+        inicio = time.perf_counter()
+        # O prefixo evita conflito de e-mail ao rodar o gerador mais de uma vez no mesmo banco
+        prefixo = f"bench{int(time.time())}."
+        linhas = gerar_pessoas(rng, args.pessoas, args.bloco, prefixo)
+        linhas += gerar_posts(rng, args.posts)
+        linhas += gerar_especialistas(rng, args.especialistas)
+        db.session.commit()
+        duracao = time.perf_counter() - inicio
+        # Os INSERTs em lote não passam pelo cadastro: as contagens do painel são refeitas
+        estatisticas.reconstruir()
+    print(f"{linhas} linhas gravadas em {duracao:.1f}s ({linhas / duracao:.0f} linhas/s).")
+    print("Para a busca por perfil, rode `flask reindexar-busca` com o mesmo DATABASE_URL.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Mede a detecção de Pessoas duplicadas (duplicados.py) com perfis sintéticos em
+memória, sem banco: parte dos perfis ganha uma cópia com outro e-mail e
+pequenas variações (acentos, nome do meio, telefone com DDI/máscara, uma
+experiência a mais). Mostra o tempo, quantos pares foram comparados (contra os
+n²/2 de uma comparação completa), quantas cópias foram achadas (recall) e
+quantos pares reportados não eram cópias. Sai com código 1 se o recall ficar
+abaixo de --recall-minimo.
+
+    python benchmarks/duplicatas.py
+    python benchmarks/duplicatas.py --pessoas 100000 --duplicados 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from dados import CARGOS, CIDADES, COMPETENCIAS, EMPRESAS, NOMES, PALAVRAS, SOBRENOMES
+from duplicados import Perfil, encontrar_pares
+
+ACENTOS = str.maketrans('aeiouc', 'áéíóúç')
+
+
+def perfil(rng, pessoa_id):
+    nome = ' '.join(rng.sample(NOMES, rng.randint(1, 2)) + rng.sample(SOBRENOMES, rng.randint(1, 3)))
+    cidade, uf = rng.choice(CIDADES)
+    telefone = f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+    experiencias = '\n'.join(
+        f"{rng.choice(CARGOS)} {rng.choice(EMPRESAS)} "
+        + ' '.join(rng.choices(PALAVRAS + COMPETENCIAS, k=rng.randint(8, 25)))
+        for _ in range(rng.randint(0, 3)))
+    return Perfil(pessoa_id, nome, telefone if rng.random() < 0.8 else None, cidade, uf, experiencias)
+
+
+def variacao(rng, original, pessoa_id):
+    """A mesma pessoa cadastrada de novo: nome com acento ou sem um sobrenome, telefone reescrito, etc."""
+    partes = original.nome.split()
+    if len(partes) > 2 and rng.random() < 0.5:
+        partes.pop(rng.randrange(1, len(partes) - 1))
+    nome = ' '.join(partes)
+    if rng.random() < 0.5:
+        nome = nome.translate(ACENTOS) if rng.random() < 0.5 else nome.upper()
+    telefone = original.telefone
+    if telefone and rng.random() < 0.5:
+        telefone = '+55 ' + ''.join(c for c in telefone if c.isdigit())
+    elif rng.random() < 0.3:
+        telefone = None
+    experiencias = original.experiencias
+    if rng.random() < 0.5:
+        experiencias += f"\n{rng.choice(CARGOS)} {rng.choice(EMPRESAS)}"
+    cidade, uf = (original.cidade, original.uf) if rng.random() < 0.8 else rng.choice(CIDADES)
+    return Perfil(pessoa_id, nome, telefone, cidade, uf, experiencias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo e recall da detecção de Pessoas duplicadas.')
+    parser.add_argument('--pessoas', type=int, default=50000)
+    parser.add_argument('--duplicados', type=int, default=1000, help='Perfis que ganham uma cópia.')
+    parser.add_argument('--recall-minimo', type=float, default=0.8)
+    parser.add_argument('--semente', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.semente)
+    perfis = [perfil(rng, pessoa_id) for pessoa_id in range(1, args.pessoas + 1)]
+    copias = set()
+    for original in rng.sample(perfis, min(args.duplicados, len(perfis))):
+        copia = variacao(rng, original, len(perfis) + 1)
+        perfis.append(copia)
+        copias.add((original.id, copia.id))
+    rng.shuffle(perfis)
+
+    inicio = time.perf_counter()
+    pares, comparados = encontrar_pares(perfis)
+    duracao = time.perf_counter() - inicio
+
+    total = len(perfis)
+    encontrados = {(pessoa_id, duplicata_id) for pessoa_id, duplicata_id, _, _ in pares}
+    recall = len(encontrados & copias) / len(copias) if copias else 1.0
+    print(f"{total} perfis em {duracao:.1f}s: {comparados} pares comparados "
+          f"({comparados / max(total * (total - 1) // 2, 1):.4%} de todos os pares)")
+    print(f"Cópias encontradas: {len(encontrados & copias)}/{len(copias)} (recall {recall:.1%})")
+    print(f"Pares reportados que não eram cópias: {len(encontrados - copias)} "
+          f"(nomes repetidos na mesma cidade também são reportados)")
+    sys.exit(0 if recall >= args.recall_minimo else 1)
+
+
+if __name__ == '__main__':
+    main()
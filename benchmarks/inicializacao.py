@@ -0,0 +1,96 @@
+"""
+Mede o custo de inicialização de um worker: tempo do `import app`, do
+create_app() e da primeira requisição, além de quantos módulos ficaram
+carregados (e se bcrypt, Flask-Mail, Pillow e Alembic entraram no boot).
+Cada rodada é um processo Python novo; o resultado é a mediana.
+
+    python benchmarks/inicializacao.py --rodadas 10
+    python benchmarks/inicializacao.py --comparar-com HEAD~1
+
+Com --comparar-com, a revisão indicada é extraída com `git archive` para uma
+pasta temporária e medida do mesmo jeito. Versões sem create_app() montam o
+app no import, então o tempo aparece todo em `import`.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from ambiente import RAIZ
+
+MEDIR = r'''
+import json, sys, time
+inicio = time.perf_counter()
+import app as modulo
+depois_import = time.perf_counter()
+aplicacao = modulo.create_app() if hasattr(modulo, 'create_app') else modulo.app
+depois_create = time.perf_counter()
+status = aplicacao.test_client().get(sys.argv[1]).status_code
+fim = time.perf_counter()
+print(json.dumps({
+    'import_ms': (depois_import - inicio) * 1000,
+    'create_app_ms': (depois_create - depois_import) * 1000,
+    'primeira_requisicao_ms': (fim - depois_create) * 1000,
+    'status': status,
+    'modulos': len(sys.modules),
+    'carregados': sorted(m for m in ('bcrypt', 'flask_mail', 'PIL.Image', 'alembic') if m in sys.modules),
+}))
+'''
+
+
+def medir(pasta_backend, caminho, rodadas):
+    ambiente = dict(os.environ)
+    pasta_dados = tempfile.mkdtemp()
+    ambiente.update({
+        'DATABASE_URL': 'sqlite:///' + os.path.join(pasta_dados, 'inicializacao.db'),
+        'SECRET_KEY': 'benchmark', 'MAIL_QUEUE_WORKERS': '0',
+        'UPLOAD_FOLDER': os.path.join(pasta_dados, 'uploads'),
+    })
+    amostras = []
+    for _ in range(rodadas):
+        saida = subprocess.run([sys.executable, '-c', MEDIR, caminho], cwd=pasta_backend, env=ambiente,
+                               capture_output=True, text=True)
+        if saida.returncode != 0:
+            raise SystemExit(f"Falha ao medir {pasta_backend}:\n{saida.stderr}")
+        amostras.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+
+    resultado = {chave: round(statistics.median(a[chave] for a in amostras), 1)
+                 for chave in ('import_ms', 'create_app_ms', 'primeira_requisicao_ms')}
+    resultado['total_ms'] = round(sum(resultado.values()), 1)
+    resultado['status'] = amostras[-1]['status']
+    resultado['modulos'] = amostras[-1]['modulos']
+    resultado['carregados'] = amostras[-1]['carregados']
+    return resultado
+
+
+def extrair_revisao(revisao, destino):
+    arquivo = subprocess.run(['git', 'archive', revisao], cwd=RAIZ, capture_output=True, check=True).stdout
+    subprocess.run(['tar', '-x', '-C', destino], input=arquivo, check=True)
+    return os.path.join(destino, 'backend')
+
+
+def imprimir(titulo, r):
+    print(f"{titulo:<14} import {r['import_ms']:>7} ms  create_app {r['create_app_ms']:>7} ms  "
+          f"1ª requisição {r['primeira_requisicao_ms']:>7} ms  total {r['total_ms']:>7} ms  "
+          f"módulos {r['modulos']}  no boot: {', '.join(r['carregados']) or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo de inicialização do app.')
+    parser.add_argument('--rodadas', type=int, default=7)
+    parser.add_argument('--caminho', default='/sobre', help='Rota da primeira requisição.')
+    parser.add_argument('--comparar-com', metavar='REVISAO', help='Revisão do git para comparar (ex.: HEAD~1).')
+    args = parser.parse_args()
+
+    imprimir('atual', medir(os.path.join(RAIZ, 'backend'), args.caminho, args.rodadas))
+    if args.comparar_com:
+        with tempfile.TemporaryDirectory() as pasta:
+            imprimir(args.comparar_com, medir(extrair_revisao(args.comparar_com, pasta), args.caminho, args.rodadas))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Mede o painel do admin (estatisticas.painel) conforme as tabelas crescem: a
+cada etapa gera mais Pessoas sintéticas (com candidaturas e idiomas), refaz as
+contagens agregadas e compara o tempo do painel com o de contar na hora (os
+mesmos GROUP BY que a reconstrução faz sobre 'candidatura' e 'idioma'). Confere
+também que o total do painel bate com um COUNT(*); sai com código 1 se não bater.
+
+    python benchmarks/painel.py
+    python benchmarks/painel.py --etapas 5000,50000,200000 --repeticoes 50
+
+Usa o DATABASE_URL (ou o SQLite de benchmarks/.dados/) e acrescenta Pessoas a ele.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from ambiente import carregar_app
+import estatisticas
+from dados import gerar_pessoas
+from extensoes import db
+from models import Candidatura
+
+
+def mediana_ms(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo do painel do admin com as tabelas crescendo.')
+    parser.add_argument('--etapas', default='2000,20000,100000', help='Pessoas geradas até o fim de cada etapa.')
+    parser.add_argument('--repeticoes', type=int, default=20)
+    parser.add_argument('--semente', type=int, default=3)
+    args = parser.parse_args()
+
+    app = carregar_app()
+    rng = random.Random(args.semente)
+    falhas = 0
+    geradas = 0
+    with app.app_context():
+        db.create_all()
+        for etapa in (int(valor) for valor in args.etapas.split(',')):
+            gerar_pessoas(rng, etapa - geradas, 1000, f"painel{int(time.time())}.{etapa}.")
+            db.session.commit()
+            geradas = etapa
+
+            inicio = time.perf_counter()
+            linhas = estatisticas.reconstruir()
+            reconstrucao = time.perf_counter() - inicio
+
+            painel = mediana_ms(estatisticas.painel, args.repeticoes)
+            na_hora = mediana_ms(lambda: estatisticas.contagens_candidaturas() + estatisticas.contagens_idiomas(),
+                                 max(args.repeticoes // 10, 1))
+            total = db.session.query(Candidatura.id).count()
+            ok = estatisticas.painel()['total'] == total
+            falhas += not ok
+            print(f"{'OK  ' if ok else 'FALHOU'} {total:>8} candidaturas | painel {painel:6.2f} ms "
+                  f"| contando na hora {na_hora:8.1f} ms | reconstrução {reconstrucao:.1f} s ({linhas} contagens)")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Confere o limite de requisições (token bucket) com rajadas de POSTs no /login:
+quantos passam e quantos recebem 429 (com Retry-After), se um IP não afeta o
+outro, se a contagem continua exata com várias threads e se as fichas voltam
+depois do período. Sai com código 1 se algum resultado fugir do esperado.
+
+    python benchmarks/rajada.py
+    python benchmarks/rajada.py --limite 20/2 --rajada 100 --threads 16
+    python benchmarks/rajada.py --backend redis   # usa RATE_LIMIT_REDIS_URL
+
+Usa o cliente de teste do Flask (sem servidor) e um usuário inexistente, para
+que cada POST custe só a consulta do usuário.
+"""
+
+import argparse
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ambiente import carregar_app
+from extensoes import db, limitador
+from limite import interpretar_limite
+
+
+def rajada(cliente, quantidade, ip, threads=1):
+    """Dispara `quantidade` POSTs do mesmo IP. Retorna (aceitos, lista de Retry-After dos 429)."""
+    def enviar(_):
+        resposta = cliente.post('/login', data={'username': 'rajada-inexistente', 'password': 'x'},
+                                environ_base={'REMOTE_ADDR': ip})
+        return resposta.status_code, resposta.headers.get('Retry-After')
+
+    with ThreadPoolExecutor(threads) as executor:
+        respostas = list(executor.map(enviar, range(quantidade)))
+    aceitos = sum(1 for status, _ in respostas if status != 429)
+    return aceitos, [int(espera) for status, espera in respostas if status == 429 and espera]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rajadas contra o limite de requisições do /login.')
+    parser.add_argument('--limite', default='5/2', help="'capacidade/segundos' aplicado ao login.")
+    parser.add_argument('--rajada', type=int, default=30, help='POSTs por rajada.')
+    parser.add_argument('--threads', type=int, default=8, help='Threads da rajada concorrente.')
+    parser.add_argument('--backend', choices=('memoria', 'redis'), default='memoria')
+    args = parser.parse_args()
+
+    capacidade, periodo = interpretar_limite(args.limite)
+    capacidade = int(capacidade)
+    app = carregar_app(RATE_LIMIT_BACKEND=args.backend, RATE_LIMIT_LOGIN=args.limite)
+    with app.app_context():
+        db.create_all()
+        limitador.backend.limpar()
+    cliente = app.test_client()
+    falhas = []
+
+    def conferir(descricao, obtido, esperado):
+        ok = obtido == esperado
+        print(f"{'OK  ' if ok else 'FALHOU'} {descricao}: {obtido} (esperado {esperado})")
+        if not ok:
+            falhas.append(descricao)
+
+    aceitos, esperas = rajada(cliente, args.rajada, '10.0.0.1')
+    conferir('rajada sequencial, aceitos', aceitos, min(capacidade, args.rajada))
+    conferir('429 com Retry-After', len(esperas), args.rajada - aceitos)
+    if esperas:
+        conferir('Retry-After máximo (s)', max(esperas), math.ceil(periodo / capacidade))
+
+    aceitos, _ = rajada(cliente, 1, '10.0.0.2')
+    conferir('outro IP durante a rajada, aceitos', aceitos, 1)
+
+    aceitos, _ = rajada(cliente, args.rajada, '10.0.0.3', threads=args.threads)
+    conferir(f'rajada com {args.threads} threads, aceitos', aceitos, min(capacidade, args.rajada))
+
+    time.sleep(periodo / capacidade * 1.1)
+    aceitos, _ = rajada(cliente, 2, '10.0.0.1')
+    conferir('após repor 1 ficha, aceitos', aceitos, 1)
+
+    time.sleep(periodo * 1.05)
+    aceitos, _ = rajada(cliente, args.rajada, '10.0.0.1')
+    conferir('após o período inteiro, aceitos', aceitos, min(capacidade, args.rajada))
+
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == '__main__':
+    main()
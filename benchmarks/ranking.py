@@ -0,0 +1,125 @@
+"""
+Mede o ranking de candidatos por vaga (indice_ranking.py) com perfis
+sintéticos em memória, sem banco: montagem da matriz, gravação e leitura do
+.npz, p50/p95 de uma consulta com todos os perfis, atualização incremental de
+perfis alterados e a compactação do delta. Confere também que a compactação
+não muda o ranking; sai com código 1 se mudar.
+
+    python benchmarks/ranking.py
+    python benchmarks/ranking.py --pessoas 20000 --consultas 500 --alteracoes 5000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from dados import CARGOS, COMPETENCIAS, CURSOS_SUPERIORES, EMPRESAS, INSTITUICOES, PALAVRAS
+from indice_ranking import MatrizRanking
+
+# Vocabulário extra para que os perfis não tenham só as poucas palavras de dados.py
+SILABAS = ['ba', 'ce', 'di', 'fo', 'gu', 'la', 'me', 'ni', 'po', 'ru', 'sa', 'te', 'vi', 'xo', 'za']
+
+
+def vocabulario(rng, tamanho):
+    termos = set()
+    while len(termos) < tamanho:
+        termos.add(''.join(rng.choice(SILABAS) for _ in range(rng.randint(2, 4))))
+    return sorted(termos)
+
+
+def documento(rng, extras):
+    """(peso_a, peso_b, peso_c) no formato da tabela pessoa_busca (ver busca.montar_campos)."""
+    peso_a = '\n'.join(rng.sample(COMPETENCIAS, rng.randint(2, 5)) + rng.sample(CARGOS, rng.randint(1, 3)))
+    peso_b = '\n'.join(rng.sample(CURSOS_SUPERIORES, rng.randint(0, 2)) + [rng.choice(INSTITUICOES)]
+                       + rng.sample(EMPRESAS, rng.randint(1, 3)))
+    # Termos extras com distribuição de cauda longa (poucos muito comuns, muitos raros)
+    atividades = [extras[min(int(rng.paretovariate(1.1)) - 1, len(extras) - 1)] for _ in range(rng.randint(20, 80))]
+    peso_c = ' '.join(rng.choices(PALAVRAS, k=rng.randint(10, 40)) + atividades)
+    return peso_a, peso_b, peso_c
+
+
+def descricao_vaga(rng, extras):
+    partes = [rng.choice(CARGOS)] + rng.sample(COMPETENCIAS, 3) + rng.sample(extras[:2000], 8)
+    return 'Procuramos ' + ', '.join(partes)
+
+
+def percentis(tempos):
+    tempos = sorted(tempos)
+    return {'p50': statistics.median(tempos) * 1000, 'p95': tempos[int(len(tempos) * 0.95) - 1] * 1000}
+
+
+def medir_consultas(matriz, consultas, limite):
+    tempos = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        matriz.ranquear(consulta, limite)
+        tempos.append(time.perf_counter() - inicio)
+    return percentis(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo do ranking de candidatos por descrição de vaga.')
+    parser.add_argument('--pessoas', type=int, default=100000)
+    parser.add_argument('--consultas', type=int, default=200)
+    parser.add_argument('--alteracoes', type=int, default=2000, help='Perfis alterados depois da montagem (delta).')
+    parser.add_argument('--limite', type=int, default=20, help='Top-k de cada consulta.')
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.semente)
+    extras = vocabulario(rng, 20000)
+    agora = datetime.utcnow()
+    print(f"Gerando {args.pessoas} perfis...")
+    documentos = [(pessoa_id, *documento(rng, extras), agora) for pessoa_id in range(1, args.pessoas + 1)]
+    consultas = [descricao_vaga(rng, extras) for _ in range(args.consultas)]
+
+    inicio = time.perf_counter()
+    matriz = MatrizRanking.construir(documentos)
+    print(f"Montagem: {time.perf_counter() - inicio:.2f} s ({len(matriz.termos)} termos, "
+          f"{len(matriz.principal.pesos)} entradas)")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'ranking.npz')
+        inicio = time.perf_counter()
+        matriz.salvar(caminho)
+        gravacao = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        matriz = MatrizRanking.carregar(caminho)
+        leitura = time.perf_counter() - inicio
+        print(f"Gravação: {gravacao * 1000:.0f} ms | leitura: {leitura * 1000:.0f} ms "
+              f"| arquivo: {os.path.getsize(caminho) / 1024 / 1024:.1f} MB")
+
+    tempos = medir_consultas(matriz, consultas, args.limite)
+    print(f"Consulta (matriz compactada): p50 {tempos['p50']:.2f} ms | p95 {tempos['p95']:.2f} ms")
+
+    alterados = rng.sample(range(1, args.pessoas + 1), min(args.alteracoes, args.pessoas))
+    inicio = time.perf_counter()
+    for pessoa_id in alterados:
+        matriz.atualizar(pessoa_id, *documento(rng, extras))
+    duracao = time.perf_counter() - inicio
+    print(f"Atualização incremental: {len(alterados)} perfis em {duracao * 1000:.0f} ms "
+          f"({duracao / max(len(alterados), 1) * 1e6:.0f} µs por perfil)")
+
+    tempos = medir_consultas(matriz, consultas, args.limite)
+    print(f"Consulta (com delta):        p50 {tempos['p50']:.2f} ms | p95 {tempos['p95']:.2f} ms")
+
+    antes = [matriz.ranquear(consulta, args.limite) for consulta in consultas[:20]]
+    inicio = time.perf_counter()
+    matriz = matriz.compactar()
+    print(f"Compactação: {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    depois = [matriz.ranquear(consulta, args.limite) for consulta in consultas[:20]]
+
+    iguais = all([i for i, _ in a] == [i for i, _ in d] and
+                 all(abs(sa - sd) < 1e-3 * max(sa, 1) for (_, sa), (_, sd) in zip(a, d))
+                 for a, d in zip(antes, depois))
+    print(f"{'OK  ' if iguais else 'FALHOU'} ranking igual antes e depois da compactação")
+    sys.exit(0 if iguais else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Compara a entrega de /uploads/view/ antes (send_from_directory sem cabeçalhos
+de cache) e depois (Cache-Control imutável, Range e X-Accel-Redirect).
+
+Roda dentro do processo, com o test client do Flask, então mede só o custo do
+worker Python (sem rede). Uso, a partir da raiz do repositório:
+
+    python benchmarks/servir_uploads.py --tamanho-mb 4 --requisicoes 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from flask import send_from_directory
+
+from ambiente import carregar_app
+
+# Banco descartável: este benchmark não consulta dados
+app = carregar_app(DATABASE_URL='sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+
+def medir(cliente, url, requisicoes, headers=None):
+    bytes_enviados = 0
+    inicio = time.perf_counter()
+    for _ in range(requisicoes):
+        resposta = cliente.get(url, headers=headers or {})
+        bytes_enviados += len(resposta.get_data())
+        resposta.close()
+    duracao = time.perf_counter() - inicio
+    return {
+        'status': resposta.status_code,
+        'req_s': requisicoes / duracao,
+        'mb_pelo_worker': bytes_enviados / (1024 * 1024),
+        'cache_control': resposta.headers.get('Cache-Control', '-'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tamanho-mb', type=float, default=4)
+    parser.add_argument('--requisicoes', type=int, default=200)
+    args = parser.parse_args()
+
+    pasta = app.config['UPLOAD_FOLDER']
+    nome = 'bench_upload.pdf'
+    caminho = os.path.join(pasta, nome)
+    with open(caminho, 'wb') as f:
+        f.write(os.urandom(int(args.tamanho_mb * 1024 * 1024)))
+
+    # A rota como era antes desta mudança
+    @app.route('/_bench/antes/<path:filename>')
+    def bench_antes(filename):
+        return send_from_directory(pasta, filename)
+
+    cliente = app.test_client()
+    url = f'/uploads/view/{nome}'
+    etag = cliente.get(url).headers.get('ETag')
+
+    cenarios = [
+        ('antes: GET completo', f'/_bench/antes/{nome}', None, 'nenhum'),
+        ('depois: GET completo', url, None, 'nenhum'),
+        ('depois: Range 1 MB', url, {'Range': 'bytes=0-1048575'}, 'nenhum'),
+        ('depois: revalidação (304)', url, {'If-None-Match': etag}, 'nenhum'),
+        ('depois: X-Accel-Redirect', url, None, 'x-accel'),
+    ]
+    try:
+        print(f"Arquivo de {args.tamanho_mb} MB, {args.requisicoes} requisições por cenário\n")
+        print(f"{'cenário':<28} {'status':>6} {'req/s':>10} {'MB pelo worker':>15}  Cache-Control")
+        for titulo, caminho_url, headers, modo in cenarios:
+            app.config['UPLOADS_OFFLOAD'] = modo
+            r = medir(cliente, caminho_url, args.requisicoes, headers)
+            print(f"{titulo:<28} {r['status']:>6} {r['req_s']:>10.1f} {r['mb_pelo_worker']:>15.1f}  {r['cache_control']}")
+    finally:
+        app.config['UPLOADS_OFFLOAD'] = 'nenhum'
+        os.remove(caminho)
+
+
+if __name__ == '__main__':
+    main()